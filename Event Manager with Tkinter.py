@@ -1,12 +1,26 @@
+import time
+STARTED = time.perf_counter()   # --profile-startup times the imports below from here
+import argparse
+import csv
+import gc
+import json
+import math
+import os
+import queue
+import re
+import sys
+import threading
+import urllib.parse
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from collections import deque
-
-# Global data structures
-execution_queue = deque()
-fix_queue = deque()
-volunteers = []
-feedback_ratings = []
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+from tkinter import font as tkfont
+from array import array
+from collections import OrderedDict, deque
+from bisect import bisect_left, insort
+from heapq import heapify, heappop, heappush, nlargest
+from itertools import chain, islice
+from types import MappingProxyType
+from datetime import date, datetime, timedelta
 
 # DSA Classes
 class Stack:
@@ -32,130 +46,4318 @@ class Queue:
     def dequeue(self):
         return self.q.popleft() if self.q else None
     
+    def __len__(self):
+        return len(self.q)
+    
+    def __iter__(self):
+        return iter(self.q)
+    
     def display(self):
         return list(self.q)
 
+class ApprovalRequest:
+    __slots__ = ("number", "text", "priority", "deadline")
+    
+    def __init__(self, number, text, priority=0, deadline=None):
+        self.number = number
+        self.text = text
+        self.priority = priority
+        self.deadline = deadline
+    
+    def __str__(self):
+        label = f"#{self.number} [{ApprovalScheduler.LEVELS[self.priority]}] {self.text}"
+        if self.deadline is not None:
+            label += f" (due {datetime.fromtimestamp(self.deadline).strftime(DATE_FORMAT + ' %H:%M')})"
+        return label
+    
+    def dump(self):
+        return [self.number, self.text, self.priority, self.deadline]
+
+class SortedChunks:
+    # Values ordered by unique keys, held as a list of short sorted chunks (a
+    # B-tree one level deep). Adding or removing a value bisects to its chunk
+    # and shifts at most 2 * CHUNK entries; reaching position i steps over
+    # n / CHUNK chunk sizes; a copy in order is a C-speed concatenation.
+    CHUNK = 512
+    
+    def __init__(self, pairs=()):
+        # pairs: (key, value) already in key order
+        self.keys = []     # chunks of keys
+        self.values = []   # chunks of values, parallel to keys
+        self.maxes = []    # last key of each chunk
+        pairs = list(pairs)
+        for i in range(0, len(pairs), self.CHUNK):
+            chunk = pairs[i:i + self.CHUNK]
+            self.keys.append([key for key, value in chunk])
+            self.values.append([value for key, value in chunk])
+            self.maxes.append(chunk[-1][0])
+        self.size = len(pairs)
+    
+    def __len__(self):
+        return self.size
+    
+    def __iter__(self):
+        return chain.from_iterable(self.values)
+    
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            if index < 0:
+                index += self.size
+            if not 0 <= index < self.size:
+                raise IndexError("SortedChunks index out of range")
+            return self[index:index + 1][0]
+        start, stop, step = index.indices(self.size)
+        if step != 1:
+            return list(self)[index]
+        rows = []
+        for values in self.values:
+            if start >= stop:
+                break
+            if start < len(values):
+                rows.extend(values[start:stop])
+                start = 0
+            else:
+                start -= len(values)
+            stop -= len(values)
+        return rows
+    
+    def snapshot(self):
+        return tuple(chain.from_iterable(self.values))
+    
+    def first(self):
+        return self.values[0][0] if self.size else None
+    
+    def insert(self, key, value):
+        self.size += 1
+        if not self.keys:
+            self.keys.append([key])
+            self.values.append([value])
+            self.maxes.append(key)
+            return
+        c = min(bisect_left(self.maxes, key), len(self.maxes) - 1)
+        keys, values = self.keys[c], self.values[c]
+        i = bisect_left(keys, key)
+        keys.insert(i, key)
+        values.insert(i, value)
+        self.maxes[c] = keys[-1]
+        if len(keys) > 2 * self.CHUNK:
+            self.keys[c + 1:c + 1] = [keys[self.CHUNK:]]
+            self.values[c + 1:c + 1] = [values[self.CHUNK:]]
+            del keys[self.CHUNK:], values[self.CHUNK:]
+            self.maxes.insert(c, keys[-1])
+    
+    def remove(self, key):
+        c = bisect_left(self.maxes, key)
+        keys, values = self.keys[c], self.values[c]
+        i = bisect_left(keys, key)
+        del keys[i], values[i]
+        self.size -= 1
+        if keys:
+            self.maxes[c] = keys[-1]
+        else:
+            del self.keys[c], self.values[c], self.maxes[c]
+    
+    def index(self, key):
+        c = bisect_left(self.maxes, key)
+        return sum(len(keys) for keys in self.keys[:c]) + bisect_left(self.keys[c], key)
+    
+    def take_front(self, n):
+        # Removes and returns the first n values
+        taken = []
+        while self.keys and len(taken) < n:
+            need = n - len(taken)
+            keys, values = self.keys[0], self.values[0]
+            if len(values) <= need:
+                taken.extend(values)
+                del self.keys[0], self.values[0], self.maxes[0]
+            else:
+                taken.extend(values[:need])
+                del keys[:need], values[:need]
+        self.size -= len(taken)
+        return taken
+
+class ApprovalScheduler:
+    # Approval queue with two policies over one sorted order. "fifo" serves
+    # requests in arrival order; "priority" serves the highest level first,
+    # aged by arrivals: a request gains a level for every AGING requests
+    # queued after it, so routine requests are never starved. Aging needs no
+    # re-keying, since level + (arrivals - number) / AGING ranks requests
+    # exactly like the fixed key number - level * AGING. Requests are kept
+    # in service order in SortedChunks keyed by (key, number), so any stretch
+    # of the queue is a cheap slice (what the pending pane scrolls through)
+    # and a copy of it is cheap (what API views hold). Deadlines sit in a
+    # timer wheel of TICK-second slots, so the expiry sweep only visits
+    # elapsed slots.
+    POLICIES = ("fifo", "priority")
+    LEVELS = ("Routine", "High", "Urgent")
+    AGING = 10
+    TICK = 60
+    HISTORY = 50
+    
+    def __init__(self, policy="fifo"):
+        self.policy = policy
+        self.queue = SortedChunks()   # (key, number) -> pending request, in service order
+        self.pending = {}    # number -> live ApprovalRequest
+        self.arrivals = 0
+        self.wheel = {}      # slot -> numbers due by the end of that slot
+        self.slots = {}      # number -> its wheel slot
+        self.swept = None    # last slot the expiry sweep has passed
+    
+    def __len__(self):
+        return len(self.pending)
+    
+    def __contains__(self, number):
+        return number in self.pending
+    
+    def __iter__(self):
+        return iter(self.queue)
+    
+    def __getitem__(self, index):
+        # Requests by place in service order; a slice costs only the rows taken
+        return self.queue[index]
+    
+    def snapshot(self):
+        return self.queue.snapshot()
+    
+    def key(self, request):
+        if self.policy == "fifo":
+            return request.number
+        return request.number - request.priority * self.AGING
+    
+    def place(self, number):
+        # Where a pending request stands in service order
+        return self.queue.index((self.key(self.pending[number]), number))
+    
+    def enqueue(self, text, priority=0, deadline=None):
+        self.arrivals += 1
+        request = ApprovalRequest(self.arrivals, text, priority, deadline)
+        self.pending[request.number] = request
+        self._insert(request)
+        self._schedule(request)
+        return request
+    
+    def dequeue(self):
+        if not self.queue:
+            return None
+        return self._take(self.queue.first().number)
+    
+    def dequeue_many(self, n):
+        approved = self.queue.take_front(n)
+        for request in approved:
+            self._forget(request.number)
+        return approved
+    
+    def reprioritize(self, number, priority):
+        request = self.pending.get(number)
+        if request is None:
+            return None
+        updated = ApprovalRequest(number, request.text, priority, request.deadline)
+        self._remove(request)
+        self.pending[number] = updated
+        self._insert(updated)
+        return updated
+    
+    def set_policy(self, policy):
+        if policy not in self.POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(self.POLICIES)}")
+        self.policy = policy
+        self._rebuild()
+    
+    def withdraw(self, number):
+        # Takes back a pending request; the latest arrival also hands back its number
+        request = self._take(number)
+        if number == self.arrivals:
+            self.arrivals -= 1
+        return request
+    
+    def restore(self, request):
+        self.pending[request.number] = request
+        self._insert(request)
+        self._schedule(request)
+    
+    def due(self, now):
+        return any(slot in self.wheel for slot in self._elapsed(now))
+    
+    def expire(self, now):
+        expired = []
+        for slot in list(self._elapsed(now)):
+            for number in sorted(self.wheel.get(slot, ())):
+                expired.append(self._take(number))
+        self.swept = int(now // self.TICK)
+        return expired
+    
+    def _elapsed(self, now):
+        # Slots passed since the last sweep; after a long idle gap (or before
+        # the first sweep) only the occupied ones are visited, in order
+        last = int(now // self.TICK)
+        if self.swept is None or last - self.swept > len(self.wheel):
+            return sorted(slot for slot in self.wheel if slot <= last)
+        return range(self.swept + 1, last + 1)
+    
+    def _schedule(self, request):
+        if request.deadline is None:
+            return
+        # Rounded up, so a request never expires before its deadline
+        slot = -int(-request.deadline // self.TICK)
+        if self.swept is not None and slot <= self.swept:
+            slot = self.swept + 1
+        self.wheel.setdefault(slot, set()).add(request.number)
+        self.slots[request.number] = slot
+    
+    def _take(self, number):
+        self._remove(self.pending[number])
+        return self._forget(number)
+    
+    def _forget(self, number):
+        # Drops a request that is already out of the service order
+        request = self.pending.pop(number)
+        slot = self.slots.pop(number, None)
+        if slot is not None:
+            self.wheel[slot].discard(number)
+            if not self.wheel[slot]:
+                del self.wheel[slot]
+        return request
+    
+    def _insert(self, request):
+        self.queue.insert((self.key(request), request.number), request)
+    
+    def _remove(self, request):
+        self.queue.remove((self.key(request), request.number))
+    
+    def _rebuild(self):
+        keys = sorted((self.key(request), number) for number, request in self.pending.items())
+        self.queue = SortedChunks((key, self.pending[key[1]]) for key in keys)
+    
+    def display(self):
+        return list(self)
+    
+    def dump(self):
+        return {
+            "policy": self.policy,
+            "arrivals": self.arrivals,
+            "swept": self.swept,
+            "requests": [request.dump() for request in self.pending.values()],
+        }
+    
+    def load(self, data):
+        self.__init__(data["policy"])
+        self.arrivals = data["arrivals"]
+        self.swept = data["swept"]
+        for number, text, priority, deadline in data["requests"]:
+            self.pending[number] = ApprovalRequest(number, text, priority, deadline)
+            self._schedule(self.pending[number])
+        self._rebuild()
+
+class RehearsalDispatcher:
+    # Parallel rehearsal rooms, each with its own line whose head is
+    # rehearsing now. Dispatching hands waiting acts to rooms by policy:
+    # round_robin cycles through the rooms, shortest_first sends the shortest
+    # acts first to the least loaded room, and performer_free keeps each
+    # performer in the room they are already booked in, so no one is needed
+    # in two rooms at once; an act whose performers are booked in different
+    # rooms fits none and is left waiting. Least-loaded picks come from a
+    # heap of (minutes booked, room) whose stale entries are skipped, so one
+    # assignment costs O(log rooms).
+    POLICIES = ("round_robin", "shortest_first", "performer_free")
+    DEFAULT_MINUTES = 15
+    
+    def __init__(self, policy="round_robin"):
+        self.policy = policy
+        self.rooms = []      # room names in the order they were added
+        self.lines = {}      # room -> deque of (performance, minutes, performers)
+        self.load = {}       # room -> minutes booked in its line
+        self.heap = []
+        self.turn = 0
+        self.booked = {}     # performer -> {room: acts booked there}
+    
+    def __len__(self):
+        return len(self.rooms)
+    
+    def __iter__(self):
+        for room in self.rooms:
+            yield room, tuple(act[0] for act in self.lines[room]), self.load[room]
+    
+    def set_policy(self, policy):
+        if policy not in self.POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(self.POLICIES)}")
+        self.policy = policy
+    
+    def add_room(self, room):
+        if room in self.lines:
+            return False
+        self.rooms.append(room)
+        self.lines[room] = deque()
+        self._set_load(room, 0)
+        return True
+    
+    def remove_room(self, room):
+        # Returns the room's acts in line order, or None if there is no such room
+        line = self.lines.pop(room, None)
+        if line is None:
+            return None
+        i = self.rooms.index(room)
+        del self.rooms[i]
+        if i < self.turn:
+            self.turn -= 1
+        del self.load[room]
+        for perf, minutes, performers in line:
+            self._unbook(room, performers)
+        return [act[0] for act in line]
+    
+    def assign(self, perf, minutes, performers):
+        # Returns the room, or None when no room suits the act's performers
+        room = self._pick(performers)
+        if room is not None:
+            self._place(room, (perf, minutes, tuple(performers)))
+        return room
+    
+    def finish(self, room):
+        # The room's current act is done; the next in its line takes the room
+        line = self.lines.get(room)
+        if not line:
+            return None
+        perf, minutes, performers = line.popleft()
+        self._set_load(room, self.load[room] - minutes)
+        self._unbook(room, performers)
+        return perf
+    
+    def _pick(self, performers):
+        if self.policy == "round_robin":
+            self.turn %= len(self.rooms)
+            room = self.rooms[self.turn]
+            self.turn += 1
+            return room
+        if self.policy == "performer_free":
+            rooms = {room for name in performers for room in self.booked.get(name, ())}
+            if len(rooms) > 1:
+                return None
+            if rooms:
+                return rooms.pop()
+        while self.load.get(self.heap[0][1]) != self.heap[0][0]:
+            heappop(self.heap)
+        return self.heap[0][1]
+    
+    def _place(self, room, act):
+        self.lines[room].append(act)
+        self._set_load(room, self.load[room] + act[1])
+        for name in act[2]:
+            rooms = self.booked.setdefault(name, {})
+            rooms[room] = rooms.get(room, 0) + 1
+    
+    def _unbook(self, room, performers):
+        for name in performers:
+            rooms = self.booked[name]
+            rooms[room] -= 1
+            if not rooms[room]:
+                del rooms[room]
+                if not rooms:
+                    del self.booked[name]
+    
+    def _set_load(self, room, minutes):
+        self.load[room] = minutes
+        heappush(self.heap, (minutes, room))
+        # Compact once stale entries outnumber live ones
+        if len(self.heap) > 2 * len(self.rooms) + 16:
+            self.heap = [(load, room) for room, load in self.load.items()]
+            heapify(self.heap)
+    
+    def dump(self):
+        return {
+            "policy": self.policy,
+            "turn": self.turn,
+            "rooms": [[room, [[perf, minutes, list(performers)] for perf, minutes, performers in self.lines[room]]]
+                      for room in self.rooms],
+        }
+    
+    def load_state(self, data):
+        self.__init__(data["policy"])
+        for room, acts in data["rooms"]:
+            self.add_room(room)
+            for perf, minutes, performers in acts:
+                self._place(room, (perf, minutes, tuple(performers)))
+        self.turn = data["turn"]
+
+class LiveShow:
+    # Timing for the show while it runs. Planned seconds of the acts still
+    # in the schedule are kept as a running total and finished acts fold
+    # their overrun or underrun into one drift figure, so the projected end
+    # and the forecast cost O(1) on every clock tick. Times are epoch
+    # seconds passed in by the caller, which keeps journal replays exact.
+    DEFAULT_MINUTES = 10
+    TICK = 1
+    
+    def __init__(self):
+        self.started = None        # show start, None when the show is not running
+        self.auto = False          # advance by itself once an act reaches its planned time
+        self.current = None
+        self.current_start = None
+        self.current_planned = 0
+        self.queued = 0            # planned seconds of the acts still scheduled
+        self.done_planned = 0
+        self.drift = 0             # actual minus planned seconds of finished acts
+        self.finished = 0
+    
+    @property
+    def running(self):
+        return self.started is not None
+    
+    def start(self, now, auto=False):
+        queued = self.queued
+        self.__init__()
+        self.queued, self.started, self.auto = queued, now, auto
+    
+    def begin(self, perf, planned, now):
+        self.current, self.current_start, self.current_planned = perf, now, planned
+    
+    def finish(self, now):
+        if self.current is None:
+            return
+        self.drift += (now - self.current_start) - self.current_planned
+        self.done_planned += self.current_planned
+        self.finished += 1
+        self.current = self.current_start = None
+        self.current_planned = 0
+    
+    def stop(self, now):
+        self.finish(now)
+        self.started = None
+    
+    def elapsed(self, now):
+        return now - self.current_start if self.current is not None else 0
+    
+    def left(self, now):
+        return max(self.current_planned - self.elapsed(now), 0)
+    
+    def overrun(self, now):
+        return max(self.elapsed(now) - self.current_planned, 0)
+    
+    def due(self, now):
+        return self.current is not None and self.elapsed(now) >= self.current_planned
+    
+    def projected_end(self, now):
+        return now + self.left(now) + self.queued
+    
+    def variance(self, now):
+        # Seconds the show will end behind (+) or ahead of (-) its plan
+        return self.drift + self.overrun(now)
+    
+    def copy(self):
+        other = LiveShow()
+        other.__dict__.update(self.__dict__)
+        return other
+    
+    def dump(self):
+        fields = dict(self.__dict__)
+        del fields["queued"]   # rebuilt from the schedule on load
+        return fields
+    
+    def load(self, data):
+        queued = self.queued
+        self.__init__()
+        self.__dict__.update(data)
+        self.queued = queued
+
+# Record and node classes are slotted: no per-instance __dict__, which
+# matters once an event holds 100k announcements, dates or requests
 class Node:
+    __slots__ = ("data", "next", "prev")
+    
+    def __init__(self, data):
+        self.data = data
+        self.next = None
+        self.prev = None
+
+class OrderedRows:
+    # Base for ordered structures that are walked node by node. snapshot()
+    # keeps a tuple of their rows until the next change, so a scrolled pane
+    # slices it instead of walking to its first row, and API views share it.
+    # Subclasses set self.frozen = None whenever their order or rows change.
+    WALK = 256   # rows near the head a changed structure walks to instead of copying itself
+    
+    def snapshot(self):
+        if self.frozen is None:
+            self.frozen = tuple(self)
+        return self.frozen
+    
+    def __getitem__(self, index):
+        if self.frozen is None and isinstance(index, slice) and index.step is None \
+                and 0 <= (index.start or 0) and index.stop is not None and 0 <= index.stop <= self.WALK:
+            return list(islice(self, index.start, index.stop))
+        return self.snapshot()[index]
+
+class LinkedList(OrderedRows):
+    def __init__(self):
+        self.head = None
+        self.tail = None
+        self.size = 0
+        # data -> nodes holding it, oldest first, for O(1) lookup and removal
+        self.index = {}
+        self.frozen = None
+    
+    def __len__(self):
+        return self.size
+    
+    def __contains__(self, key):
+        return key in self.index
+    
+    def __iter__(self):
+        temp = self.head
+        while temp:
+            yield temp.data
+            temp = temp.next
+    
+    def add(self, data):
+        self.frozen = None
+        new = Node(data)
+        if not self.head:
+            self.head = new
+        else:
+            new.prev = self.tail
+            self.tail.next = new
+        self.tail = new
+        self.size += 1
+        self.index.setdefault(data, deque()).append(new)
+    
+    def remove(self, key):
+        nodes = self.index.get(key)
+        if not nodes:
+            return False
+        self.frozen = None
+        temp = nodes.popleft()
+        if not nodes:
+            del self.index[key]
+        if temp.prev:
+            temp.prev.next = temp.next
+        else:
+            self.head = temp.next
+        if temp.next:
+            temp.next.prev = temp.prev
+        else:
+            self.tail = temp.prev
+        self.size -= 1
+        return True
+    
+    def pop(self):
+        # Removes the last node
+        temp = self.tail
+        if temp is None:
+            return None
+        self.frozen = None
+        nodes = self.index[temp.data]
+        nodes.remove(temp)
+        if not nodes:
+            del self.index[temp.data]
+        self.tail = temp.prev
+        if self.tail:
+            self.tail.next = None
+        else:
+            self.head = None
+        self.size -= 1
+        return temp.data
+    
+    def _node_at(self, i):
+        # Walks from whichever end is nearer
+        if i < self.size // 2:
+            temp = self.head
+            for _ in range(i):
+                temp = temp.next
+        else:
+            temp = self.tail
+            for _ in range(self.size - 1 - i):
+                temp = temp.prev
+        return temp
+    
+    def follower(self, key):
+        # Names the node after the one remove(key) would take without walking
+        # the list: (its data, its place among the nodes holding that data
+        # once the removal is done). None when that node is the tail or key
+        # is absent.
+        nodes = self.index.get(key)
+        if not nodes or nodes[0].next is None:
+            return None
+        after = nodes[0].next
+        rank = self.index[after.data].index(after)
+        return after.data, rank - 1 if after.data == key else rank
+    
+    def restore_before(self, follower, data):
+        # Puts a removed node back before the node follower() named, first in
+        # line for remove() again; only valid while the list is as it was
+        # right after the removal, which is when undo replays it
+        if follower is None:
+            self._link_before(None, data)
+        else:
+            after, rank = follower
+            self._link_before(self.index[after][rank], data)
+    
+    def restore(self, i, data):
+        # Same, by position, for undo entries that recorded one
+        self._link_before(self._node_at(i) if i < self.size else None, data)
+    
+    def _link_before(self, after, data):
+        if after is None:
+            self.add(data)
+            nodes = self.index[data]
+            nodes.appendleft(nodes.pop())
+            return
+        self.frozen = None
+        new = Node(data)
+        new.next = after
+        new.prev = after.prev
+        if after.prev:
+            after.prev.next = new
+        else:
+            self.head = new
+        after.prev = new
+        self.size += 1
+        self.index.setdefault(data, deque()).appendleft(new)
+    
+    def display(self):
+        return list(self)
+
+class ScheduleNode:
+    __slots__ = ("data", "prev", "next")
+    
     def __init__(self, data):
         self.data = data
+        self.prev = None
         self.next = None
 
-class LinkedList:
+class Schedule(OrderedRows):
+    # Doubly linked list plus a name -> node index, so every fix on
+    # execution day is O(1) instead of rebuilding the whole queue.
     def __init__(self):
         self.head = None
+        self.tail = None
+        self.index = {}
+        self.frozen = None
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def __contains__(self, name):
+        return name in self.index
+    
+    def __iter__(self):
+        temp = self.head
+        while temp:
+            yield temp.data
+            temp = temp.next
+    
+    def _link_after(self, node, after):
+        self.frozen = None
+        node.prev = after
+        if after is None:
+            node.next = self.head
+            self.head = node
+        else:
+            node.next = after.next
+            after.next = node
+        if node.next:
+            node.next.prev = node
+        else:
+            self.tail = node
+    
+    def _unlink(self, node):
+        self.frozen = None
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+        node.prev = node.next = None
+    
+    def append(self, name):
+        if name in self.index:
+            return False
+        node = ScheduleNode(name)
+        self.index[name] = node
+        self._link_after(node, self.tail)
+        return True
+    
+    def insert_after(self, after, name):
+        if name in self.index or after not in self.index:
+            return False
+        node = ScheduleNode(name)
+        self.index[name] = node
+        self._link_after(node, self.index[after])
+        return True
+    
+    def remove(self, name):
+        node = self.index.pop(name, None)
+        if node is None:
+            return False
+        self._unlink(node)
+        return True
+    
+    def move_after(self, name, after=None):
+        # after=None moves the performance to the front of the schedule
+        node = self.index.get(name)
+        if node is None or name == after:
+            return False
+        if after is not None and after not in self.index:
+            return False
+        self._unlink(node)
+        self._link_after(node, self.index[after] if after is not None else None)
+        return True
+    
+    def popleft(self):
+        if self.head is None:
+            return None
+        node = self.head
+        del self.index[node.data]
+        self._unlink(node)
+        return node.data
+    
+    def display(self):
+        return list(self)
+
+class AVLNode:
+    __slots__ = ("key", "value", "left", "right", "height")
+    
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1
+
+class AVLTree:
+    # Self-balancing ordered index; all operations are iterative so sorted
+    # bulk loads neither degrade to O(n) nor hit the recursion limit.
+    node_class = AVLNode
+    
+    def __init__(self):
+        self.root = None
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def _height(self, node):
+        return node.height if node else 0
+    
+    def _update(self, node):
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+    
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+    
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+    
+    def _rebalance(self, node):
+        self._update(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+    
+    def _retrace(self, path):
+        # Rebalance bottom-up along the search path and relink each subtree
+        while path:
+            node = path.pop()
+            sub = self._rebalance(node)
+            if not path:
+                self.root = sub
+            elif path[-1].left is node:
+                path[-1].left = sub
+            else:
+                path[-1].right = sub
+    
+    def insert(self, key, value=None):
+        path = []
+        node = self.root
+        while node:
+            if key == node.key:
+                node.value = value
+                return False
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        new = self.node_class(key, value)
+        if not path:
+            self.root = new
+        elif key < path[-1].key:
+            path[-1].left = new
+        else:
+            path[-1].right = new
+        self.size += 1
+        self._retrace(path)
+        return True
+    
+    def search(self, key):
+        node = self.root
+        while node and node.key != key:
+            node = node.left if key < node.key else node.right
+        return node
+    
+    def delete(self, key):
+        path = []
+        node = self.root
+        while node and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        if node is None:
+            return False
+        
+        # Two children: swap in the inorder successor and delete that instead
+        if node.left and node.right:
+            path.append(node)
+            succ = node.right
+            while succ.left:
+                path.append(succ)
+                succ = succ.left
+            node.key, node.value = succ.key, succ.value
+            node = succ
+        
+        child = node.left or node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self.size -= 1
+        self._retrace(path)
+        return True
+    
+    def inorder(self):
+        res = []
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            res.append(node.key)
+            node = node.right
+        return res
+    
+    def _seek(self, key, inclusive):
+        # Stack of ancestors whose keys are >= key (or > key); top is the first match
+        stack = []
+        node = self.root
+        while node:
+            if node.key > key or (inclusive and node.key == key):
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+        return stack
+    
+    def _walk(self, stack):
+        while stack:
+            node = stack.pop()
+            yield node.key
+            node = node.right
+            while node:
+                stack.append(node)
+                node = node.left
+    
+    def scan(self, low=None, high=None):
+        # Yields keys in [low, high] lazily: O(log n) to seek plus O(1) per key
+        if low is None:
+            stack = []
+            node = self.root
+            while node:
+                stack.append(node)
+                node = node.left
+        else:
+            stack = self._seek(low, True)
+        for key in self._walk(stack):
+            if high is not None and key > high:
+                return
+            yield key
+    
+    def successor(self, key):
+        found = None
+        node = self.root
+        while node:
+            if node.key > key:
+                found = node
+                node = node.left
+            else:
+                node = node.right
+        return found.key if found else None
+    
+    def predecessor(self, key):
+        found = None
+        node = self.root
+        while node:
+            if node.key < key:
+                found = node
+                node = node.right
+            else:
+                node = node.left
+        return found.key if found else None
+    
+    def page(self, after=None, limit=20):
+        # Cursor pagination: pass back the returned cursor to get the next page
+        if after is None:
+            walk = self.scan()
+        else:
+            walk = self._walk(self._seek(after, False))
+        keys = []
+        for key in walk:
+            if len(keys) == limit:
+                return keys, keys[-1]
+            keys.append(key)
+        return keys, None
+
+class IntervalNode(AVLNode):
+    __slots__ = ("high",)
+    
+    def __init__(self, key, value=None):
+        super().__init__(key, value)
+        self.high = key[1]
+
+class IntervalTree(AVLTree):
+    # AVL tree keyed by (start, end, id) where every node also keeps the
+    # latest end in its subtree, so overlap queries prune whole subtrees.
+    node_class = IntervalNode
+    
+    def _update(self, node):
+        super()._update(node)
+        node.high = node.key[1]
+        for child in (node.left, node.right):
+            if child and child.high > node.high:
+                node.high = child.high
+    
+    def overlapping(self, start, end):
+        # Keys whose [start, end) meets the given one: O(log n) plus O(1) per match
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            if node.high <= start:
+                continue
+            if node.left:
+                stack.append(node.left)
+            if node.key[0] < end:
+                if node.key[1] > start:
+                    yield node.key
+                if node.right:
+                    stack.append(node.right)
+
+class AVLPool:
+    # Array-backed AVL tree over integer keys. Nodes are indices into
+    # parallel arrays instead of objects, with index 0 as the empty subtree,
+    # and deleted slots are reused, so a key costs about 17 bytes rather
+    # than a node object plus the key object. Subclasses store other key
+    # types by mapping them to ints with encode/decode. Same interface and
+    # iterative algorithms as AVLTree, minus values.
+    encode = decode = staticmethod(lambda key: key)
+    
+    def __init__(self):
+        self.keys = array('q', [0])
+        self.left = array('i', [0])
+        self.right = array('i', [0])
+        self.height = array('b', [0])
+        self.free = array('i')
+        self.root = 0
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def _update(self, n):
+        self.height[n] = 1 + max(self.height[self.left[n]], self.height[self.right[n]])
+    
+    def _rotate_right(self, n):
+        pivot = self.left[n]
+        self.left[n] = self.right[pivot]
+        self.right[pivot] = n
+        self._update(n)
+        self._update(pivot)
+        return pivot
+    
+    def _rotate_left(self, n):
+        pivot = self.right[n]
+        self.right[n] = self.left[pivot]
+        self.left[pivot] = n
+        self._update(n)
+        self._update(pivot)
+        return pivot
+    
+    def _rebalance(self, n):
+        left, right, height = self.left, self.right, self.height
+        self._update(n)
+        balance = height[left[n]] - height[right[n]]
+        if balance > 1:
+            if height[left[left[n]]] < height[right[left[n]]]:
+                left[n] = self._rotate_left(left[n])
+            return self._rotate_right(n)
+        if balance < -1:
+            if height[right[right[n]]] < height[left[right[n]]]:
+                right[n] = self._rotate_right(right[n])
+            return self._rotate_left(n)
+        return n
+    
+    def _retrace(self, path):
+        while path:
+            n = path.pop()
+            sub = self._rebalance(n)
+            if not path:
+                self.root = sub
+            elif self.left[path[-1]] == n:
+                self.left[path[-1]] = sub
+            else:
+                self.right[path[-1]] = sub
+    
+    def _alloc(self, k):
+        if self.free:
+            n = self.free.pop()
+            self.keys[n] = k
+            self.left[n] = self.right[n] = 0
+            self.height[n] = 1
+            return n
+        self.keys.append(k)
+        self.left.append(0)
+        self.right.append(0)
+        self.height.append(1)
+        return len(self.keys) - 1
+    
+    def insert(self, key):
+        k = self.encode(key)
+        keys = self.keys
+        path = []
+        n = self.root
+        while n:
+            if k == keys[n]:
+                return False
+            path.append(n)
+            n = self.left[n] if k < keys[n] else self.right[n]
+        new = self._alloc(k)
+        if not path:
+            self.root = new
+        elif k < keys[path[-1]]:
+            self.left[path[-1]] = new
+        else:
+            self.right[path[-1]] = new
+        self.size += 1
+        self._retrace(path)
+        return True
+    
+    def search(self, key):
+        # The key itself when present, else None
+        k = self.encode(key)
+        n = self.root
+        while n and self.keys[n] != k:
+            n = self.left[n] if k < self.keys[n] else self.right[n]
+        return key if n else None
+    
+    def delete(self, key):
+        k = self.encode(key)
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        n = self.root
+        while n and keys[n] != k:
+            path.append(n)
+            n = left[n] if k < keys[n] else right[n]
+        if not n:
+            return False
+        
+        # Two children: copy up the inorder successor and delete that instead
+        if left[n] and right[n]:
+            path.append(n)
+            succ = right[n]
+            while left[succ]:
+                path.append(succ)
+                succ = left[succ]
+            keys[n] = keys[succ]
+            n = succ
+        
+        child = left[n] or right[n]
+        if not path:
+            self.root = child
+        elif left[path[-1]] == n:
+            left[path[-1]] = child
+        else:
+            right[path[-1]] = child
+        self.free.append(n)
+        self.size -= 1
+        self._retrace(path)
+        return True
+    
+    def inorder(self):
+        return list(self.scan())
+    
+    def _seek(self, k, inclusive):
+        stack = []
+        n = self.root
+        while n:
+            if self.keys[n] > k or (inclusive and self.keys[n] == k):
+                stack.append(n)
+                n = self.left[n]
+            else:
+                n = self.right[n]
+        return stack
+    
+    def _walk(self, stack):
+        keys, left, right, decode = self.keys, self.left, self.right, self.decode
+        while stack:
+            n = stack.pop()
+            yield decode(keys[n])
+            n = right[n]
+            while n:
+                stack.append(n)
+                n = left[n]
+    
+    def scan(self, low=None, high=None):
+        if low is None:
+            stack = []
+            n = self.root
+            while n:
+                stack.append(n)
+                n = self.left[n]
+        else:
+            stack = self._seek(self.encode(low), True)
+        for key in self._walk(stack):
+            if high is not None and key > high:
+                return
+            yield key
+    
+    def successor(self, key):
+        k = self.encode(key)
+        found = 0
+        n = self.root
+        while n:
+            if self.keys[n] > k:
+                found = n
+                n = self.left[n]
+            else:
+                n = self.right[n]
+        return self.decode(self.keys[found]) if found else None
+    
+    def predecessor(self, key):
+        k = self.encode(key)
+        found = 0
+        n = self.root
+        while n:
+            if self.keys[n] < k:
+                found = n
+                n = self.right[n]
+            else:
+                n = self.left[n]
+        return self.decode(self.keys[found]) if found else None
+    
+    def page(self, after=None, limit=20):
+        walk = self.scan() if after is None else self._walk(self._seek(self.encode(after), False))
+        keys = []
+        for key in walk:
+            if len(keys) == limit:
+                return keys, keys[-1]
+            keys.append(key)
+        return keys, None
+
+class DateIndex(AVLPool):
+    # Fixed event dates, stored as day ordinals
+    encode = staticmethod(date.toordinal)
+    decode = staticmethod(date.fromordinal)
+
+class TimetableEntry:
+    __slots__ = ("step", "performance", "start", "end", "stage", "performers")
+    
+    def __init__(self, step, performance, start=None, end=None, stage=None, performers=()):
+        self.step = step
+        self.performance = performance
+        self.start = start
+        self.end = end
+        self.stage = stage
+        self.performers = performers
+    
+    def __str__(self):
+        label = f"Step {self.step}: {self.performance}"
+        if self.start is not None:
+            label += f" [{format_clock(self.start)}-{format_clock(self.end)}"
+            label += f", {self.stage}]" if self.stage else "]"
+        return label
+
+class Timetable(OrderedRows):
+    # Timed event flow. Steps sit in an AVL tree so they iterate in order
+    # without re-sorting; timed entries also sit in one interval tree per
+    # stage and one per performer, so a clash check is a single overlap
+    # query on two small trees instead of a scan of the whole timetable.
+    def __init__(self):
+        self.entries = {}      # step -> TimetableEntry
+        self.steps = AVLTree()
+        self.stages = {}       # stage -> IntervalTree
+        self.performers = {}   # performer -> IntervalTree
+        self.acts = {}         # performance -> steps it is scheduled in
+        self.frozen = None
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __iter__(self):
+        for step in self.steps.scan():
+            yield self.entries[step]
+    
+    def get(self, step):
+        return self.entries.get(step)
+    
+    def conflicts(self, step, start, end, stage, performers):
+        # Clashes a slot for 'step' would cause; the step's own current slot is ignored
+        found = []
+        checks = [(self.stages.get(stage.lower()), f"Stage '{stage}' is taken by")] if stage else []
+        checks += [(self.performers.get(name), f"'{name}' is already performing in") for name in performers]
+        for tree, reason in checks:
+            if tree:
+                for key in tree.overlapping(start, end):
+                    if key[2] != step:
+                        found.append(f"{reason} {self.entries[key[2]]}")
+        return found
+    
+    def put(self, step, performance, start=None, end=None, stage=None, performers=()):
+        self.frozen = None
+        old = self.entries.get(step)
+        if old is not None:
+            self._unindex(old)
+            self.acts[old.performance].discard(step)
+            if not self.acts[old.performance]:
+                del self.acts[old.performance]
+        else:
+            self.steps.insert(step)
+        entry = TimetableEntry(step, performance, start, end, stage, tuple(performers))
+        self.entries[step] = entry
+        self.acts.setdefault(performance, set()).add(step)
+        self._index(entry)
+        return entry
+    
+    def remove(self, step):
+        entry = self.entries.pop(step, None)
+        if entry is None:
+            return None
+        self.frozen = None
+        self._unindex(entry)
+        self.acts[entry.performance].discard(step)
+        if not self.acts[entry.performance]:
+            del self.acts[entry.performance]
+        self.steps.delete(step)
+        return entry
+    
+    def recast_conflicts(self, performance, performers):
+        # Clashes moving a performance's timed slots to these performers would cause
+        found = []
+        own = self.acts.get(performance, ())
+        for step in own:
+            entry = self.entries[step]
+            if entry.start is None:
+                continue
+            for name in performers:
+                tree = self.performers.get(name)
+                if tree is None:
+                    continue
+                for key in tree.overlapping(entry.start, entry.end):
+                    if key[2] not in own:
+                        found.append(f"'{name}' is already performing in {self.entries[key[2]]}")
+        return found
+    
+    def recast(self, performance, performers):
+        # A performance's performer changed: move its slots between performer trees
+        for step in self.acts.get(performance, ()):
+            entry = self.entries[step]
+            self._unindex(entry)
+            entry.performers = tuple(performers)
+            self._index(entry)
+    
+    def _index(self, entry):
+        if entry.start is None:
+            return
+        key = (entry.start, entry.end, entry.step)
+        if entry.stage:
+            self.stages.setdefault(entry.stage.lower(), IntervalTree()).insert(key)
+        for name in entry.performers:
+            self.performers.setdefault(name, IntervalTree()).insert(key)
+    
+    def _unindex(self, entry):
+        if entry.start is None:
+            return
+        key = (entry.start, entry.end, entry.step)
+        trees = [(self.stages, entry.stage.lower())] if entry.stage else []
+        trees += [(self.performers, name) for name in entry.performers]
+        for index, name in trees:
+            index[name].delete(key)
+            if not index[name]:
+                del index[name]
+    
+    def dump(self):
+        return [[e.step, e.start, e.end, e.stage] for e in self.entries.values() if e.start is not None]
+
+class LogisticsBook:
+    # Items with a quantity and status, plus the vendor side: vendor_map
+    # (item -> vendor), its reverse index, per-vendor rollups and the set of
+    # listed items nobody supplies yet. Every change adjusts the rollups in
+    # place instead of rescanning. Items are immutable (name, quantity,
+    # status) tuples, replaced on change; each change returns the value it
+    # replaced, which is all an undo needs to put things back.
+    STATUSES = ("needed", "ordered", "delivered")
+    
+    def __init__(self):
+        self.items = {}          # name -> (name, quantity, status), in the order first listed
+        self.vendor_map = {}     # item -> vendor
+        self.vendor_items = {}   # vendor -> items mapped to it
+        self.rollups = {}        # vendor -> (items listed, units, units delivered)
+        self.unsourced = {}      # listed items without a vendor; a dict as an ordered set
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __iter__(self):
+        return iter(self.items.values())
+    
+    def __contains__(self, name):
+        return name in self.items
+    
+    def add(self, name, quantity=1):
+        # Listing an item again adds to its quantity; returns the item it replaced
+        old = self.items.get(name)
+        self.restore(name, (name, quantity + old[1], old[2]) if old else (name, quantity, "needed"))
+        return old
+    
+    def set_status(self, name, status):
+        old = self.items.get(name)
+        if old is not None:
+            self.restore(name, (name, old[1], status))
+        return old
+    
+    def map_vendor(self, item, vendor):
+        old = self.vendor_map.get(item)
+        self.remap(item, vendor)
+        return old
+    
+    def restore(self, name, item):
+        # Replaces an item (None deletes it), moving its share of the vendor rollup
+        vendor = self.vendor_map.get(name)
+        if name in self.items:
+            self._roll(vendor, self.items[name], -1)
+        if item is None:
+            del self.items[name]
+            self.unsourced.pop(name, None)
+            return
+        self.items[name] = item
+        if vendor is None:
+            self.unsourced[name] = None
+        self._roll(vendor, item, 1)
+    
+    def remap(self, item, vendor):
+        listed = self.items.get(item)
+        old = self.vendor_map.pop(item, None)
+        if old is not None:
+            self._roll(old, listed, -1)
+            self.vendor_items[old].discard(item)
+            if not self.vendor_items[old]:
+                del self.vendor_items[old]
+                del self.rollups[old]
+        if vendor is not None:
+            # A handful of vendors supply many items; share one string each
+            vendor = sys.intern(vendor)
+            self.vendor_map[item] = vendor
+            self.vendor_items.setdefault(vendor, set()).add(item)
+            self.rollups.setdefault(vendor, (0, 0, 0))
+            self._roll(vendor, listed, 1)
+            self.unsourced.pop(item, None)
+        elif listed:
+            self.unsourced[item] = None
+    
+    def _roll(self, vendor, item, sign):
+        if vendor is None or item is None:
+            return
+        count, units, delivered = self.rollups[vendor]
+        done = item[1] if item[2] == "delivered" else 0
+        self.rollups[vendor] = (count + sign, units + sign * item[1], delivered + sign * done)
+    
+    def copy(self):
+        # Read-only copy for other threads; the reverse index stays behind
+        clone = LogisticsBook()
+        clone.items = dict(self.items)
+        clone.vendor_map = dict(self.vendor_map)
+        clone.rollups = dict(self.rollups)
+        clone.unsourced = dict(self.unsourced)
+        return clone
+    
+    def dump(self):
+        return {
+            "items": [list(item) for item in self.items.values()],
+            "vendor_map": dict(self.vendor_map),
+        }
+    
+    def load(self, data):
+        self.__init__()
+        for name, quantity, status in data["items"]:
+            self.restore(name, (name, quantity, status))
+        for item, vendor in data["vendor_map"].items():
+            self.remap(item, vendor)
+
+class Shift:
+    __slots__ = ("number", "duty", "start", "end", "capacity", "crew")
+    
+    def __init__(self, number, duty, start, end, capacity):
+        self.number = number
+        self.duty = duty
+        self.start = start
+        self.end = end
+        self.capacity = capacity
+        self.crew = []
+    
+    def row(self):
+        return (self.number, self.duty, self.start, self.end, self.capacity, tuple(self.crew))
+
+class VolunteerRoster:
+    # Time-sliced shifts, each needing 'capacity' volunteers for one duty.
+    # allocate() fills open places greedily in start-time order. A duty's
+    # own volunteers are tried first, then floaters with no standing duty;
+    # among those whose availability covers the shift, the one whose window
+    # closes soonest is taken, keeping long windows for later shifts. Free
+    # people wait in lists sorted by window end, so those who can cover a
+    # shift are found by bisection and windows that have closed are cut off
+    # the front; booked ones wait in a heap keyed by when they are free
+    # again. A pass costs O((volunteers + shifts + places) log volunteers)
+    # comparisons plus list memmoves, and a step past anyone skipped for a
+    # clash with a booking from an earlier pass.
+    DAY = (0, 24 * 60)
+    
+    def __init__(self):
+        self.shifts = {}    # number -> Shift
+        self.order = []     # (start, end, number), kept sorted
+        self.rota = {}      # name -> shifts they are booked on
+        self.count = 0
+    
+    def __len__(self):
+        return len(self.shifts)
+    
+    def __iter__(self):
+        for start, end, number in self.order:
+            yield self.shifts[number].row()
+    
+    def __getitem__(self, index):
+        # Shift rows by place in start order; a slice costs only the rows taken
+        if isinstance(index, slice):
+            return [self.shifts[number].row() for start, end, number in self.order[index]]
+        return self.shifts[self.order[index][2]].row()
+    
+    def add_shift(self, duty, start, end, capacity, number=None):
+        if number is None:
+            number = self.count + 1
+        self.count = max(self.count, number)
+        self.shifts[number] = Shift(number, sys.intern(duty), start, end, capacity)
+        insort(self.order, (start, end, number))
+        return self.shifts[number]
+    
+    def remove_shift(self, number):
+        shift = self.shifts.pop(number, None)
+        if shift is None:
+            return False
+        self.order.remove((shift.start, shift.end, number))
+        for name in shift.crew:
+            self.rota[name].remove(shift)
+            if not self.rota[name]:
+                del self.rota[name]
+        return True
+    
+    def book(self, name, shift):
+        shift.crew.append(name)
+        self.rota.setdefault(name, []).append(shift)
+    
+    def clashes(self, name, shift):
+        return any(other.start < shift.end and shift.start < other.end for other in self.rota.get(name, ()))
+    
+    def allocate(self, duty_index, windows):
+        # Returns how many places were filled
+        open_shifts = [self.shifts[number] for start, end, number in self.order
+                       if len(self.shifts[number].crew) < self.shifts[number].capacity]
+        arrivals = {}   # group -> (window start, window end, name), latest start first
+        ready = {}      # group -> heap of (window end, name) for people free now
+        resting = []    # (free from, name, group) for people booked this pass
+        filled = 0
+        for shift in open_shifts:
+            while resting and resting[0][0] <= shift.start:
+                free_from, name, group = heappop(resting)
+                insort(ready[group], (windows.get(name, self.DAY)[1], name))
+            for group in dict.fromkeys((shift.duty, "")):
+                if group not in arrivals:
+                    arrivals[group] = sorted(((*windows.get(name, self.DAY), name) for name in duty_index.get(group, ())),
+                                             reverse=True)
+                    ready[group] = []
+                waiting, pool = arrivals[group], ready[group]
+                while waiting and waiting[-1][0] <= shift.start:
+                    start, end, name = waiting.pop()
+                    insort(pool, (end, name))
+                # Gone for the day: later shifts start later
+                del pool[:bisect_left(pool, (shift.start,))]
+                # Windows closing before the shift ends stay for shorter shifts
+                i = bisect_left(pool, (shift.end,))
+                while i < len(pool) and len(shift.crew) < shift.capacity:
+                    end, name = pool[i]
+                    if self.clashes(name, shift):
+                        i += 1
+                        continue
+                    del pool[i]
+                    self.book(name, shift)
+                    heappush(resting, (shift.end, name, group))
+                    filled += 1
+        return filled
+    
+    def dump(self):
+        return {"count": self.count, "shifts": [list(self.shifts[number].row()) for start, end, number in self.order]}
+    
+    def load(self, data):
+        self.__init__()
+        for number, duty, start, end, capacity, crew in data["shifts"]:
+            shift = self.add_shift(duty, start, end, capacity, number)
+            for name in crew:
+                self.book(name, shift)
+        self.count = data["count"]
+
+class FeedbackStats:
+    # Running aggregate over 1-5 ratings: a bucket histogram plus count, sum
+    # and sum of squares, so adding a rating and every statistic is O(1).
+    MIN_RATING = 1
+    MAX_RATING = 5
+    
+    def __init__(self):
+        self.buckets = [0] * (self.MAX_RATING - self.MIN_RATING + 1)
+        self.count = 0
+        self.total = 0
+        self.total_sq = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def add(self, rating):
+        self.buckets[rating - self.MIN_RATING] += 1
+        self.count += 1
+        self.total += rating
+        self.total_sq += rating * rating
+    
+    def remove(self, rating):
+        self.buckets[rating - self.MIN_RATING] -= 1
+        self.count -= 1
+        self.total -= rating
+        self.total_sq -= rating * rating
+    
+    def mean(self):
+        return self.total / self.count if self.count else None
+    
+    def variance(self):
+        if not self.count:
+            return None
+        mean = self.total / self.count
+        return max(self.total_sq / self.count - mean * mean, 0.0)
+    
+    def _rating_at(self, rank):
+        # rank is 1-based within the sorted ratings
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return i + self.MIN_RATING
+        return self.MAX_RATING
+    
+    def percentile(self, p):
+        if not self.count:
+            return None
+        rank = max(1, -(-p * self.count // 100))
+        return self._rating_at(rank)
+    
+    def median(self):
+        if not self.count:
+            return None
+        if self.count % 2:
+            return self._rating_at(self.count // 2 + 1)
+        return (self._rating_at(self.count // 2) + self._rating_at(self.count // 2 + 1)) / 2
+    
+    def histogram(self):
+        return {i + self.MIN_RATING: n for i, n in enumerate(self.buckets)}
+    
+    def copy(self):
+        clone = FeedbackStats()
+        clone.load(self.buckets)
+        return clone
+    
+    def load(self, buckets):
+        self.__init__()
+        for i, n in enumerate(buckets):
+            rating = i + self.MIN_RATING
+            self.buckets[i] = n
+            self.count += n
+            self.total += rating * n
+            self.total_sq += rating * rating * n
+    
+    def summary(self):
+        lines = [
+            f"Ratings: {self.count}",
+            f"Average Rating: {self.mean():.2f}",
+            f"Std Deviation: {self.variance() ** 0.5:.2f}",
+            f"Median: {self.median()}",
+            f"10th / 90th Percentile: {self.percentile(10)} / {self.percentile(90)}",
+            "",
+        ]
+        for rating in range(self.MAX_RATING, self.MIN_RATING - 1, -1):
+            lines.append(f"{rating} stars: {self.buckets[rating - self.MIN_RATING]}")
+        return "\n".join(lines)
+
+class SearchIndex:
+    # Inverted index over the searchable text of the event. Records map to
+    # their tokens, tokens to the records holding them, and the trigrams of
+    # each distinct token back to the token, so prefixes and misspellings are
+    # found from the query's trigrams instead of by scanning every record.
+    MIN_SIMILARITY = 0.3
+    
+    def __init__(self):
+        self.records = {}    # (section, key) -> [text, tokens, count]
+        self.postings = {}   # token -> set of (section, key)
+        self.trigrams = {}   # trigram -> set of tokens
+    
+    def __len__(self):
+        return len(self.records)
+    
+    @staticmethod
+    def tokenize(text):
+        return set(re.findall(r"\w+", text.lower()))
+    
+    @staticmethod
+    def grams(token):
+        # Padded at the front only, so a prefix's trigrams are a subset of the word's
+        padded = "  " + token
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def add(self, section, key, text=None):
+        # Counted, so a duplicated list entry stays findable until the last copy goes
+        rid = (section, key)
+        record = self.records.get(rid)
+        if record is not None:
+            record[2] += 1
+        else:
+            self._insert(rid, key if text is None else text)
+    
+    def put(self, section, key, text):
+        # Keyed entries (maps): the new text replaces whatever was indexed
+        rid = (section, key)
+        record = self.records.get(rid)
+        if record is not None:
+            if record[0] == text:
+                return
+            self._discard(rid)
+        self._insert(rid, text)
+    
+    def remove(self, section, key):
+        rid = (section, key)
+        record = self.records.get(rid)
+        if record is None:
+            return False
+        record[2] -= 1
+        if record[2] == 0:
+            self._discard(rid)
+        return True
+    
+    def _insert(self, rid, text):
+        tokens = self.tokenize(text)
+        self.records[rid] = [text, tokens, 1]
+        for token in tokens:
+            if token not in self.postings:
+                self.postings[token] = set()
+                for gram in self.grams(token):
+                    self.trigrams.setdefault(gram, set()).add(token)
+            self.postings[token].add(rid)
+    
+    def _discard(self, rid):
+        text, tokens, _ = self.records.pop(rid)
+        for token in tokens:
+            holders = self.postings[token]
+            holders.discard(rid)
+            if not holders:
+                del self.postings[token]
+                for gram in self.grams(token):
+                    self.trigrams[gram].discard(token)
+                    if not self.trigrams[gram]:
+                        del self.trigrams[gram]
+    
+    def matches(self, word):
+        # Indexed tokens close to one query word, scored exact > prefix > fuzzy
+        query_grams = self.grams(word)
+        shared = {}
+        for gram in query_grams:
+            for token in self.trigrams.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        scores = {}
+        for token, n in shared.items():
+            if token == word:
+                scores[token] = 1.0
+            elif n == len(query_grams) and token.startswith(word):
+                scores[token] = 0.5 + 0.4 * len(word) / len(token)
+            else:
+                similarity = n / (len(query_grams) + len(self.grams(token)) - n)
+                if similarity >= self.MIN_SIMILARITY:
+                    scores[token] = 0.8 * similarity
+        return scores
+    
+    def search(self, query, limit=None):
+        # Ranked (score, section, text) results; a record scores the mean of
+        # its best match for every query word, so full matches rank first
+        words = self.tokenize(query)
+        if not words:
+            return []
+        totals = {}
+        for word in words:
+            best = {}
+            for token, score in self.matches(word).items():
+                for rid in self.postings[token]:
+                    if score > best.get(rid, 0):
+                        best[rid] = score
+            for rid, score in best.items():
+                totals[rid] = totals.get(rid, 0) + score
+        ranked = nlargest(limit or len(totals), totals.items(), key=lambda item: item[1])
+        return [(score / len(words), rid[0], self.records[rid][0]) for rid, score in ranked]
+
+DATE_FORMAT = "%d-%m-%Y"
+DATES_PAGE_SIZE = 20
+SEARCH_RESULTS = 50
+
+def parse_date(text):
+    return datetime.strptime(text, DATE_FORMAT).date()
+
+def format_date(day):
+    return day.strftime(DATE_FORMAT)
+
+def parse_clock(text):
+    # "HH:MM" on the event day -> minutes since midnight
+    clock = datetime.strptime(text, "%H:%M")
+    return clock.hour * 60 + clock.minute
+
+def format_clock(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def format_elapsed(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+def describe_variance(seconds):
+    minutes = round(seconds / 60)
+    if minutes > 0:
+        return f"{minutes} min behind schedule"
+    if minutes < 0:
+        return f"{-minutes} min ahead of schedule"
+    return "on schedule"
+
+# Instrumentation
+PROFILE_WINDOW = 1000      # recent samples per timer behind the percentile table
+PROFILE_SAMPLES = 100000   # samples kept for export, oldest dropped first
+LAG_INTERVAL_MS = 100
+DIAGNOSTICS_MS = 1000
+
+def percentile(ordered, p):
+    # Nearest rank on an already sorted list
+    return ordered[min(max(int(round(p / 100 * len(ordered))) - 1, 0), len(ordered) - 1)]
+
+class Instruments:
+    # Opt-in timers for a live session (--instrument, or Record in the
+    # diagnostics panel, Ctrl+Shift+D). Each timer keeps a count, a total and
+    # its last PROFILE_WINDOW samples for rolling percentiles; samples are
+    # also logged with their wall time for export. Operations may be timed
+    # on the API's writer thread while the panel reads on the Tk thread.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timers = {}   # name -> [count, total seconds, recent seconds]
+        self.samples = deque(maxlen=PROFILE_SAMPLES)
+    
+    def add(self, name, seconds):
+        with self.lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = [0, 0.0, deque(maxlen=PROFILE_WINDOW)]
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2].append(seconds)
+            self.samples.append((time.time(), name, seconds))
+    
+    def wrap(self, name, fn):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - started)
+        return timed
+    
+    def table(self):
+        # (name, count, total, p50, p99, max) in ms, largest total first
+        with self.lock:
+            timers = [(name, count, total, sorted(recent)) for name, (count, total, recent) in self.timers.items()]
+        rows = [(name, count, total * 1000, percentile(recent, 50) * 1000, percentile(recent, 99) * 1000, recent[-1] * 1000)
+                for name, count, total, recent in timers]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+    
+    def reset(self):
+        with self.lock:
+            self.timers.clear()
+            self.samples.clear()
+    
+    def export(self, path):
+        # One CSV row per sample, for offline analysis; returns the row count
+        with self.lock:
+            samples = list(self.samples)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["time", "name", "ms"])
+            for at, name, seconds in samples:
+                writer.writerow([f"{at:.6f}", name, f"{seconds * 1000:.3f}"])
+        return len(samples)
+
+class ChangeFeed:
+    # Observer hub. Operations announce what changed in which topic and at
+    # which position (None when the position is not known cheaply); views
+    # subscribe per topic and decide how much of themselves to repaint.
+    def __init__(self):
+        self.listeners = {}
+        # Optional hand-off used when changes happen on another thread
+        self.relay = None
+        self.instruments = None
+    
+    def subscribe(self, topic, callback):
+        self.listeners.setdefault(topic, []).append(callback)
+    
+    def unsubscribe(self, topic, callback):
+        if callback in self.listeners.get(topic, ()):
+            self.listeners[topic].remove(callback)
+    
+    def emit(self, topic, kind, position=None):
+        if self.relay is not None:
+            self.relay(topic, kind, position)
+        else:
+            self.dispatch(topic, kind, position)
+    
+    def dispatch(self, topic, kind, position):
+        for callback in list(self.listeners.get(topic, ())):
+            callback(topic, kind, position)
+
+class History:
+    # Undo/redo journal shared by every section. An entry keeps the
+    # operation that made a change, to redo it, and a compact inverse that
+    # carries the positions it needs, so undoing never searches. Undo takes
+    # the newest change overall or the newest in one section; the oldest
+    # entries are evicted once there are more than LIMIT of them or their
+    # JSON size passes MAX_BYTES. Entries are plain lists so the history can
+    # be snapshotted with the rest of the state.
+    LIMIT = 500
+    MAX_BYTES = 1 << 20
+    MIXED = "import"   # section of a grouped change that touched several sections
+    
+    def __init__(self):
+        self.done = OrderedDict()   # seq -> [seq, section, label, forward, inverse, size]
+        self.sections = {}          # section -> its seqs in done, newest last
+        self.undone = []            # entries to redo, newest last
+        self.seq = 0
+        self.bytes = 0
+    
+    def __len__(self):
+        return len(self.done)
+    
+    def record(self, section, label, forward, inverse):
+        self.undone.clear()
+        self.seq += 1
+        self._push([self.seq, section, label, forward, inverse, len(json.dumps([label, forward, inverse]))])
+    
+    def pop(self, section=None):
+        # Moves the newest entry (of one section, if given) to the redo stack
+        if section is None:
+            if not self.done:
+                return None
+            entry = self.done.popitem()[1]
+        else:
+            if section not in self.sections:
+                return None
+            entry = self.done.pop(self.sections[section][-1])
+        self._unlist(entry, -1)
+        self.undone.append(entry)
+        return entry
+    
+    def unpop(self, inverse):
+        # Redone entries take the inverse the change produced this time; one
+        # that changed nothing (inverse None) is dropped
+        entry = self.undone.pop()
+        if inverse is not None:
+            entry[4] = inverse
+            entry[5] = len(json.dumps(entry[2:5]))
+            self._push(entry)
+        return entry
+    
+    def forget(self, section):
+        # Drops a section's entries once a change that cannot be undone moves
+        # its positions, with any import that spanned several sections
+        for name in (section, self.MIXED):
+            for seq in self.sections.pop(name, ()):
+                self.bytes -= self.done.pop(seq)[5]
+        self.undone = [entry for entry in self.undone if entry[1] not in (section, self.MIXED)]
+    
+    def _push(self, entry):
+        self.done[entry[0]] = entry
+        self.sections.setdefault(entry[1], deque()).append(entry[0])
+        self.bytes += entry[5]
+        while len(self.done) > self.LIMIT or self.bytes > self.MAX_BYTES:
+            self._unlist(self.done.popitem(last=False)[1], 0)
+    
+    def _unlist(self, entry, end):
+        # An entry leaves done from one end of its section's seqs: 0 oldest, -1 newest
+        seqs = self.sections[entry[1]]
+        if end == 0:
+            seqs.popleft()
+        else:
+            seqs.pop()
+        if not seqs:
+            del self.sections[entry[1]]
+        self.bytes -= entry[5]
+    
+    def dump(self):
+        # Entries are copied: unpop() rewrites them while the store's writer
+        # thread may still be encoding this snapshot
+        return {"seq": self.seq, "done": [list(entry) for entry in self.done.values()],
+                "undone": [list(entry) for entry in self.undone]}
+    
+    def load(self, data):
+        self.__init__()
+        for entry in data["done"]:
+            self._push(entry)
+        self.undone = list(data["undone"])
+        self.seq = data["seq"]
+
+# Fields of EventService that each change topic dirties
+TOPIC_FIELDS = {
+    "agenda": ("agenda",),
+    "requests": ("approval_queue", "expired_requests"),
+    "announcements": ("announcements",),
+    "responsibilities": ("responsibility_map",),
+    "logistics": ("logistics",),
+    "vendors": ("logistics",),
+    "rehearsals": ("rehearsal_queue", "performance_map", "rehearsal_rooms"),
+    "flow": ("event_flow_map", "timetable"),
+    "execution": ("execution_queue", "exec_minutes"),
+    "show": ("live_show",),
+    "volunteers": ("volunteer_map", "duty_index", "volunteer_windows", "roster"),
+    "feedback": ("feedback_stats", "performance_feedback"),
+}
+
+class FrozenSchedule(tuple):
+    # Ordered like the schedule and sliceable, with O(1) membership like its name index
+    def __new__(cls, names):
+        view = super().__new__(cls, names)
+        view.names = frozenset(view)
+        return view
+    
+    def __contains__(self, name):
+        return name in self.names
+
+def freeze_field(name, value):
+    if name == "execution_queue":
+        return FrozenSchedule(value.snapshot())
+    if name == "duty_index":
+        return MappingProxyType({duty: frozenset(names) for duty, names in value.items()})
+    if name in ("feedback_stats", "logistics", "live_show"):
+        return value.copy()
+    if name == "performance_feedback":
+        return MappingProxyType({perf: stats.copy() for perf, stats in value.items()})
+    if isinstance(value, dict):
+        return MappingProxyType(dict(value))
+    if hasattr(value, "snapshot"):
+        # Kept in order by the structure itself, so no walk or sort per version
+        return value.snapshot()
+    return tuple(value)
+
+class StateView:
+    # One immutable version of the readable event state. Attribute names
+    # match EventService, so GUI code reads a view or the live service alike.
+    def __init__(self, version, fields):
+        self.version = version
+        self.__dict__.update(fields)
+
+class VersionedState:
+    # Copy-on-write publisher. The writer thread marks topics dirty as it
+    # applies operations; publish() re-freezes only the dirty fields, shares
+    # the rest with the previous version and hands the new view plus the
+    # merged change events to a sink. Readers just grab the current view.
+    def __init__(self, service, sink):
+        self.service = service
+        self.sink = sink
+        self.dirty = set()
+        self.events = []
+        fields = {name: freeze_field(name, getattr(service, name))
+                  for names in TOPIC_FIELDS.values() for name in names}
+        self.current = StateView(0, fields)
+    
+    def on_change(self, topic, kind, position):
+        self.dirty.add(topic)
+        self.events.append((topic, kind, position))
+    
+    def publish(self):
+        if not self.events:
+            return
+        fields = dict(vars(self.current))
+        del fields["version"]
+        for topic in self.dirty:
+            for name in TOPIC_FIELDS.get(topic, ()):
+                fields[name] = freeze_field(name, getattr(self.service, name))
+        self.current = StateView(self.current.version + 1, fields)
+        events, self.events = self.events, []
+        self.dirty = set()
+        self.sink(self.current, events)
+
+class EventService:
+    # Headless core that owns all event state and every operation on it. The
+    # Tk GUI, the bulk importer and the HTTP API all act through perform(), so
+    # each change is journaled and announced the same way whoever makes it.
+    OPERATIONS = (
+        "agenda_add",
+        "agenda_undo",
+        "request_add",
+        "request_approve",
+        "request_approve_many",
+        "request_reprioritize",
+        "request_policy",
+        "request_expire",
+        "date_insert",
+        "date_delete",
+        "announcement_add",
+        "announcement_remove",
+        "responsibility_assign",
+        "item_add",
+        "item_undo",
+        "item_status",
+        "vendor_map",
+        "rehearsal_add",
+        "rehearsal_next",
+        "rehearsal_room_add",
+        "rehearsal_room_remove",
+        "rehearsal_policy",
+        "rehearsal_dispatch",
+        "rehearsal_done",
+        "flow_step",
+        "exec_add",
+        "exec_next",
+        "exec_delete",
+        "exec_insert",
+        "exec_move",
+        "exec_duration",
+        "show_start",
+        "show_next",
+        "show_stop",
+        "show_auto",
+        "volunteer_assign",
+        "volunteer_available",
+        "shift_add",
+        "shift_remove",
+        "roster_allocate",
+        "feedback_add",
+        "undo",
+        "redo",
+    )
+    # Argument kinds per operation, checked before API calls reach the state.
+    # A trailing "?" also allows None; trailing arguments with defaults may be left out.
+    # Numbers must be finite, and times are epoch seconds every platform can format.
+    ARG_TYPES = {"text": (str,), "int": (int,), "number": (int, float), "time": (int, float), "bool": (bool,)}
+    TIME_RANGE = (0, 4102444800)   # 1970 to 2100
+    OP_ARGS = {
+        "agenda_add": ("text",),
+        "request_add": ("text", "int", "time?"),
+        "request_approve_many": ("int",),
+        "request_reprioritize": ("int", "int"),
+        "request_policy": ("text",),
+        "request_expire": ("time",),
+        "date_insert": ("text",),
+        "date_delete": ("text",),
+        "announcement_add": ("text",),
+        "announcement_remove": ("text",),
+        "responsibility_assign": ("text", "text"),
+        "item_add": ("text", "int"),
+        "item_status": ("text", "text"),
+        "vendor_map": ("text", "text"),
+        "rehearsal_add": ("text", "text", "number?"),
+        "rehearsal_room_add": ("text",),
+        "rehearsal_room_remove": ("text",),
+        "rehearsal_policy": ("text",),
+        "rehearsal_done": ("text",),
+        "flow_step": ("int", "text", "int?", "int?", "text?"),
+        "exec_add": ("text", "number?"),
+        "exec_delete": ("text",),
+        "exec_insert": ("text?", "text"),
+        "exec_move": ("text", "text?"),
+        "exec_duration": ("text", "number?"),
+        "show_start": ("time", "bool"),
+        "show_next": ("time",),
+        "show_stop": ("time",),
+        "show_auto": ("bool",),
+        "volunteer_assign": ("text", "text"),
+        "volunteer_available": ("text", "int", "int"),
+        "shift_add": ("text", "int", "int", "int"),
+        "shift_remove": ("int",),
+        "feedback_add": ("int", "text?"),
+        "undo": ("text?",),
+    }
+    
+    def __init__(self):
+        self.agenda = []
+        self.approval_queue = ApprovalScheduler()
+        self.expired_requests = deque(maxlen=ApprovalScheduler.HISTORY)
+        self.dates_index = DateIndex()
+        self.announcements = LinkedList()
+        self.responsibility_map = {}
+        self.logistics = LogisticsBook()
+        self.rehearsal_queue = Queue()
+        self.rehearsal_minutes = {}
+        self.rehearsal_rooms = RehearsalDispatcher()
+        self.performance_map = {}
+        self.event_flow_map = {}
+        self.timetable = Timetable()
+        self.execution_queue = Schedule()
+        self.exec_minutes = {}
+        self.live_show = LiveShow()
+        self.volunteer_map = {}
+        self.duty_index = {}
+        self.volunteer_windows = {}
+        self.roster = VolunteerRoster()
+        self.feedback_stats = FeedbackStats()
+        self.performance_feedback = {}
+        self.search = SearchIndex()
+        self.changes = ChangeFeed()
+        self.history = History()
+        self.replaying = False   # set while undo/redo re-runs an operation
+        self.replayed = None
+        self.grouping = None     # (section, forward, inverse) per change while a group is open
+        self.store = None
+        self.writer = None
+        self.versions = None
+        self.instruments = None
+    
+    def enable_versions(self, sink):
+        # Route change events into versioned snapshots for off-thread readers
+        self.versions = VersionedState(self, sink)
+        self.changes.relay = self.versions.on_change
+        return self.versions.current
+    
+    def disable_versions(self):
+        self.versions = None
+        self.changes.relay = None
+    
+    def publish(self):
+        if self.versions is not None:
+            self.versions.publish()
+    
+    def apply(self, op, *args):
+        if op not in self.OPERATIONS:
+            raise ValueError(f"unknown operation '{op}'")
+        return getattr(self, "op_" + op)(*args)
+    
+    def check_args(self, op, args):
+        # For arguments from outside the process, e.g. JSON from the API
+        if op not in self.OPERATIONS:
+            raise ValueError(f"unknown operation '{op}'")
+        kinds = self.OP_ARGS.get(op, ())
+        code = getattr(self, "op_" + op).__func__
+        required = len(kinds) - len(code.__defaults__ or ())
+        if not required <= len(args) <= len(kinds):
+            expected = f"{required} to {len(kinds)}" if required < len(kinds) else str(required)
+            raise ValueError(f"'{op}' takes {expected} arguments, got {len(args)}")
+        for n, (kind, value) in enumerate(zip(kinds, args), 1):
+            if value is None and kind.endswith("?"):
+                continue
+            kind = kind.rstrip("?")
+            types = self.ARG_TYPES[kind]
+            # JSON has no separate boolean for numbers, but Python counts True as an int
+            if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+                raise ValueError(f"argument {n} of '{op}' must be {kind}"
+                                 + (" or null" if kinds[n - 1].endswith("?") else ""))
+            if isinstance(value, float) and not math.isfinite(value):
+                raise ValueError(f"argument {n} of '{op}' must be a finite number")
+            if kind == "time" and not self.TIME_RANGE[0] <= value <= self.TIME_RANGE[1]:
+                raise ValueError(f"argument {n} of '{op}' must be a time between 1970 and 2100")
+    
+    def perform(self, op, *args):
+        if self.instruments is None:
+            result = self.apply(op, *args)
+        else:
+            # Without the API, this includes the repaints the change triggers
+            started = time.perf_counter()
+            result = self.apply(op, *args)
+            self.instruments.add("op " + op, time.perf_counter() - started)
+        if self.store:
+            self.store.record(op, args)
+        return result
+    
+    def call(self, op, *args):
+        # GUI entry point: goes through the API's writer task when one is running
+        if self.writer is not None:
+            return self.writer.call(op, *args)
+        return self.perform(op, *args)
+    
+    def batch(self, fn, *args):
+        # Many changes as one unit. With the API running, fn runs on its
+        # writer, so it may call perform() directly and readers get a single
+        # new version at the end instead of one per change.
+        if self.writer is not None:
+            return self.writer.batch(fn, *args)
+        return fn(*args)
+    
+    def read(self, fn, *args):
+        # Runs a read of live structures where it cannot race the writer
+        if self.writer is not None:
+            return self.writer.read(fn, *args)
+        return fn(*args)
+    
+    def find(self, query, limit=SEARCH_RESULTS):
+        return self.search.search(query, limit)
+    
+    def performers_of(self, perf, part=None):
+        # Names a performance ties up (by its performer, or the one given);
+        # an act with no known performer stands for itself
+        part = part or self.performance_map.get(perf) or perf
+        return [sys.intern(name.strip().lower()) for name in re.split(r"[,&/]", part) if name.strip()]
+    
+    def reindex(self):
+        self.search = SearchIndex()
+        for point in self.agenda:
+            self.search.add("agenda", point)
+        for msg in self.announcements:
+            self.search.add("announcements", msg)
+        for item, quantity, status in self.logistics:
+            self.search.put("logistics", item, item)
+        for item, vendor in self.logistics.vendor_map.items():
+            self.search.put("vendors", item, f"{item}: {vendor}")
+        for perf, part in self.performance_map.items():
+            self.search.put("performances", perf, f"{perf}: {part}")
+        for key, perf in self.event_flow_map.items():
+            self.search.put("flow", key, f"{key}: {perf}")
+        for perf in self.execution_queue:
+            self.search.put("execution", perf, perf)
+    
+    def remember(self, section, label, op, args, inverse, *inverse_args):
+        # Journals a change for undo; 'inverse' names the method that reverts it
+        if self.replaying:
+            self.replayed = [inverse, list(inverse_args)]
+        elif self.grouping is not None:
+            self.grouping.append((section, [op, list(args)], [inverse, list(inverse_args)]))
+        else:
+            self.history.record(section, label, [op, list(args)], [inverse, list(inverse_args)])
+    
+    def begin_group(self):
+        # Changes until end_group() become one history entry (a bulk import)
+        self.grouping = []
+    
+    def end_group(self, label):
+        steps, self.grouping = self.grouping, None
+        if not steps:
+            return
+        sections = {section for section, forward, inverse in steps}
+        section = sections.pop() if len(sections) == 1 else History.MIXED
+        self.history.record(section, label, ["group", [forward for section, forward, inverse in steps]],
+                            ["revert_group", [inverse for section, forward, inverse in steps]])
+        if self.store:
+            # The grouping itself is not journaled; a snapshot keeps the one
+            # entry, rather than one per row, across a restart
+            self.store.snapshot()
+    
+    def op_group(self, *steps):
+        # Redoes a grouped change; runs only from op_redo, so replaying is set
+        inverses = []
+        for op, args in steps:
+            self.replayed = None
+            getattr(self, "op_" + op)(*args)
+            if self.replayed is not None:
+                inverses.append(self.replayed)
+        self.replayed = ["revert_group", inverses] if inverses else None
+    
+    def revert_group(self, *inverses):
+        for name, args in reversed(inverses):
+            getattr(self, name)(*args)
+    
+    def replay(self, name, args):
+        self.replaying = True
+        self.replayed = None
+        try:
+            getattr(self, name)(*args)
+        finally:
+            self.replaying = False
+        return self.replayed
+    
+    def op_undo(self, section=None):
+        # Reverts the newest change, or the newest in one section; returns its label
+        entry = self.history.pop(section)
+        if entry is None:
+            return None
+        self.replay(*entry[4])
+        return entry[2]
+    
+    def op_redo(self):
+        if not self.history.undone:
+            return None
+        # Same state as when it was first made, but keep the fresh inverse in
+        # case the change landed on a new number (e.g. a re-added request)
+        op, args = self.history.undone[-1][3]
+        return self.history.unpop(self.replay("op_" + op, args))[2]
+    
+    def op_agenda_add(self, point):
+        # Indexed first: it is the step that can fail on a bad value
+        self.search.add("agenda", point)
+        self.agenda.append(point)
+        self.changes.emit("agenda", "append", len(self.agenda) - 1)
+        self.remember("agenda", f"adding '{point}' to the agenda", "agenda_add", (point,), "revert_agenda_add")
+    
+    def revert_agenda_add(self):
+        point = self.agenda.pop()
+        self.search.remove("agenda", point)
+        self.changes.emit("agenda", "remove", len(self.agenda))
+    
+    def op_agenda_undo(self):
+        return self.op_undo("agenda")
+    
+    def op_request_add(self, req, priority=0, deadline=None):
+        if not 0 <= priority < len(ApprovalScheduler.LEVELS):
+            raise ValueError(f"priority must be between 0 and {len(ApprovalScheduler.LEVELS) - 1}")
+        request = self.approval_queue.enqueue(req, priority, deadline)
+        self.changes.emit("requests", "append", self.approval_queue.place(request.number))
+        self.remember("requests", f"requesting '{req}'", "request_add", (req, priority, deadline),
+                      "revert_request_add", request.number)
+        return request.number
+    
+    def revert_request_add(self, number):
+        # The request may have expired since
+        if number in self.approval_queue:
+            self.approval_queue.withdraw(number)
+            self.changes.emit("requests", "remove")
+    
+    def op_request_approve(self):
+        approved = self.approval_queue.dequeue()
+        if approved is None:
+            return None
+        self.changes.emit("requests", "remove", 0)
+        self.remember("requests", f"approving '{approved.text}'", "request_approve", (),
+                      "revert_request_approve", approved.dump())
+        return approved.text
+    
+    def op_request_approve_many(self, n):
+        approved = self.approval_queue.dequeue_many(n)
+        if approved:
+            self.changes.emit("requests", "remove", 0)
+            self.remember("requests", f"approving {len(approved)} requests", "request_approve_many", (n,),
+                          "revert_request_approve", *[request.dump() for request in approved])
+        return [request.text for request in approved]
+    
+    def revert_request_approve(self, *requests):
+        for fields in requests:
+            self.approval_queue.restore(ApprovalRequest(*fields))
+        self.changes.emit("requests", "append")
+    
+    def op_request_reprioritize(self, number, priority):
+        if not 0 <= priority < len(ApprovalScheduler.LEVELS):
+            raise ValueError(f"priority must be between 0 and {len(ApprovalScheduler.LEVELS) - 1}")
+        old = self.approval_queue.pending.get(number)
+        if self.approval_queue.reprioritize(number, priority) is None:
+            return False
+        self.changes.emit("requests", "update")
+        self.remember("requests", f"marking '{old.text}' {ApprovalScheduler.LEVELS[priority]}", "request_reprioritize",
+                      (number, priority), "op_request_reprioritize", number, old.priority)
+        return True
+    
+    def op_request_policy(self, policy):
+        old = self.approval_queue.policy
+        self.approval_queue.set_policy(policy)
+        self.changes.emit("requests", "update")
+        self.remember("requests", f"switching requests to {policy}", "request_policy", (policy,), "op_request_policy", old)
+    
+    def op_request_expire(self, now):
+        expired = self.approval_queue.expire(now)
+        if expired:
+            self.expired_requests.extend(expired)
+            self.changes.emit("requests", "remove")
+        return [request.text for request in expired]
+    
+    def op_date_insert(self, iso):
+        if self.dates_index.insert(date.fromisoformat(iso)):
+            self.changes.emit("dates", "append")
+            self.remember("dates", f"adding the date {iso}", "date_insert", (iso,), "op_date_delete", iso)
+            return True
+        return False
+    
+    def op_date_delete(self, iso):
+        if self.dates_index.delete(date.fromisoformat(iso)):
+            self.changes.emit("dates", "remove")
+            self.remember("dates", f"deleting the date {iso}", "date_delete", (iso,), "op_date_insert", iso)
+            return True
+        return False
+    
+    def op_announcement_add(self, msg):
+        self.search.add("announcements", msg)
+        self.announcements.add(msg)
+        self.changes.emit("announcements", "append", len(self.announcements) - 1)
+        self.remember("announcements", f"announcing '{msg}'", "announcement_add", (msg,), "revert_announcement_add")
+    
+    def revert_announcement_add(self):
+        self.search.remove("announcements", self.announcements.pop())
+        self.changes.emit("announcements", "remove", len(self.announcements))
+    
+    def op_announcement_remove(self, msg):
+        # The neighbour is recorded for undo rather than the position, which
+        # would take a walk of the list on every removal
+        follower = self.announcements.follower(msg)
+        if self.announcements.remove(msg):
+            self.search.remove("announcements", msg)
+            self.changes.emit("announcements", "remove")
+            self.remember("announcements", f"removing the announcement '{msg}'", "announcement_remove", (msg,),
+                          "revert_announcement_unlink", msg, follower)
+            return True
+        return False
+    
+    def revert_announcement_unlink(self, msg, follower):
+        self.announcements.restore_before(follower, msg)
+        self.search.add("announcements", msg)
+        self.changes.emit("announcements", "append")
+    
+    def revert_announcement_remove(self, msg, position):
+        # Undo entries from snapshots taken before removals recorded a neighbour
+        self.announcements.restore(position, msg)
+        self.search.add("announcements", msg)
+        self.changes.emit("announcements", "append", position)
+    
+    def op_responsibility_assign(self, name, task):
+        old = self.responsibility_map.get(name)
+        self.responsibility_map[name] = task
+        if old is None:
+            self.changes.emit("responsibilities", "append", len(self.responsibility_map) - 1)
+        else:
+            self.changes.emit("responsibilities", "update")
+        self.remember("responsibilities", f"giving {name} '{task}'", "responsibility_assign", (name, task),
+                      "revert_responsibility_assign", name, old)
+    
+    def revert_responsibility_assign(self, name, old):
+        if old is None:
+            # A new member was the last one added
+            del self.responsibility_map[name]
+            self.changes.emit("responsibilities", "remove", len(self.responsibility_map))
+        else:
+            self.responsibility_map[name] = old
+            self.changes.emit("responsibilities", "update")
+    
+    def op_item_add(self, item, quantity=1):
+        if quantity < 1:
+            raise ValueError("quantity must be at least 1")
+        old = self.logistics.add(item, quantity)
+        if old is None:
+            self.search.put("logistics", item, item)
+            self.changes.emit("logistics", "append", len(self.logistics) - 1)
+        else:
+            self.changes.emit("logistics", "update")
+        if item in self.logistics.vendor_map:
+            self.changes.emit("vendors", "update")
+        self.remember("logistics", f"listing {quantity} x '{item}'", "item_add", (item, quantity),
+                      "revert_logistics_item", item, old and list(old))
+    
+    def op_item_undo(self):
+        # Undoes the last item, status or vendor change; returns what was undone
+        return self.op_undo("logistics")
+    
+    def op_item_status(self, item, status):
+        if status not in LogisticsBook.STATUSES:
+            raise ValueError(f"status must be one of {', '.join(LogisticsBook.STATUSES)}")
+        old = self.logistics.set_status(item, status)
+        if old is None:
+            return False
+        self.changes.emit("logistics", "update")
+        if item in self.logistics.vendor_map:
+            self.changes.emit("vendors", "update")
+        self.remember("logistics", f"marking '{item}' {status}", "item_status", (item, status),
+                      "revert_logistics_item", item, list(old))
+        return True
+    
+    def revert_logistics_item(self, name, old):
+        self.logistics.restore(name, old and tuple(old))
+        if old is None:
+            # A new item was the last one listed
+            self.search.remove("logistics", name)
+            self.changes.emit("logistics", "remove", len(self.logistics))
+        else:
+            self.changes.emit("logistics", "update")
+        if name in self.logistics.vendor_map:
+            self.changes.emit("vendors", "update")
+    
+    def op_vendor_map(self, item, vendor):
+        old = self.logistics.map_vendor(item, vendor)
+        self.search.put("vendors", item, f"{item}: {vendor}")
+        self.changes.emit("vendors", "update")
+        if item in self.logistics:
+            self.changes.emit("logistics", "update")
+        self.remember("logistics", f"sourcing '{item}' from {vendor}", "vendor_map", (item, vendor),
+                      "revert_logistics_vendor", item, old)
+    
+    def revert_logistics_vendor(self, item, old):
+        self.logistics.remap(item, old)
+        if old is None:
+            self.search.remove("vendors", item)
+        else:
+            self.search.put("vendors", item, f"{item}: {old}")
+        self.changes.emit("vendors", "update")
+        if item in self.logistics:
+            self.changes.emit("logistics", "update")
+    
+    def op_rehearsal_add(self, perf, part, minutes=None):
+        # Returns the clashes that kept the performer change off the timetable, [] once queued
+        if minutes is not None and minutes <= 0:
+            raise ValueError("rehearsal minutes must be positive")
+        part = sys.intern(part)
+        # The act's timed steps move to the new performers, who must be free for them
+        clashes = self.timetable.recast_conflicts(perf, self.performers_of(perf, part))
+        if clashes:
+            return clashes
+        old_part, old_minutes = self.performance_map.get(perf), self.rehearsal_minutes.get(perf)
+        if minutes is not None:
+            self.rehearsal_minutes[perf] = minutes
+        # Re-queuing a known performance changes the performer shown on older rows too
+        remapped = old_part is not None
+        self.rehearsal_queue.enqueue(perf)
+        self.performance_map[perf] = part
+        self.search.put("performances", perf, f"{perf}: {part}")
+        self.timetable.recast(perf, self.performers_of(perf))
+        self.changes.emit("rehearsals", "update" if remapped else "append", None if remapped else len(self.rehearsal_queue.q) - 1)
+        self.remember("rehearsals", f"queuing '{perf}' for rehearsal", "rehearsal_add", (perf, part, minutes),
+                      "revert_rehearsal_add", perf, old_part, old_minutes)
+        return []
+    
+    def revert_rehearsal_add(self, perf, old_part, old_minutes):
+        self.rehearsal_queue.q.pop()
+        if old_part is None:
+            del self.performance_map[perf]
+            self.search.remove("performances", perf)
+        else:
+            self.performance_map[perf] = old_part
+            self.search.put("performances", perf, f"{perf}: {old_part}")
+        if old_minutes is None:
+            self.rehearsal_minutes.pop(perf, None)
+        else:
+            self.rehearsal_minutes[perf] = old_minutes
+        self.timetable.recast(perf, self.performers_of(perf))
+        self.changes.emit("rehearsals", "remove" if old_part is None else "update",
+                          len(self.rehearsal_queue.q) if old_part is None else None)
+    
+    def op_rehearsal_next(self):
+        nxt = self.rehearsal_queue.dequeue()
+        if nxt is not None:
+            self.changes.emit("rehearsals", "remove", 0)
+            self.remember("rehearsals", f"calling '{nxt}' to rehearse", "rehearsal_next", (), "revert_rehearsal_next", nxt)
+        return nxt
+    
+    def revert_rehearsal_next(self, perf):
+        self.rehearsal_queue.q.appendleft(perf)
+        self.changes.emit("rehearsals", "append", 0)
+    
+    def op_rehearsal_room_add(self, room):
+        if self.rehearsal_rooms.add_room(room):
+            self.changes.emit("rehearsals", "update")
+            return True
+        return False
+    
+    def op_rehearsal_room_remove(self, room):
+        # Acts still booked in the room go back to the front of the waiting queue
+        acts = self.rehearsal_rooms.remove_room(room)
+        if acts is None:
+            return False
+        self.rehearsal_queue.q.extendleft(reversed(acts))
+        self.history.forget("rehearsals")
+        self.changes.emit("rehearsals", "update")
+        return True
+    
+    def op_rehearsal_policy(self, policy):
+        self.rehearsal_rooms.set_policy(policy)
+    
+    def op_rehearsal_dispatch(self):
+        # Books every waiting act it can into a room; returns [[performance, room], ...]
+        # with room None for an act left waiting (performer_free found no room for it)
+        if not self.rehearsal_rooms:
+            raise ValueError("add a rehearsal room first")
+        acts = list(self.rehearsal_queue.q)
+        if not acts:
+            return []
+        self.rehearsal_queue.q.clear()
+        self.history.forget("rehearsals")
+        if self.rehearsal_rooms.policy == "shortest_first":
+            acts.sort(key=lambda perf: self.rehearsal_minutes.get(perf, RehearsalDispatcher.DEFAULT_MINUTES))
+        assigned = []
+        for perf in acts:
+            minutes = self.rehearsal_minutes.get(perf, RehearsalDispatcher.DEFAULT_MINUTES)
+            assigned.append([perf, self.rehearsal_rooms.assign(perf, minutes, self.performers_of(perf))])
+        self.rehearsal_queue.q.extend(perf for perf, room in assigned if room is None)
+        self.changes.emit("rehearsals", "update")
+        return assigned
+    
+    def op_rehearsal_done(self, room):
+        done = self.rehearsal_rooms.finish(room)
+        if done is not None:
+            self.changes.emit("rehearsals", "update")
+        return done
+    
+    def op_flow_step(self, key, perf, start=None, end=None, stage=None):
+        # Returns the clashes that kept a timed step off the timetable, [] once placed
+        if (start is None) != (end is None):
+            raise ValueError("a timed step needs both a start and an end")
+        if start is not None and not 0 <= start < end <= 24 * 60:
+            raise ValueError("a step must end after it starts, within the day")
+        performers = self.performers_of(perf)
+        if start is not None:
+            clashes = self.timetable.conflicts(key, start, end, stage, performers)
+            if clashes:
+                return clashes
+        entry = self.timetable.get(key)
+        old = entry and [entry.performance, entry.start, entry.end, entry.stage]
+        self.event_flow_map[key] = perf
+        self.timetable.put(key, perf, start, end, stage or None, performers)
+        self.search.put("flow", key, f"{key}: {perf}")
+        self.changes.emit("flow", "update")
+        self.remember("flow", f"setting step {key} to '{perf}'", "flow_step", (key, perf, start, end, stage),
+                      "revert_flow_step", key, old)
+        return []
+    
+    def revert_flow_step(self, key, old):
+        if old is None:
+            del self.event_flow_map[key]
+            self.timetable.remove(key)
+            self.search.remove("flow", key)
+        else:
+            perf, start, end, stage = old
+            self.event_flow_map[key] = perf
+            self.timetable.put(key, perf, start, end, stage, self.performers_of(perf))
+            self.search.put("flow", key, f"{key}: {perf}")
+        self.changes.emit("flow", "update")
+    
+    def planned_seconds(self, perf):
+        return 60 * self.exec_minutes.get(perf, LiveShow.DEFAULT_MINUTES)
+    
+    def track_queued(self, perf, sign):
+        # Keeps the show's planned total in step with the schedule
+        self.live_show.queued += sign * self.planned_seconds(perf)
+        self.changes.emit("show", "update")
+    
+    def op_exec_add(self, perf, minutes=None):
+        if minutes is not None and minutes <= 0:
+            raise ValueError("performance minutes must be positive")
+        if perf in self.execution_queue:
+            return False
+        old_minutes = self.exec_minutes.get(perf)
+        if minutes is not None:
+            self.exec_minutes[perf] = minutes
+        self.execution_queue.append(perf)
+        self.search.put("execution", perf, perf)
+        self.track_queued(perf, 1)
+        self.changes.emit("execution", "append", len(self.execution_queue) - 1)
+        self.remember("execution", f"scheduling '{perf}'", "exec_add", (perf, minutes),
+                      "revert_exec_add", perf, old_minutes)
+        return True
+    
+    def revert_exec_add(self, perf, old_minutes):
+        self.op_exec_delete(perf)
+        if old_minutes is None:
+            self.exec_minutes.pop(perf, None)
+        else:
+            self.exec_minutes[perf] = old_minutes
+    
+    def op_exec_duration(self, perf, minutes):
+        # Planned length of a performance; None goes back to the default
+        if minutes is not None and minutes <= 0:
+            raise ValueError("performance minutes must be positive")
+        old = self.exec_minutes.get(perf)
+        if perf in self.execution_queue:
+            self.track_queued(perf, -1)
+        if minutes is None:
+            self.exec_minutes.pop(perf, None)
+        else:
+            self.exec_minutes[perf] = minutes
+        if perf in self.execution_queue:
+            self.track_queued(perf, 1)
+        if perf == self.live_show.current:
+            self.live_show.current_planned = self.planned_seconds(perf)
+            self.changes.emit("show", "update")
+        self.changes.emit("execution", "update")
+        self.remember("execution", f"planning {minutes or LiveShow.DEFAULT_MINUTES} min for '{perf}'", "exec_duration",
+                      (perf, minutes), "op_exec_duration", perf, old)
+    
+    def op_exec_next(self):
+        now = self.take_next()
+        if now is not None:
+            self.remember("execution", f"starting '{now}'", "exec_next", (), "revert_exec_next", now)
+        return now
+    
+    def take_next(self):
+        now = self.execution_queue.popleft()
+        if now is not None:
+            self.search.remove("execution", now)
+            self.track_queued(now, -1)
+            self.changes.emit("execution", "remove", 0)
+        return now
+    
+    def revert_exec_next(self, perf):
+        self.schedule_at(perf, None)
+        self.changes.emit("execution", "append", 0)
+    
+    def op_exec_delete(self, perf):
+        node = self.execution_queue.index.get(perf)
+        prev = node and node.prev and node.prev.data
+        if self.execution_queue.remove(perf):
+            self.search.remove("execution", perf)
+            self.track_queued(perf, -1)
+            self.changes.emit("execution", "remove")
+            self.remember("execution", f"cancelling '{perf}'", "exec_delete", (perf,), "revert_exec_delete", perf, prev)
+            return True
+        return False
+    
+    def revert_exec_delete(self, perf, prev):
+        self.schedule_at(perf, prev)
+        self.changes.emit("execution", "append")
+    
+    def schedule_at(self, perf, after):
+        # Puts a performance back after 'after', or at the front when it is None
+        self.execution_queue.append(perf)
+        self.execution_queue.move_after(perf, after)
+        self.search.put("execution", perf, perf)
+        self.track_queued(perf, 1)
+    
+    def op_exec_insert(self, after, perf):
+        # Falls back to the end of the schedule when 'after' is not scheduled
+        placed = self.execution_queue.insert_after(after, perf)
+        if placed:
+            self.search.put("execution", perf, perf)
+            self.changes.emit("execution", "append")
+        elif self.execution_queue.append(perf):
+            self.search.put("execution", perf, perf)
+            self.changes.emit("execution", "append", len(self.execution_queue) - 1)
+        else:
+            return False
+        self.track_queued(perf, 1)
+        self.remember("execution", f"scheduling '{perf}'", "exec_insert", (after, perf), "op_exec_delete", perf)
+        return placed
+    
+    def op_exec_move(self, perf, after):
+        node = self.execution_queue.index.get(perf)
+        prev = node and node.prev and node.prev.data
+        if self.execution_queue.move_after(perf, after):
+            self.changes.emit("execution", "update")
+            self.remember("execution", f"moving '{perf}'", "exec_move", (perf, after), "op_exec_move", perf, prev)
+            return True
+        return False
+    
+    def op_show_start(self, now, auto=False):
+        # Starts the show with the first scheduled act; returns its name
+        if self.live_show.running:
+            raise ValueError("the show is already running")
+        if not self.execution_queue:
+            raise ValueError("schedule a performance first")
+        self.live_show.start(now, auto)
+        return self.op_show_next(now)
+    
+    def op_show_next(self, now):
+        # Ends the current act and starts the next; the show stops after the last one
+        if not self.live_show.running:
+            raise ValueError("the show is not running")
+        self.live_show.finish(now)
+        # Not undoable: putting the act back would leave it on stage and queued
+        perf = self.take_next()
+        if perf is None:
+            self.live_show.stop(now)
+        else:
+            self.live_show.begin(perf, self.planned_seconds(perf), now)
+        self.changes.emit("show", "update")
+        return perf
+    
+    def op_show_stop(self, now):
+        # Returns the seconds the show ran over (+) or under (-) its plan
+        if not self.live_show.running:
+            return None
+        variance = self.live_show.variance(now)
+        self.live_show.stop(now)
+        self.changes.emit("show", "update")
+        return variance
+    
+    def op_show_auto(self, auto):
+        self.live_show.auto = bool(auto)
+        self.changes.emit("show", "update")
+    
+    def op_volunteer_assign(self, name, duty):
+        duty = sys.intern(duty)
+        old = self.volunteer_map.get(name)
+        if old is not None:
+            self.index_duty(name, old, None)
+        self.volunteer_map[name] = duty
+        self.index_duty(name, None, duty)
+        if old is None:
+            self.changes.emit("volunteers", "append", len(self.volunteer_map) - 1)
+        else:
+            self.changes.emit("volunteers", "update")
+        self.remember("volunteers", f"giving {name} the duty '{duty}'", "volunteer_assign", (name, duty),
+                      "revert_volunteer", name, old, self.volunteer_windows.get(name))
+    
+    def revert_volunteer(self, name, old_duty, old_window):
+        self.index_duty(name, self.volunteer_map[name], old_duty)
+        if old_window is None:
+            self.volunteer_windows.pop(name, None)
+        else:
+            self.volunteer_windows[name] = tuple(old_window)
+        if old_duty is None:
+            # A new volunteer was the last one added
+            del self.volunteer_map[name]
+            self.changes.emit("volunteers", "remove", len(self.volunteer_map))
+        else:
+            self.volunteer_map[name] = old_duty
+            self.changes.emit("volunteers", "update")
+    
+    def index_duty(self, name, old, new):
+        if old is not None:
+            self.duty_index[old].discard(name)
+            if not self.duty_index[old]:
+                del self.duty_index[old]
+        if new is not None:
+            self.duty_index.setdefault(new, set()).add(name)
+    
+    def op_volunteer_available(self, name, start, end):
+        # Someone not yet on the list joins as a floater with no standing duty ("")
+        if not 0 <= start < end <= 24 * 60:
+            raise ValueError("availability must end after it starts, within the day")
+        old_duty, old_window = self.volunteer_map.get(name), self.volunteer_windows.get(name)
+        self.volunteer_windows[name] = (start, end)
+        if old_duty is None:
+            self.volunteer_map[name] = ""
+            self.index_duty(name, None, "")
+            self.changes.emit("volunteers", "append", len(self.volunteer_map) - 1)
+        else:
+            self.changes.emit("volunteers", "update")
+        self.remember("volunteers", f"marking {name} available {format_clock(start)}-{format_clock(end)}",
+                      "volunteer_available", (name, start, end), "revert_volunteer", name, old_duty, old_window)
+    
+    def op_shift_add(self, duty, start, end, capacity):
+        if not 0 <= start < end <= 24 * 60:
+            raise ValueError("a shift must end after it starts, within the day")
+        if capacity < 1:
+            raise ValueError("a shift needs at least one volunteer")
+        shift = self.roster.add_shift(duty, start, end, capacity)
+        self.changes.emit("volunteers", "update")
+        self.remember("volunteers", f"adding a {duty} shift", "shift_add", (duty, start, end, capacity),
+                      "revert_shift_add", shift.number)
+        return shift.number
+    
+    def revert_shift_add(self, number):
+        if self.roster.remove_shift(number):
+            if number == self.roster.count:
+                self.roster.count -= 1
+            self.changes.emit("volunteers", "update")
+    
+    def op_shift_remove(self, number):
+        if self.roster.remove_shift(number):
+            self.changes.emit("volunteers", "update")
+            return True
+        return False
+    
+    def op_roster_allocate(self):
+        filled = self.roster.allocate(self.duty_index, self.volunteer_windows)
+        if filled:
+            # Bookings are not journaled for undo, so earlier volunteer changes can no longer be
+            self.history.forget("volunteers")
+            self.changes.emit("volunteers", "update")
+        return filled
+    
+    def op_feedback_add(self, rating, perf):
+        if not FeedbackStats.MIN_RATING <= rating <= FeedbackStats.MAX_RATING:
+            raise ValueError("rating must be between 1 and 5")
+        self.feedback_stats.add(rating)
+        if perf:
+            if perf not in self.performance_feedback:
+                self.performance_feedback[perf] = FeedbackStats()
+            self.performance_feedback[perf].add(rating)
+        self.changes.emit("feedback", "append")
+        label = f"rating '{perf}' {rating}/5" if perf else f"a {rating}/5 rating"
+        self.remember("feedback", label, "feedback_add", (rating, perf), "revert_feedback_add", rating, perf)
+    
+    def revert_feedback_add(self, rating, perf):
+        self.feedback_stats.remove(rating)
+        if perf:
+            self.performance_feedback[perf].remove(rating)
+            if not self.performance_feedback[perf].count:
+                del self.performance_feedback[perf]
+        self.changes.emit("feedback", "remove")
+    
+    def capture_state(self):
+        return {
+            "agenda": list(self.agenda),
+            "approval_queue": self.approval_queue.dump(),
+            "expired_requests": [request.dump() for request in self.expired_requests],
+            "dates": [day.isoformat() for day in self.dates_index.inorder()],
+            "announcements": self.announcements.display(),
+            "responsibility_map": dict(self.responsibility_map),
+            "logistics": self.logistics.dump(),
+            "rehearsal_queue": self.rehearsal_queue.display(),
+            "rehearsal_minutes": dict(self.rehearsal_minutes),
+            "rehearsal_rooms": self.rehearsal_rooms.dump(),
+            "performance_map": dict(self.performance_map),
+            "event_flow_map": [[k, v] for k, v in self.event_flow_map.items()],
+            "timetable": self.timetable.dump(),
+            "execution_queue": self.execution_queue.display(),
+            "exec_minutes": dict(self.exec_minutes),
+            "live_show": self.live_show.dump(),
+            "volunteer_map": dict(self.volunteer_map),
+            "volunteer_windows": {name: list(window) for name, window in self.volunteer_windows.items()},
+            "roster": self.roster.dump(),
+            "feedback": list(self.feedback_stats.buckets),
+            "performance_feedback": {k: list(v.buckets) for k, v in self.performance_feedback.items()},
+            "history": self.history.dump(),
+        }
+    
+    def restore_state(self, data):
+        self.agenda = list(data["agenda"])
+        self.approval_queue = ApprovalScheduler()
+        if isinstance(data["approval_queue"], list):
+            # Snapshots from before the scheduler held a plain FIFO list
+            for req in data["approval_queue"]:
+                self.approval_queue.enqueue(req)
+        else:
+            self.approval_queue.load(data["approval_queue"])
+        self.expired_requests = deque((ApprovalRequest(*fields) for fields in data.get("expired_requests", ())),
+                                      maxlen=ApprovalScheduler.HISTORY)
+        self.dates_index = DateIndex()
+        for iso in data["dates"]:
+            self.dates_index.insert(date.fromisoformat(iso))
+        self.announcements = LinkedList()
+        for msg in data["announcements"]:
+            self.announcements.add(msg)
+        self.responsibility_map = dict(data["responsibility_map"])
+        self.logistics = LogisticsBook()
+        if isinstance(data["logistics"], list):
+            # Snapshots from before quantities: a plain item list plus vendor_map
+            for item in data["logistics"]:
+                self.logistics.add(item)
+            for item, vendor in data["vendor_map"].items():
+                self.logistics.map_vendor(item, vendor)
+        else:
+            self.logistics.load(data["logistics"])
+        self.rehearsal_queue = Queue()
+        self.rehearsal_queue.q.extend(data["rehearsal_queue"])
+        self.rehearsal_minutes = dict(data.get("rehearsal_minutes", {}))
+        self.rehearsal_rooms = RehearsalDispatcher()
+        if "rehearsal_rooms" in data:
+            self.rehearsal_rooms.load_state(data["rehearsal_rooms"])
+        self.performance_map = {perf: sys.intern(part) for perf, part in data["performance_map"].items()}
+        self.event_flow_map = {k: v for k, v in data["event_flow_map"]}
+        slots = {step: (start, end, stage) for step, start, end, stage in data.get("timetable", ())}
+        self.timetable = Timetable()
+        for k, v in self.event_flow_map.items():
+            self.timetable.put(k, v, *slots.get(k, (None, None, None)), self.performers_of(v))
+        self.execution_queue = Schedule()
+        for perf in data["execution_queue"]:
+            self.execution_queue.append(perf)
+        self.exec_minutes = dict(data.get("exec_minutes", {}))
+        self.live_show = LiveShow()
+        self.live_show.queued = sum(self.planned_seconds(perf) for perf in self.execution_queue)
+        if "live_show" in data:
+            self.live_show.load(data["live_show"])
+        self.volunteer_map = {name: sys.intern(duty) for name, duty in data["volunteer_map"].items()}
+        self.duty_index = {}
+        for name, duty in self.volunteer_map.items():
+            self.index_duty(name, None, duty)
+        self.volunteer_windows = {name: tuple(window) for name, window in data.get("volunteer_windows", {}).items()}
+        self.roster = VolunteerRoster()
+        if "roster" in data:
+            self.roster.load(data["roster"])
+        self.feedback_stats = FeedbackStats()
+        self.feedback_stats.load(data["feedback"])
+        self.performance_feedback = {}
+        for perf, buckets in data["performance_feedback"].items():
+            self.performance_feedback[perf] = FeedbackStats()
+            self.performance_feedback[perf].load(buckets)
+        # Snapshots from before the shared history start with nothing to undo
+        self.history = History()
+        if "history" in data:
+            self.history.load(data["history"])
+        self.reindex()
+
+# Bulk import
+IMPORT_FIELDS = {
+    "agenda": ("point",),
+    "requests": ("request",),
+    "dates": ("date",),
+    "announcements": ("message",),
+    "responsibilities": ("member", "task"),
+    "logistics": ("item",),
+    "vendors": ("item", "vendor"),
+    "rehearsals": ("performance", "participant"),
+    "flow": ("step", "performance"),
+    "execution": ("performance",),
+    "volunteers": ("name", "duty"),
+    "availability": ("name", "start", "end"),
+    "shifts": ("duty", "start", "end", "capacity"),
+    "feedback": ("rating",),
+}
+
+JSON_CHUNK = 1 << 16
+
+class JsonStream:
+    # Decodes a JSON document one value at a time from chunked reads, so a
+    # large import array never sits in memory whole. Only the structure
+    # imports use is walked: an array of rows, or an object of row arrays.
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+    
+    def more(self):
+        chunk = self.f.read(JSON_CHUNK)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return bool(chunk)
+    
+    def peek(self):
+        # Next non-space character, "" at the end of the file
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.more():
+                return ""
+    
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"expected {' or '.join(repr(c) for c in chars)} but found {repr(char) if char else 'the end of the file'}")
+        self.pos += 1
+        return char
+    
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # A value cut by the chunk boundary; only an error once the file is out
+                if self.more():
+                    continue
+                # Its line and column count from the chunk, not the file
+                raise ValueError(e.msg)
+            # A number ending at the boundary may continue in the next chunk
+            if end < len(self.buffer) or not self.more():
+                self.pos = end
+                return value
+    
+    def items(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+    
+    def rows(self):
+        # A top-level object maps sections to their rows
+        if self.peek() == "{":
+            self.pos += 1
+            if self.peek() == "}":
+                self.pos += 1
+            else:
+                while True:
+                    section = self.value()
+                    if not isinstance(section, str):
+                        raise ValueError("expected a section name")
+                    self.expect(":")
+                    for row in self.items():
+                        yield dict(row, section=section) if isinstance(row, dict) else row
+                    if self.expect(",}") == "}":
+                        break
+        else:
+            yield from self.items()
+        if self.peek():
+            raise ValueError("unexpected data after the end of the document")
+
+def read_import_rows(path):
+    # Yields (row number, row) lazily so large files are never fully loaded.
+    # A row that cannot be decoded comes back as its ValueError; in a .json
+    # file nothing after it can be read, so it is the last row.
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if ext == ".csv":
+            for n, row in enumerate(csv.DictReader(f), 2):
+                yield n, row
+        elif ext in (".jsonl", ".ndjson"):
+            for n, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield n, json.loads(line)
+                    except ValueError as e:
+                        yield n, e
+        elif ext == ".json":
+            n = 0
+            try:
+                for n, row in enumerate(JsonStream(f).rows(), 1):
+                    yield n, row
+            except ValueError as e:
+                yield n + 1, e
+        else:
+            raise ValueError(f"Unsupported file type '{ext}'. Use .csv, .json or .jsonl.")
+
+def read_priority(value):
+    # Optional column: a level name or its number, Routine when blank
+    value = str(value or "").strip()
+    if not value:
+        return 0
+    for level, name in enumerate(ApprovalScheduler.LEVELS):
+        if value.lower() == name.lower() or value == str(level):
+            return level
+    raise ValueError(f"priority must be one of {', '.join(ApprovalScheduler.LEVELS)}")
+
+def read_deadline(value):
+    value = str(value or "").strip()
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, DATE_FORMAT + " %H:%M").timestamp()
+    except ValueError:
+        raise ValueError("due must be in DD-MM-YYYY HH:MM format")
+
+def row_to_operation(section, row, service):
+    if section not in IMPORT_FIELDS:
+        raise ValueError(f"unknown section '{section}'")
+    values = {}
+    for field in IMPORT_FIELDS[section]:
+        value = str(row.get(field) or "").strip()
+        if not value:
+            raise ValueError(f"'{field}' is required")
+        values[field] = value
+    
+    if section == "agenda":
+        return "agenda_add", (values["point"],)
+    if section == "requests":
+        return "request_add", (values["request"], read_priority(row.get("priority")), read_deadline(row.get("due")))
+    if section == "dates":
+        try:
+            return "date_insert", (parse_date(values["date"]).isoformat(),)
+        except ValueError:
+            raise ValueError("date must be in DD-MM-YYYY format")
+    if section == "announcements":
+        return "announcement_add", (values["message"],)
+    if section == "responsibilities":
+        return "responsibility_assign", (values["member"], values["task"])
+    if section == "logistics":
+        quantity = str(row.get("quantity") or "").strip()
+        if not quantity:
+            return "item_add", (values["item"],)
+        if not quantity.isdigit() or int(quantity) < 1:
+            raise ValueError("quantity must be a positive whole number")
+        return "item_add", (values["item"], int(quantity))
+    if section == "vendors":
+        return "vendor_map", (values["item"], values["vendor"])
+    if section == "rehearsals":
+        minutes = str(row.get("minutes") or "").strip()
+        if not minutes:
+            return "rehearsal_add", (values["performance"], values["participant"])
+        if not minutes.isdigit() or int(minutes) <= 0:
+            raise ValueError("minutes must be a positive whole number")
+        return "rehearsal_add", (values["performance"], values["participant"], int(minutes))
+    if section == "flow":
+        try:
+            step = int(values["step"])
+        except ValueError:
+            raise ValueError("step must be a number")
+        start, end = str(row.get("start") or "").strip(), str(row.get("end") or "").strip()
+        if start or end:
+            try:
+                start, end = parse_clock(start), parse_clock(end)
+            except ValueError:
+                raise ValueError("start and end must both be in HH:MM format")
+            if end <= start:
+                raise ValueError("end must be after start")
+            return "flow_step", (step, values["performance"], start, end, str(row.get("stage") or "").strip() or None)
+        return "flow_step", (step, values["performance"])
+    if section == "execution":
+        if values["performance"] in service.execution_queue:
+            raise ValueError(f"'{values['performance']}' is already scheduled")
+        minutes = str(row.get("minutes") or "").strip()
+        if not minutes:
+            return "exec_add", (values["performance"],)
+        if not minutes.isdigit() or int(minutes) <= 0:
+            raise ValueError("minutes must be a positive whole number")
+        return "exec_add", (values["performance"], int(minutes))
+    if section == "volunteers":
+        return "volunteer_assign", (values["name"], values["duty"])
+    if section in ("availability", "shifts"):
+        try:
+            start, end = parse_clock(values["start"]), parse_clock(values["end"])
+        except ValueError:
+            raise ValueError("start and end must be in HH:MM format")
+        if end <= start:
+            raise ValueError("end must be after start")
+        if section == "availability":
+            return "volunteer_available", (values["name"], start, end)
+        if not values["capacity"].isdigit() or int(values["capacity"]) < 1:
+            raise ValueError("capacity must be a positive whole number")
+        return "shift_add", (values["duty"], start, end, int(values["capacity"]))
+    # feedback
+    try:
+        rating = int(values["rating"])
+    except ValueError:
+        raise ValueError("rating must be a number")
+    if not 1 <= rating <= 5:
+        raise ValueError("rating must be between 1 and 5")
+    return "feedback_add", (rating, str(row.get("performance") or "").strip())
+
+def import_file(path, service, section=None):
+    # Rows carrying a 'section' field override the default section.
+    # Returns (imported count, [(row number, error message)]). Applies rows
+    # with perform(), so run it through service.batch() when the API may be up.
+    imported = 0
+    errors = []
+    # The whole file is one undo step, however many rows it has
+    service.begin_group()
+    try:
+        for n, row in read_import_rows(path):
+            if isinstance(row, ValueError):
+                errors.append((n, f"invalid JSON: {row}"))
+                continue
+            if not isinstance(row, dict):
+                errors.append((n, "row must be a JSON object"))
+                continue
+            row_section = str(row.get("section") or section or "").strip().lower()
+            try:
+                op, args = row_to_operation(row_section, row, service)
+                result = service.perform(op, *args)
+            except ValueError as e:
+                errors.append((n, str(e)))
+                continue
+            if op in ("flow_step", "rehearsal_add") and result:
+                # Kept off the timetable by a clash
+                errors.append((n, "; ".join(result)))
+                continue
+            imported += 1
+    finally:
+        service.end_group(f"importing {os.path.basename(path)}")
+    return imported, errors
+
+# Persistence
+DATA_DIR = os.environ.get("EVENT_MANAGER_DATA", os.path.join(os.path.dirname(os.path.abspath(__file__)), "event_data"))
+SNAPSHOT_EVERY = 1000
+JOURNAL_BATCH = 512
+LOAD_PROGRESS_EVERY = 1000   # journal entries replayed between progress reports
+DEFAULT_EVENT = "default"
+OPEN_EVENTS = 8
+
+class EventStore:
+    # Write-ahead journal plus periodic snapshots. The Tk thread only appends
+    # to an in-memory queue; a writer thread batches lines, fsyncs once per
+    # batch and writes snapshots, so disk I/O never blocks the main loop.
+    def __init__(self, service, directory=DATA_DIR):
+        self.service = service
+        self.directory = directory
+        self.journal_path = os.path.join(directory, "journal.jsonl")
+        self.snapshot_path = os.path.join(directory, "snapshot.json")
+        self.seq = 0
+        self.since_snapshot = 0
+        self.pending = queue.Queue()
+        self.writer = None
+        self.load_times = {}   # stage -> ms spent in the last recover()
+    
+    def recover(self, progress=None):
+        # Load the last snapshot, then replay only journal entries after it.
+        # progress, if given, is called with the fraction of bytes read so far.
+        os.makedirs(self.directory, exist_ok=True)
+        sizes = [os.path.getsize(path) if os.path.exists(path) else 0
+                 for path in (self.snapshot_path, self.journal_path)]
+        total = sum(sizes) or 1
+        started = time.perf_counter()
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snap = json.load(f)
+            self.service.restore_state(snap["state"])
+            self.seq = snap["seq"]
+        self.load_times["snapshot"] = (time.perf_counter() - started) * 1000
+        read = sizes[0]
+        if progress:
+            progress(read / total)
+        started = time.perf_counter()
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            # Byte offset just past the last complete record
+            intact = 0
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    read += len(line)
+                    if not line.endswith(b"\n"):
+                        break  # torn write at the tail from a crash
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    intact = read - sizes[0]
+                    if entry["seq"] <= self.seq:
+                        continue
+                    self.service.apply(entry["op"], *entry["args"])
+                    self.seq = entry["seq"]
+                    replayed += 1
+                    if progress and replayed % LOAD_PROGRESS_EVERY == 0:
+                        progress(min(read / total, 1.0))
+            if intact < sizes[1]:
+                # Cut the torn tail off, or records appended after it would be
+                # stranded behind it at the next recovery
+                os.truncate(self.journal_path, intact)
+        self.load_times["journal replay"] = (time.perf_counter() - started) * 1000
+        if progress:
+            progress(1.0)
+        self.since_snapshot = replayed
+        self.writer = threading.Thread(target=self._write_loop, name="event-store", daemon=True)
+        self.writer.start()
+        self.service.store = self
+        return replayed
+    
+    def record(self, op, args):
+        self.seq += 1
+        self.pending.put(("op", json.dumps({"seq": self.seq, "op": op, "args": list(args)})))
+        self.since_snapshot += 1
+        if self.since_snapshot >= SNAPSHOT_EVERY:
+            self.snapshot()
+    
+    def snapshot(self):
+        # State is captured on the caller's thread; encoding and I/O happen in the writer
+        self.since_snapshot = 0
+        self.pending.put(("snapshot", (self.seq, self.service.capture_state())))
+    
+    def close(self):
+        if self.writer is None:
+            return
+        if self.since_snapshot:
+            self.snapshot()
+        self.pending.put(("stop", None))
+        self.writer.join()
+        self.writer = None
+    
+    def _write_loop(self):
+        journal = open(self.journal_path, "a", encoding="utf-8")
+        try:
+            while True:
+                batch = [self.pending.get()]
+                while len(batch) < JOURNAL_BATCH:
+                    try:
+                        batch.append(self.pending.get_nowait())
+                    except queue.Empty:
+                        break
+                lines = []
+                for kind, payload in batch:
+                    if kind == "op":
+                        lines.append(payload)
+                        continue
+                    self._flush(journal, lines)
+                    lines = []
+                    if kind == "stop":
+                        return
+                    journal = self._write_snapshot(journal, *payload)
+                self._flush(journal, lines)
+        finally:
+            journal.close()
+    
+    def _flush(self, journal, lines):
+        if lines:
+            journal.write("\n".join(lines) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+    
+    def _write_snapshot(self, journal, seq, state):
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"seq": seq, "state": state}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        # Everything up to seq is in the snapshot, so start a fresh journal
+        journal.close()
+        return open(self.journal_path, "w", encoding="utf-8")
+
+def event_slug(name):
+    slug = re.sub(r"[^a-z0-9]+", "-", name.strip().lower()).strip("-")
+    if not slug:
+        raise ValueError("an event name needs at least one letter or digit")
+    return slug
+
+class EventRegistry:
+    # Many events in one process. Each event is its own EventService with
+    # its own journal directory (the default event keeps the top-level data
+    # directory), so events share nothing but the process. Events load on
+    # first use; once more than 'limit' are open (a count of events, not a
+    # memory budget), evict() snapshots the least recently used to disk and
+    # drops them, to be recovered when next used.
+    def __init__(self, directory=DATA_DIR, limit=OPEN_EVENTS):
+        self.directory = directory
+        self.limit = max(limit, 1)
+        self.open_events = OrderedDict()   # name -> EventStore, most recently used last
+    
+    def __contains__(self, name):
+        return name in self.open_events
+    
+    def __len__(self):
+        return len(self.open_events)
+    
+    def path(self, name):
+        if name == DEFAULT_EVENT:
+            return self.directory
+        return os.path.join(self.directory, "events", name)
+    
+    def names(self):
+        events = os.path.join(self.directory, "events")
+        found = set(os.listdir(events)) if os.path.isdir(events) else set()
+        return [DEFAULT_EVENT] + sorted((found | set(self.open_events)) - {DEFAULT_EVENT})
+    
+    def services(self):
+        return [store.service for store in self.open_events.values()]
+    
+    def open(self, name, progress=None):
+        # Returns (event name, its service); the name is normalized to its slug
+        name = event_slug(name)
+        store = self.open_events.get(name)
+        if store is None:
+            service = EventService()
+            store = EventStore(service, self.path(name))
+            store.recover(progress)
+            self.open_events[name] = store
+        else:
+            self.open_events.move_to_end(name)
+        return name, store.service
+    
+    def evict(self, keep):
+        # Closing snapshots the event's state, so this runs on the thread that
+        # changes the services, not the loader; 'keep' (the event in use) stays
+        # open even when the limit is 1
+        for name in list(self.open_events):
+            if len(self.open_events) <= self.limit:
+                break
+            if name != keep:
+                self.open_events.pop(name).close()
+    
+    def close(self, name):
+        store = self.open_events.pop(name, None)
+        if store is not None:
+            store.close()
+    
+    def close_all(self):
+        while self.open_events:
+            self.open_events.popitem(last=False)[1].close()
+
+# Local API
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_MAX_BODY = 1 << 20
+CHANGE_POLL_MS = 30
+LOAD_POLL_MS = 50
+NOTIFY_MS = 8000
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+                500: "Internal Server Error"}
+
+class EventServer:
+    # Asyncio HTTP/JSON API on localhost for door scanners and kiosks. Reads
+    # run on the loop between writes; every mutation, including those from the
+    # Tk thread, is queued to one writer task, so the service has one writer.
+    # asyncio is the slowest import in the program and only the API needs it,
+    # so methods import it locally rather than on every cold start.
+    def __init__(self, service, host=API_HOST, port=API_PORT):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.task = None
+        self.requests = None
+        self.thread = None
+        self.error = None
+        self.ready = threading.Event()
+    
+    _BATCH = object()   # stands in for the op name of a batch on the request queue
+    
+    async def submit(self, op, args):
+        future = self.loop.create_future()
+        await self.requests.put((op, args, future))
+        return await future
+    
+    def call(self, op, *args):
+        # Thread-safe entry point for callers outside the loop (the Tk thread)
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(self.submit(op, args), self.loop).result()
+    
+    def batch(self, fn, *args):
+        # Runs fn on the writer between two operations
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(self.submit(self._BATCH, (fn, args)), self.loop).result()
+    
+    async def _read(self, fn, args):
+        return fn(*args)
+    
+    def read(self, fn, *args):
+        # Reads from other threads run on the loop too, between two writes
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(self._read(fn, args), self.loop).result()
+    
+    async def _writer(self):
+        while True:
+            op, args, future = await self.requests.get()
+            try:
+                if op is self._BATCH:
+                    fn, fn_args = args
+                    result = fn(*fn_args)
+                else:
+                    self.service.check_args(op, args)
+                    result = self.service.perform(op, *args)
+            except Exception as e:
+                result, error = None, e
+            else:
+                error = None
+            # Publish once the queue is drained, so a burst becomes one version
+            # and a caller sees its own change as soon as it gets the result
+            if self.requests.empty():
+                self.service.publish()
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+    
+    async def _sweeper(self):
+        # Expires overdue approval requests; journaled only when one is due
+        import asyncio
+        while True:
+            await asyncio.sleep(ApprovalScheduler.TICK)
+            now = time.time()
+            if self.service.approval_queue.due(now):
+                await self.submit("request_expire", [now])
+    
+    async def _show_clock(self):
+        # Moves an auto-advancing live show on once its act reaches the planned time
+        import asyncio
+        while True:
+            await asyncio.sleep(LiveShow.TICK)
+            now = time.time()
+            show = self.service.live_show
+            if show.running and show.auto and show.due(now):
+                await self.submit("show_next", [now])
+    
+    async def serve(self):
+        import asyncio
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.requests = asyncio.Queue()
+        writer = asyncio.create_task(self._writer())
+        sweeper = asyncio.create_task(self._sweeper())
+        show_clock = asyncio.create_task(self._show_clock())
+        try:
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.ready.set()
+            async with server:
+                await server.serve_forever()
+        finally:
+            show_clock.cancel()
+            sweeper.cancel()
+            writer.cancel()
+    
+    def _run(self):
+        import asyncio
+        try:
+            asyncio.run(self.serve())
+        except asyncio.CancelledError:
+            pass
+        except OSError as e:
+            self.error = e
+        finally:
+            self.ready.set()
+    
+    def start(self):
+        # Runs the API on a background thread next to the Tk main loop
+        self.thread = threading.Thread(target=self._run, name="event-api", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error:
+            raise self.error
+        self.service.writer = self
+    
+    def stop(self):
+        self.service.writer = None
+        if self.thread is not None and self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.task.cancel)
+            self.thread.join()
+    
+    async def _handle(self, reader, writer):
+        import asyncio
+        try:
+            status, payload = await self._dispatch(reader)
+        except (ValueError, TypeError, KeyError) as e:
+            status, payload = 400, {"error": str(e)}
+        except asyncio.IncompleteReadError:
+            status, payload = 400, {"error": "incomplete request"}
+        except Exception as e:
+            # Whatever went wrong, the client still gets an answer
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        body = json.dumps(payload).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+    
+    async def _dispatch(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise ValueError("malformed request line")
+        method, target = request_line[0], request_line[1]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > API_MAX_BODY:
+            return 413, {"error": "request body too large"}
+        body = await reader.readexactly(length) if length else b""
+        path, _, query = target.partition("?")
+        params = dict(urllib.parse.parse_qsl(query))
+        
+        if path == "/ops":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict) or not isinstance(request.get("op"), str) \
+                    or not isinstance(request.get("args", []), list):
+                raise ValueError("body must be {\"op\": name, \"args\": [...]}")
+            result = await self.submit(request.get("op"), request.get("args", []))
+            return 200, {"result": result}
+        if method != "GET":
+            return 405, {"error": "use GET"}
+        if path == "/state":
+            return 200, self.service.capture_state()
+        if path == "/dates":
+            low = parse_date(params["from"]) if "from" in params else None
+            high = parse_date(params["to"]) if "to" in params else None
+            return 200, {"dates": [format_date(day) for day in self.service.dates_index.scan(low, high)]}
+        if path == "/search":
+            limit = int(params.get("limit", SEARCH_RESULTS))
+            results = self.service.find(params.get("q", ""), limit)
+            return 200, {"results": [{"section": section, "text": text, "score": round(score, 3)}
+                                     for score, section, text in results]}
+        if path == "/feedback":
+            perf = params.get("performance")
+            stats = self.service.performance_feedback.get(perf) if perf else self.service.feedback_stats
+            if not stats:
+                return 200, {"count": 0}
+            return 200, {
+                "count": stats.count,
+                "mean": stats.mean(),
+                "variance": stats.variance(),
+                "median": stats.median(),
+                "histogram": stats.histogram(),
+            }
+        return 404, {"error": f"no route for {path}"}
+
+# Widgets
+def seq_rows(get_seq):
+    # Row fetcher for sliceable backings (lists, tuples, the approval queue and
+    # roster, snapshots of linked structures): O(rows requested)
+    return lambda start, stop: get_seq()[start:stop]
+
+def iter_rows(get_iter):
+    # Row fetcher for hashed backings and deques, whose iterators skip to
+    # start in C without building a list, and for a handful of rooms
+    return lambda start, stop: islice(get_iter(), start, stop)
+
+class VirtualList(ttk.Frame):
+    # Read-only list pane that only renders the rows currently on screen.
+    # Each section is (topic, title, size_fn, fetch_fn, format_fn); sizes are
+    # read on every refresh and only the visible slice is fetched and formatted.
+    # Changes published on a section's topic are merged into one idle repaint.
+    def __init__(self, master, feed, sections, height=12, width=80):
+        super().__init__(master)
+        self.feed = feed
+        self.sections = sections
+        self.top = 0
+        self.visible = height
+        self.pending = []
+        self.flush_id = None
+        self.stale = False
+        self.topics = {section[0] for section in sections}
+        for topic in self.topics:
+            self.feed.subscribe(topic, self.on_change)
+        self.bind("<Destroy>", self.on_destroy)
+        self.bind("<Map>", self.on_map)
+        self.text = tk.Text(self, height=height, width=width, wrap='none')
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.text.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+        self.text.configure(state='disabled')
+        self.text.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.text.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.text.bind("<Button-5>", lambda e: self.scroll(3))
+        self.text.bind("<Configure>", self.on_resize)
+    
+    def _layout(self):
+        # (title, size, fetch, fmt, first row) per section; title and spacer rows included
+        layout = []
+        row = 0
+        for topic, title, size_fn, fetch, fmt in self.sections:
+            size = size_fn()
+            layout.append((topic, title, size, fetch, fmt, row))
+            row += size + 2
+        return layout, max(row - 1, 0)
+    
+    def timed(self, paint):
+        # Repaints are timed here, not where changes are queued for them
+        instruments = self.feed.instruments
+        if instruments is None:
+            paint()
+            return
+        started = time.perf_counter()
+        paint()
+        topics = "/".join(dict.fromkeys(section[0] for section in self.sections))
+        instruments.add("render " + topics, time.perf_counter() - started)
+    
+    def refresh(self):
+        self.timed(self._refresh)
+    
+    def _refresh(self):
+        layout, total = self._layout()
+        self.top = max(0, min(self.top, total - self.visible))
+        bottom = self.top + self.visible
+        lines = []
+        for k, (topic, title, size, fetch, fmt, first) in enumerate(layout):
+            spacer = first + size + 1 if k < len(layout) - 1 else None
+            end = first + size + (2 if spacer is not None else 1)
+            if end <= self.top or first >= bottom:
+                continue
+            if first >= self.top:
+                lines.append(title() if callable(title) else title)
+            start = max(self.top - first - 1, 0)
+            stop = min(bottom - first - 1, size)
+            if start < stop:
+                lines.extend(fmt(i, item) for i, item in enumerate(fetch(start, stop), start))
+            if spacer is not None and self.top <= spacer < bottom:
+                lines.append("")
+        self.text.configure(state='normal')
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, "\n".join(lines[:self.visible]))
+        self.text.configure(state='disabled')
+        if total:
+            self.scrollbar.set(self.top / total, min(bottom / total, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def on_change(self, topic, kind, position):
+        # Hidden panes (cached screens not on display) just remember to repaint
+        if self.stale:
+            return
+        if not self.winfo_ismapped():
+            self.stale = True
+            self.pending = []
+            return
+        self.pending.append((topic, kind, position))
+        if self.flush_id is None:
+            self.flush_id = self.after_idle(self.flush)
+    
+    def on_map(self, event):
+        if event.widget is self and self.stale:
+            self.stale = False
+            self.refresh()
+    
+    def on_destroy(self, event):
+        if event.widget is not self:
+            return
+        for topic in self.topics:
+            self.feed.unsubscribe(topic, self.on_change)
+        if self.flush_id is not None:
+            self.after_cancel(self.flush_id)
+            self.flush_id = None
+    
+    def flush(self):
+        self.timed(self._flush)
+    
+    def _flush(self):
+        # Apply the merged delta: changes wholly below the window only move the
+        # scrollbar; anything else (unknown position, rows changing on screen)
+        # repaints the window.
+        self.flush_id = None
+        pending, self.pending = self.pending, []
+        layout, total = self._layout()
+        if self.top > max(total - self.visible, 0):
+            self._refresh()
+            return
+        bottom = self.top + self.visible
+        firsts = {}
+        for topic, title, size, fetch, fmt, first in layout:
+            firsts.setdefault(topic, (first, title))
+        for topic, kind, position in pending:
+            first, title = firsts[topic]
+            if position is None or first + 1 + position < bottom or (callable(title) and self.top <= first < bottom):
+                self._refresh()
+                return
+        self.scrollbar.set(self.top / total if total else 0.0, min(bottom / total, 1.0) if total else 1.0)
+    
+    def scroll(self, rows):
+        self.top = max(0, self.top + rows)
+        self.refresh()
+        return "break"
+    
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            total = self._layout()[1]
+            self.top = int(float(args[1]) * total)
+            self.refresh()
+        elif args[0] == 'scroll':
+            step = self.visible if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * step)
+    
+    def on_resize(self, event):
+        linespace = max(tkfont.nametofont(self.text.cget('font')).metrics('linespace'), 1)
+        visible = max(event.height // linespace, 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
+
+class ScreenManager:
+    # Builds each section's frame on first visit and keeps it alive, so
+    # switching sections only swaps which frame is packed.
+    def __init__(self, root):
+        self.root = root
+        self.frames = {}
+        self.current = None
+    
+    def reset(self, keep):
+        # Drops every cached screen but 'keep'; they rebuild on next visit
+        for name in list(self.frames):
+            if name != keep:
+                frame = self.frames.pop(name)
+                if frame is self.current:
+                    self.current = None
+                frame.destroy()
+    
+    def show(self, name, build):
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = ttk.Frame(self.root, style='Screen.TFrame')
+            build(frame)
+            self.frames[name] = frame
+        if frame is not self.current:
+            if self.current is not None:
+                self.current.pack_forget()
+            frame.pack(fill='both', expand=True)
+            self.current = frame
+        return frame
+
+class EventManagementGUI:
+    def __init__(self, root, service, api=False, registry=None, event=DEFAULT_EVENT, instrument=False):
+        self.root = root
+        self.service = self.view = service
+        self.registry = registry
+        self.event = event
+        self.api = api
+        self.loading = False
+        self.root.title(f"Event Management System - {event}")
+        self.root.geometry("1000x700")
+        self.root.configure(bg='#f0f0f0')
+        
+        # Style configuration
+        style = ttk.Style()
+        style.theme_use('clam')
+        style.configure('Title.TLabel', font=('Arial', 16, 'bold'), background='#f0f0f0')
+        style.configure('Header.TLabel', font=('Arial', 12, 'bold'), background='#f0f0f0')
+        style.configure('Screen.TFrame', background='#f0f0f0')
+        
+        # With the API running, changes are made on its writer thread. The Tk
+        # thread then reads immutable versions the writer publishes, never the
+        # live structures, and installs each one from a root.after poll.
+        self.inbox = None
+        if api:
+            self.root.after(CHANGE_POLL_MS, self.drain_changes)
+        else:
+            # With the API running its writer sweeps instead
+            self.root.after(ApprovalScheduler.TICK * 1000, self.sweep_requests)
+        
+        # Non-blocking notifications, so no dialog holds up the show
+        self.status_bar = ttk.Label(self.root, anchor='w', padding=(10, 4))
+        self.status_bar.pack(side='bottom', fill='x')
+        self.status_clear_id = None
+        self.show_labels = None
+        self.show_prompted = None
+        self.root.after(LiveShow.TICK * 1000, self.tick_show)
+        
+        self.screens = ScreenManager(self.root)
+        self.root.bind('<Control-z>', self.undo_last)
+        self.root.bind('<Control-y>', self.redo_last)
+        self.create_main_menu()
+        
+        self.instruments = Instruments()
+        self.recording = False
+        self.lag_id = None
+        self.diagnostics = None
+        self.root.bind('<Control-D>', self.toggle_diagnostics)
+        self.attach(event, service)
+        if instrument:
+            self.set_recording(True)
+    
+    def attach(self, event, service):
+        # Show another event. Screens built for the previous one hold its
+        # widgets and subscriptions, so all but the main menu are dropped.
+        self.service = self.view = service
+        self.event = event
+        if self.registry is not None:
+            self.registry.evict(event)
+        service.instruments = service.changes.instruments = self.instruments if self.recording else None
+        if self.api:
+            self.inbox = queue.Queue()
+            self.view = service.enable_versions(lambda view, events: self.inbox.put((view, events)))
+        self.show_labels = None
+        self.show_prompted = None
+        self.screens.reset(keep="main")
+        if self.registry is not None:
+            self.event_combo.set(event)
+        self.global_search_entry.delete(0, tk.END)
+        self.search_display.delete(1.0, tk.END)
+        self.root.title(f"Event Management System - {event}")
+    
+    def serve_locally(self):
+        # The API could not start: keep the event open without it. Nothing
+        # publishes versions then, so screens read the live service again.
+        self.api = False
+        self.inbox = None
+        self.service.disable_versions()
+        self.view = self.service
+        self.screens.reset(keep="main")
+    
+    def load_event(self, event, ready=None, failed=None):
+        # Staged start: the menu is already on screen while the event's
+        # snapshot and journal load on a worker thread. The result comes back
+        # through a queue polled with root.after, like the API's versions.
+        self.loading = True
+        self.set_loading(event)
+        results = queue.Queue()
+        
+        def load():
+            try:
+                results.put(("done", self.registry.open(event, lambda done: results.put(("progress", done)))))
+            except Exception as e:
+                results.put(("error", e))
+        
+        threading.Thread(target=load, name="event-load", daemon=True).start()
+        self.root.after(LOAD_POLL_MS, self.poll_load, results, ready, failed)
+    
+    def poll_load(self, results, ready, failed):
+        while True:
+            try:
+                kind, payload = results.get_nowait()
+            except queue.Empty:
+                self.root.after(LOAD_POLL_MS, self.poll_load, results, ready, failed)
+                return
+            if kind == "progress":
+                self.load_bar.configure(value=payload)
+                continue
+            self.loading = False
+            self.set_loading(None)
+            if kind == "error":
+                if failed:
+                    failed(payload)
+                else:
+                    self.event_combo.set(self.event)
+                    self.notify(f"Cannot open event: {payload}.", error=True)
+                return
+            self.attach(*payload)
+            if ready:
+                ready()
+            return
+    
+    def set_loading(self, event):
+        # While an event loads the menu shows its progress and stays disabled
+        for widget in self.menu_widgets:
+            widget.state(['disabled'] if event else ['!disabled'])
+        if event:
+            self.load_label.configure(text=f"Loading '{event}'...")
+            self.load_bar.configure(value=0)
+            self.load_frame.pack(pady=(0, 10), after=self.title_label)
+        else:
+            self.load_frame.pack_forget()
+    
+    def perform(self, op, *args):
+        result = self.service.call(op, *args)
+        if self.inbox is not None:
+            self.install_versions()
+        return result
+    
+    def install_versions(self):
+        while True:
+            try:
+                view, events = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            self.view = view
+            for event in events:
+                self.service.changes.dispatch(*event)
+    
+    def drain_changes(self):
+        if self.inbox is not None:
+            self.install_versions()
+        self.root.after(CHANGE_POLL_MS, self.drain_changes)
+    
+    def open_services(self):
+        # Every event in memory; the loader thread may be adding one, so
+        # callers skip their pass while self.loading
+        return self.registry.services() if self.registry else [self.service]
+    
+    def sweep_requests(self):
+        # Every open event's requests expire on time, not only the one on screen
+        now = time.time()
+        if not self.loading:
+            for service in self.open_services():
+                if service.approval_queue.due(now):
+                    service.call("request_expire", now)
+        self.root.after(ApprovalScheduler.TICK * 1000, self.sweep_requests)
+    
+    def switch_event(self, event=None):
+        if self.loading:
+            return
+        if self.inbox is not None:
+            self.notify("Switching events is not available while the API is serving this one.", error=True)
+            return
+        started = time.perf_counter()
+        try:
+            name = event_slug(self.event_combo.get())
+        except ValueError as e:
+            self.notify(f"Cannot open event: {e}.", error=True)
+            return
+        if name == self.event:
+            return
+        switched = lambda: self.notify(f"Switched to '{name}' in {(time.perf_counter() - started) * 1000:.0f} ms.")
+        if name not in self.registry:
+            # Not in memory: load it in the background, as at start-up
+            self.load_event(name, ready=switched)
+            return
+        self.attach(*self.registry.open(name))
+        switched()
+    
+    def set_recording(self, on):
+        # Timing is off by default: with it off, nothing is wrapped and the
+        # hot paths only test for None
+        if on == self.recording:
+            return
+        self.recording = on
+        self.service.instruments = self.service.changes.instruments = self.instruments if on else None
+        displays = [name for name in dir(type(self)) if name.startswith("update_") and name.endswith("_display")]
+        for name in displays:
+            if on:
+                setattr(self, name, self.instruments.wrap(name, getattr(self, name)))
+            else:
+                self.__dict__.pop(name, None)
+        if on:
+            self.lag_id = self.root.after(LAG_INTERVAL_MS, self.measure_lag, time.perf_counter() + LAG_INTERVAL_MS / 1000)
+        elif self.lag_id is not None:
+            self.root.after_cancel(self.lag_id)
+            self.lag_id = None
+    
+    def measure_lag(self, expected):
+        # How late a timer fires is how long the event loop was busy
+        now = time.perf_counter()
+        self.instruments.add("tk loop lag", max(now - expected, 0.0))
+        self.lag_id = self.root.after(LAG_INTERVAL_MS, self.measure_lag, now + LAG_INTERVAL_MS / 1000)
+    
+    def toggle_diagnostics(self, event=None):
+        # Hidden panel (Ctrl+Shift+D): rolling latency table and sample export
+        if self.diagnostics is not None:
+            self.diagnostics.destroy()
+            self.diagnostics = None
+            return
+        window = tk.Toplevel(self.root)
+        window.title("Diagnostics")
+        window.geometry("720x400")
+        window.protocol("WM_DELETE_WINDOW", self.toggle_diagnostics)
+        self.diagnostics = window
+        
+        controls = ttk.Frame(window, padding=5)
+        controls.pack(fill='x')
+        
+        def toggle_recording():
+            self.set_recording(not self.recording)
+            self.refresh_diagnostics(record_btn, table, repeat=False)
+        
+        record_btn = ttk.Button(controls, width=10, command=toggle_recording)
+        record_btn.pack(side='left', padx=2)
+        ttk.Button(controls, text="Reset", command=self.instruments.reset).pack(side='left', padx=2)
+        ttk.Button(controls, text="Export...", command=self.export_samples).pack(side='left', padx=2)
+        
+        columns = ("count", "total", "p50", "p99", "max")
+        table = ttk.Treeview(window, columns=columns)
+        table.heading('#0', text="Timer")
+        table.column('#0', width=260)
+        for column, text in zip(columns, ("Count", "Total ms", "p50 ms", "p99 ms", "Max ms")):
+            table.heading(column, text=text)
+            table.column(column, width=80, anchor='e')
+        table.pack(fill='both', expand=True, padx=5, pady=(0, 5))
+        self.refresh_diagnostics(record_btn, table)
+    
+    def refresh_diagnostics(self, record_btn, table, repeat=True):
+        if self.diagnostics is None:
+            return
+        record_btn.configure(text="Stop" if self.recording else "Record")
+        table.delete(*table.get_children())
+        for name, count, *times in self.instruments.table():
+            table.insert('', 'end', text=name, values=[count] + [f"{ms:.2f}" for ms in times])
+        if repeat:
+            self.diagnostics.after(DIAGNOSTICS_MS, self.refresh_diagnostics, record_btn, table)
+    
+    def export_samples(self):
+        path = filedialog.asksaveasfilename(parent=self.diagnostics, defaultextension=".csv",
+                                            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            count = self.instruments.export(path)
+        except OSError as e:
+            self.notify(f"Export failed: {e}.", error=True)
+            return
+        self.notify(f"Exported {count} samples to {path}.")
+    
+    def notify(self, text, error=False):
+        self.status_bar.configure(text=text, foreground='#b00020' if error else '#1b5e20')
+        if self.status_clear_id is not None:
+            self.root.after_cancel(self.status_clear_id)
+        self.status_clear_id = self.root.after(NOTIFY_MS, lambda: self.status_bar.configure(text=""))
+    
+    def tick_show(self):
+        # Once a second: refresh the live dashboard and act on an act that is
+        # due. Like request expiry, auto-advance runs in every open event;
+        # only the one on screen prompts or reports.
+        show = self.view.live_show
+        now = time.time()
+        if not self.loading:
+            for service in self.open_services():
+                other = service.live_show
+                if service is not self.service and other.running and other.auto and other.due(now):
+                    service.call("show_next", now)
+            if show.running and show.due(now):
+                if show.auto:
+                    # With the API running its clock advances the show instead
+                    if self.inbox is None:
+                        self.advance_show(now)
+                elif show.current != self.show_prompted:
+                    self.show_prompted = show.current
+                    self.notify(f"'{show.current}' has reached its planned time. Press Next when it ends.")
+        self.update_show_labels(now)
+        self.root.after(LiveShow.TICK * 1000, self.tick_show)
+    
+    def advance_show(self, now):
+        perf = self.perform("show_next", now)
+        if perf is None:
+            self.notify(f"Show complete, {describe_variance(self.view.live_show.drift)}.")
+        else:
+            self.notify(f"Now on stage: {perf}. Remaining in queue: {len(self.view.execution_queue)}")
+        self.update_show_labels(now)
     
-    def add(self, data):
-        new = Node(data)
-        if not self.head:
-            self.head = new
+    def update_show_labels(self, now):
+        if self.show_labels is None:
+            return
+        show = self.view.live_show
+        now_label, next_label, forecast_label = self.show_labels
+        if show.current is not None:
+            line = f"Now: {show.current}, {format_elapsed(show.elapsed(now))} of {show.current_planned // 60} min"
+            if show.overrun(now):
+                line += f" (over by {format_elapsed(show.overrun(now))})"
+            now_label.configure(text=line)
         else:
-            temp = self.head
-            while temp.next:
-                temp = temp.next
-            temp.next = new
+            now_label.configure(text="Show not running.")
+        nxt = next(iter(self.view.execution_queue), None)
+        next_label.configure(text=f"Next: {nxt or '-'}. {len(self.view.execution_queue)} acts, "
+                                  f"{format_elapsed(show.queued)} planned")
+        if show.running:
+            end = datetime.fromtimestamp(show.projected_end(now)).strftime("%H:%M")
+            forecast_label.configure(text=f"Projected end {end}, {describe_variance(show.variance(now))}")
+        else:
+            forecast_label.configure(text="")
     
-    def remove(self, key):
-        temp = self.head
-        prev = None
-        while temp and temp.data != key:
-            prev = temp
-            temp = temp.next
-        if temp:
-            if prev:
-                prev.next = temp.next
-            else:
-                self.head = temp.next
+    def undo_last(self, event=None):
+        if self.loading:
+            return
+        label = self.perform("undo")
+        if label is None:
+            self.notify("Nothing to undo.", error=True)
+        else:
+            self.notify(f"Undid {label}.")
     
-    def display(self):
-        res = []
-        temp = self.head
-        while temp:
-            res.append(temp.data)
-            temp = temp.next
-        return res
-
-class BSTNode:
-    def __init__(self, key):
-        self.key = key
-        self.left = None
-        self.right = None
-
-class BST:
-    def __init__(self):
-        self.root = None
+    def redo_last(self, event=None):
+        if self.loading:
+            return
+        label = self.perform("redo")
+        if label is None:
+            self.notify("Nothing to redo.", error=True)
+        else:
+            self.notify(f"Redid {label}.")
     
-    def insert(self, root, key):
-        if root is None:
-            return BSTNode(key)
-        if key < root.key:
-            root.left = self.insert(root.left, key)
-        else:
-            root.right = self.insert(root.right, key)
-        return root
-    
-    def inorder(self, root, result):
-        if root:
-            self.inorder(root.left, result)
-            result.append(root.key)
-            self.inorder(root.right, result)
-    
-    def search(self, root, key):
-        if root is None or root.key == key:
-            return root
-        if key < root.key:
-            return self.search(root.left, key)
-        return self.search(root.right, key)
-
-# Data structures initialization
-agenda = []
-agenda_stack = Stack()
-approval_queue = Queue()
-dates_bst = BST()
-dates_root = None
-announcements = LinkedList()
-responsibility_map = {}
-logistics = []
-vendor_map = {}
-logistics_stack = Stack()
-rehearsal_queue = Queue()
-event_flow = BST()
-event_root = None
-rehearsal_list = LinkedList()
-event_queue = Queue()
-fixes_stack = Stack()
-volunteer_map = {}
-feedback_bst = BST()
-feedback_root = None
-performance_map = {}
-event_flow_map = {}
-
-class EventManagementGUI:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Event Management System")
-        self.root.geometry("1000x700")
-        self.root.configure(bg='#f0f0f0')
+    def create_main_menu(self):
+        self.screens.show("main", self.build_main_screen)
+    
+    def build_main_screen(self, frame):
+        # Title
+        self.title_label = ttk.Label(frame, text="Event Management System", style='Title.TLabel')
+        self.title_label.pack(pady=20)
         
-        # Style configuration
-        style = ttk.Style()
-        style.theme_use('clam')
-        style.configure('Title.TLabel', font=('Arial', 16, 'bold'), background='#f0f0f0')
-        style.configure('Header.TLabel', font=('Arial', 12, 'bold'), background='#f0f0f0')
+        # Shown while an event loads in the background
+        self.load_frame = ttk.Frame(frame)
+        self.load_label = ttk.Label(self.load_frame)
+        self.load_label.pack()
+        self.load_bar = ttk.Progressbar(self.load_frame, length=300, maximum=1.0)
+        self.load_bar.pack(pady=(2, 0))
+        self.menu_widgets = []
         
-        self.create_main_menu()
-    
-    def create_main_menu(self):
-        # Clear the window
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        # Event switcher: type a new name to start an event
+        if self.registry is not None:
+            event_frame = ttk.LabelFrame(frame, text="Event", padding=10)
+            event_frame.pack(padx=20, pady=(0, 10), fill='x')
+            
+            self.event_combo = ttk.Combobox(event_frame, width=40, values=self.registry.names(),
+                                            postcommand=lambda: self.event_combo.configure(values=self.registry.names()))
+            self.event_combo.set(self.event)
+            self.event_combo.grid(row=0, column=0, padx=5)
+            self.event_combo.bind('<<ComboboxSelected>>', self.switch_event)
+            self.event_combo.bind('<Return>', self.switch_event)
+            open_btn = ttk.Button(event_frame, text="Open", command=self.switch_event)
+            open_btn.grid(row=0, column=1, padx=5)
+            self.menu_widgets += [self.event_combo, open_btn]
         
-        # Title
-        title_label = ttk.Label(self.root, text="Event Management System", style='Title.TLabel')
-        title_label.pack(pady=20)
+        # Global search
+        search_frame = ttk.LabelFrame(frame, text="Search Everything", padding=10)
+        search_frame.pack(padx=20, fill='x')
+        
+        self.global_search_entry = ttk.Entry(search_frame, width=60)
+        self.global_search_entry.pack(fill='x')
+        self.global_search_entry.bind('<KeyRelease>', self.run_search)
+        self.menu_widgets.append(self.global_search_entry)
+        
+        self.search_display = scrolledtext.ScrolledText(search_frame, height=6, width=80)
+        self.search_display.pack(pady=(5, 0), fill='x')
         
         # Button frame
-        button_frame = ttk.Frame(self.root)
-        button_frame.pack(pady=20)
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(pady=10)
         
         # Menu buttons
         buttons = [
@@ -170,18 +4372,108 @@ class EventManagementGUI:
         for i, (text, command) in enumerate(buttons):
             btn = ttk.Button(button_frame, text=text, command=command, width=30)
             btn.pack(pady=5)
+            self.menu_widgets.append(btn)
+        
+        import_btn = ttk.Button(button_frame, text="Bulk Import", command=self.import_menu, width=30)
+        import_btn.pack(pady=(20, 5))
+        
+        # Undo/redo across every section (also Ctrl+Z / Ctrl+Y)
+        history_frame = ttk.Frame(button_frame)
+        history_frame.pack(pady=5)
+        undo_btn = ttk.Button(history_frame, text="Undo", command=self.undo_last, width=14)
+        undo_btn.grid(row=0, column=0, padx=(0, 2))
+        redo_btn = ttk.Button(history_frame, text="Redo", command=self.redo_last, width=14)
+        redo_btn.grid(row=0, column=1, padx=(2, 0))
+        self.menu_widgets += [import_btn, undo_btn, redo_btn]
         
         # Exit button
         exit_btn = ttk.Button(button_frame, text="Exit", command=self.root.quit, width=30)
         exit_btn.pack(pady=20)
     
-    def meeting_menu(self):
-        self.clear_window()
+    def run_search(self, event=None):
+        query = self.global_search_entry.get()
+        results = self.service.read(self.service.find, query) if query.strip() else []
+        
+        self.search_display.delete(1.0, tk.END)
+        for score, section, text in results:
+            self.search_display.insert(tk.END, f"[{section}] {text}\n")
+        if query.strip() and not results:
+            self.search_display.insert(tk.END, "No matches.\n")
+    
+    def import_menu(self):
+        self.screens.show("import", self.build_import_screen)
+    
+    def build_import_screen(self, frame):
+        ttk.Label(frame, text="Bulk Import", style='Title.TLabel').pack(pady=10)
         
-        ttk.Label(self.root, text="Meeting Schedule & Agenda", style='Title.TLabel').pack(pady=10)
+        import_frame = ttk.LabelFrame(frame, text="Import CSV / JSON", padding=10)
+        import_frame.pack(pady=10, padx=20, fill='x')
+        
+        ttk.Label(import_frame, text="Section:").grid(row=0, column=0, padx=5, sticky='w')
+        self.import_section = ttk.Combobox(import_frame, state='readonly', width=25,
+                                           values=["(from 'section' column)"] + list(IMPORT_FIELDS))
+        self.import_section.current(0)
+        self.import_section.grid(row=0, column=1, padx=5)
+        ttk.Button(import_frame, text="Choose File...", command=self.run_import).grid(row=0, column=2, padx=5)
+        
+        columns = "\n".join(f"{name}: {', '.join(fields)}" for name, fields in IMPORT_FIELDS.items())
+        
+        # Display area
+        self.import_display = scrolledtext.ScrolledText(frame, height=18, width=80)
+        self.import_display.pack(pady=10)
+        self.import_display.insert(tk.END, f"Required columns per section:\n\n{columns}\n")
+        
+        ttk.Button(frame, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
+    
+    def run_import(self):
+        path = filedialog.askopenfilename(filetypes=[("Data files", "*.csv *.json *.jsonl"), ("All files", "*.*")])
+        if not path:
+            return
+        section = self.import_section.get() if self.import_section.current() > 0 else None
+        if self.inbox is None:
+            # Each change repaints widgets as it happens, so it stays on the Tk thread
+            self.show_import(path, self.import_rows(path, section))
+            return
+        # With the API running the writer applies the whole file as one batch;
+        # a worker thread waits for it so the window stays responsive
+        results = queue.Queue()
+        threading.Thread(target=lambda: results.put(self.import_rows(path, section)), name="import", daemon=True).start()
+        self.notify(f"Importing {os.path.basename(path)}...")
+        self.root.after(LOAD_POLL_MS, self.poll_import, path, results)
+    
+    def import_rows(self, path, section):
+        try:
+            return self.service.batch(import_file, path, self.service, section)
+        except (OSError, ValueError) as e:
+            return e
+    
+    def poll_import(self, path, results):
+        try:
+            outcome = results.get_nowait()
+        except queue.Empty:
+            self.root.after(LOAD_POLL_MS, self.poll_import, path, results)
+            return
+        self.install_versions()
+        self.show_import(path, outcome)
+    
+    def show_import(self, path, outcome):
+        if isinstance(outcome, Exception):
+            messagebox.showerror("Error", f"Import failed: {outcome}")
+            return
+        imported, errors = outcome
+        self.import_display.delete(1.0, tk.END)
+        self.import_display.insert(tk.END, f"Imported {imported} rows from {os.path.basename(path)}.\n")
+        self.import_display.insert(tk.END, f"Rejected {len(errors)} rows.\n\n")
+        self.import_display.insert(tk.END, "".join(f"Row {n}: {msg}\n" for n, msg in errors))
+    
+    def meeting_menu(self):
+        self.screens.show("meeting", self.build_meeting_screen)
+    
+    def build_meeting_screen(self, frame):
+        ttk.Label(frame, text="Meeting Schedule & Agenda", style='Title.TLabel').pack(pady=10)
         
         # Input frame
-        input_frame = ttk.Frame(self.root)
+        input_frame = ttk.Frame(frame)
         input_frame.pack(pady=10)
         
         ttk.Label(input_frame, text="Agenda Point:").grid(row=0, column=0, padx=5, sticky='w')
@@ -192,7 +4484,7 @@ class EventManagementGUI:
         ttk.Button(input_frame, text="Undo Last", command=self.undo_agenda).grid(row=0, column=3, padx=5)
         
         # Search frame
-        search_frame = ttk.Frame(self.root)
+        search_frame = ttk.Frame(frame)
         search_frame.pack(pady=5)
         
         ttk.Label(search_frame, text="Search:").grid(row=0, column=0, padx=5)
@@ -201,12 +4493,14 @@ class EventManagementGUI:
         ttk.Button(search_frame, text="Search", command=self.search_agenda).grid(row=0, column=2, padx=5)
         
         # Display area
-        self.agenda_display = scrolledtext.ScrolledText(self.root, height=15, width=80)
+        self.agenda_display = VirtualList(frame, self.service.changes, [
+            ("agenda", "Current Agenda:", lambda: len(self.view.agenda), seq_rows(lambda: self.view.agenda), lambda i, item: f"{i + 1}. {item}"),
+        ], height=15)
         self.agenda_display.pack(pady=10)
         
         self.update_agenda_display()
         
-        ttk.Button(self.root, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
+        ttk.Button(frame, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
     
     def add_agenda(self):
         point = self.agenda_entry.get().strip()
@@ -214,53 +4508,63 @@ class EventManagementGUI:
             messagebox.showerror("Error", "Agenda point cannot be empty.")
             return
         
-        agenda.append(point)
-        agenda_stack.push(point)
+        self.perform("agenda_add", point)
         self.agenda_entry.delete(0, tk.END)
-        self.update_agenda_display()
-        messagebox.showinfo("Success", f"Added: '{point}'. Total points: {len(agenda)}")
+        messagebox.showinfo("Success", f"Added: '{point}'. Total points: {len(self.view.agenda)}")
     
     def undo_agenda(self):
-        removed = agenda_stack.pop()
-        if removed is None:
+        undone = self.perform("agenda_undo")
+        if undone is None:
             messagebox.showerror("Error", "No agenda point to undo.")
         else:
-            if removed in agenda:
-                agenda.remove(removed)
-            self.update_agenda_display()
-            messagebox.showinfo("Success", f"Undo successful: '{removed}'. Remaining points: {len(agenda)}")
+            messagebox.showinfo("Success", f"Undid {undone}. Remaining points: {len(self.view.agenda)}")
     
     def search_agenda(self):
         point = self.search_entry.get().strip()
-        if point in agenda:
+        if point in self.view.agenda:
             messagebox.showinfo("Search Result", f"Found: '{point}'")
         else:
             messagebox.showinfo("Search Result", "Not Found")
     
     def update_agenda_display(self):
-        self.agenda_display.delete(1.0, tk.END)
-        self.agenda_display.insert(tk.END, "Current Agenda:\n\n")
-        for i, item in enumerate(agenda, 1):
-            self.agenda_display.insert(tk.END, f"{i}. {item}\n")
+        self.agenda_display.refresh()
     
     def permission_menu(self):
-        global dates_root
-        self.clear_window()
-        
-        ttk.Label(self.root, text="Principal Permission / Day Fixing", style='Title.TLabel').pack(pady=10)
+        self.screens.show("permission", self.build_permission_screen)
+    
+    def build_permission_screen(self, frame):
+        ttk.Label(frame, text="Principal Permission / Day Fixing", style='Title.TLabel').pack(pady=10)
         
         # Request frame
-        req_frame = ttk.LabelFrame(self.root, text="Approval Requests", padding=10)
+        req_frame = ttk.LabelFrame(frame, text="Approval Requests", padding=10)
         req_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(req_frame, text="Request:").grid(row=0, column=0, padx=5, sticky='w')
         self.request_entry = ttk.Entry(req_frame, width=40)
         self.request_entry.grid(row=0, column=1, padx=5)
-        ttk.Button(req_frame, text="Add Request", command=self.add_request).grid(row=0, column=2, padx=5)
-        ttk.Button(req_frame, text="Approve Next", command=self.approve_request).grid(row=0, column=3, padx=5)
+        self.request_priority = ttk.Combobox(req_frame, state='readonly', width=10, values=ApprovalScheduler.LEVELS)
+        self.request_priority.current(0)
+        self.request_priority.grid(row=0, column=2, padx=5)
+        ttk.Button(req_frame, text="Add Request", command=self.add_request).grid(row=0, column=3, padx=5)
+        ttk.Button(req_frame, text="Approve Next", command=self.approve_request).grid(row=0, column=4, padx=5)
+        
+        ttk.Label(req_frame, text="Due in (min, optional):").grid(row=1, column=0, padx=5, pady=5, sticky='w')
+        self.request_due_entry = ttk.Entry(req_frame, width=10)
+        self.request_due_entry.grid(row=1, column=1, padx=5, pady=5, sticky='w')
+        ttk.Label(req_frame, text="Policy:").grid(row=1, column=2, padx=5, pady=5, sticky='e')
+        self.request_policy = ttk.Combobox(req_frame, state='readonly', width=10, values=ApprovalScheduler.POLICIES)
+        self.request_policy.set(self.service.approval_queue.policy)
+        self.request_policy.grid(row=1, column=3, padx=5, pady=5)
+        self.request_policy.bind('<<ComboboxSelected>>', self.change_request_policy)
+        ttk.Button(req_frame, text="Approve N", command=self.approve_many_requests).grid(row=1, column=4, padx=5, pady=5)
+        
+        ttk.Label(req_frame, text="Request # / N:").grid(row=2, column=0, padx=5, sticky='w')
+        self.request_number_entry = ttk.Entry(req_frame, width=10)
+        self.request_number_entry.grid(row=2, column=1, padx=5, sticky='w')
+        ttk.Button(req_frame, text="Set Priority", command=self.reprioritize_request).grid(row=2, column=3, padx=5)
         
         # Date frame
-        date_frame = ttk.LabelFrame(self.root, text="Event Dates", padding=10)
+        date_frame = ttk.LabelFrame(frame, text="Event Dates", padding=10)
         date_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(date_frame, text="Date (DD-MM-YYYY):").grid(row=0, column=0, padx=5, sticky='w')
@@ -268,15 +4572,33 @@ class EventManagementGUI:
         self.date_entry.grid(row=0, column=1, padx=5)
         ttk.Button(date_frame, text="Insert Date", command=self.insert_date).grid(row=0, column=2, padx=5)
         ttk.Button(date_frame, text="Search Date", command=self.search_date).grid(row=0, column=3, padx=5)
-        ttk.Button(date_frame, text="View All Dates", command=self.view_dates).grid(row=0, column=4, padx=5)
+        ttk.Button(date_frame, text="Delete Date", command=self.delete_date).grid(row=0, column=4, padx=5)
+        ttk.Button(date_frame, text="View All Dates", command=self.view_dates).grid(row=0, column=5, padx=5)
+        
+        ttk.Label(date_frame, text="To (DD-MM-YYYY):").grid(row=1, column=0, padx=5, pady=5, sticky='w')
+        self.date_to_entry = ttk.Entry(date_frame, width=20)
+        self.date_to_entry.grid(row=1, column=1, padx=5, pady=5)
+        ttk.Button(date_frame, text="Booked in Range", command=self.booked_in_range).grid(row=1, column=2, padx=5, pady=5)
+        ttk.Button(date_frame, text="Free in Range", command=self.free_in_range).grid(row=1, column=3, padx=5, pady=5)
+        ttk.Button(date_frame, text="Next Booked", command=self.next_booked_date).grid(row=1, column=4, padx=5, pady=5)
+        ttk.Button(date_frame, text="Prev Booked", command=self.prev_booked_date).grid(row=1, column=5, padx=5, pady=5)
+        ttk.Button(date_frame, text="First Page", command=self.first_dates_page).grid(row=2, column=2, padx=5)
+        ttk.Button(date_frame, text="Next Page", command=self.next_dates_page).grid(row=2, column=3, padx=5)
+        self.dates_cursor = None
+        self.dates_page_no = 0
         
         # Display area
-        self.permission_display = scrolledtext.ScrolledText(self.root, height=12, width=80)
+        self.permission_display = VirtualList(frame, self.service.changes, [
+            ("requests", "Pending Requests:", lambda: len(self.view.approval_queue), seq_rows(lambda: self.view.approval_queue),
+             lambda i, req: f"{i + 1}. {req}"),
+            ("requests", "Expired Requests:", lambda: len(self.view.expired_requests), iter_rows(lambda: self.view.expired_requests),
+             lambda i, req: f"{req}"),
+        ])
         self.permission_display.pack(pady=10)
         
         self.update_permission_display()
         
-        ttk.Button(self.root, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
+        ttk.Button(frame, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
     
     def add_request(self):
         req = self.request_entry.get().strip()
@@ -284,57 +4606,197 @@ class EventManagementGUI:
             messagebox.showerror("Error", "Request cannot be empty.")
             return
         
-        approval_queue.enqueue(req)
+        due = self.request_due_entry.get().strip()
+        try:
+            deadline = time.time() + float(due) * 60 if due else None
+        except ValueError:
+            messagebox.showerror("Error", "Due time must be a number of minutes.")
+            return
+        
+        number = self.perform("request_add", req, self.request_priority.current(), deadline)
         self.request_entry.delete(0, tk.END)
-        self.update_permission_display()
-        messagebox.showinfo("Success", f"Request queued. Queue size: {len(approval_queue.q)}")
+        self.request_due_entry.delete(0, tk.END)
+        messagebox.showinfo("Success", f"Request #{number} queued. Queue size: {len(self.view.approval_queue)}")
     
     def approve_request(self):
-        approved = approval_queue.dequeue()
+        approved = self.perform("request_approve")
         if approved is None:
             messagebox.showerror("Error", "No requests pending.")
         else:
-            self.update_permission_display()
-            messagebox.showinfo("Success", f"Approved: {approved}. Remaining in queue: {len(approval_queue.q)}")
+            messagebox.showinfo("Success", f"Approved: {approved}. Remaining in queue: {len(self.view.approval_queue)}")
     
-    def insert_date(self):
-        global dates_root
-        date = self.date_entry.get().strip()
+    def read_request_number(self):
+        try:
+            return int(self.request_number_entry.get().strip())
+        except ValueError:
+            messagebox.showerror("Error", "Enter a request number.")
+            return None
+    
+    def approve_many_requests(self):
+        n = self.read_request_number()
+        if n is None:
+            return
+        approved = self.perform("request_approve_many", n)
+        if not approved:
+            messagebox.showerror("Error", "No requests pending.")
+        else:
+            messagebox.showinfo("Success", f"Approved {len(approved)} requests. Remaining in queue: {len(self.view.approval_queue)}")
+    
+    def reprioritize_request(self):
+        number = self.read_request_number()
+        if number is None:
+            return
+        if self.perform("request_reprioritize", number, self.request_priority.current()):
+            messagebox.showinfo("Success", f"Request #{number} is now {self.request_priority.get()}.")
+        else:
+            messagebox.showerror("Error", f"Request #{number} is not pending.")
+    
+    def change_request_policy(self, event=None):
+        self.perform("request_policy", self.request_policy.get())
+    
+    def read_date(self, entry):
+        date = entry.get().strip()
         if not date:
             messagebox.showerror("Error", "Date cannot be empty.")
+            return None
+        try:
+            return parse_date(date)
+        except ValueError:
+            messagebox.showerror("Error", "Date must be in DD-MM-YYYY format.")
+            return None
+    
+    def insert_date(self):
+        day = self.read_date(self.date_entry)
+        if day is None:
             return
         
-        dates_root = dates_bst.insert(dates_root, date)
-        self.date_entry.delete(0, tk.END)
-        messagebox.showinfo("Success", f"Date inserted: {date}")
+        if self.perform("date_insert", day.isoformat()):
+            self.date_entry.delete(0, tk.END)
+            messagebox.showinfo("Success", f"Date inserted: {format_date(day)}")
+        else:
+            messagebox.showinfo("Info", f"Date {format_date(day)} is already fixed.")
+    
+    def read_dates(self, query):
+        # The date index is not part of the frozen views, so queries on it run
+        # through service.read, where they cannot race the API writer
+        return self.service.read(lambda: query(self.service.dates_index))
     
     def search_date(self):
-        date = self.date_entry.get().strip()
-        found = dates_bst.search(dates_root, date)
+        day = self.read_date(self.date_entry)
+        if day is None:
+            return
+        found = self.read_dates(lambda dates: dates.search(day))
         result = "Available" if found else "Not Available"
         messagebox.showinfo("Search Result", result)
     
+    def delete_date(self):
+        day = self.read_date(self.date_entry)
+        if day is None:
+            return
+        
+        if self.perform("date_delete", day.isoformat()):
+            self.date_entry.delete(0, tk.END)
+            messagebox.showinfo("Success", f"Date removed: {format_date(day)}")
+        else:
+            messagebox.showerror("Error", f"Date {format_date(day)} not found.")
+    
     def view_dates(self):
-        res = []
-        dates_bst.inorder(dates_root, res)
+        res = [format_date(day) for day in self.read_dates(lambda dates: dates.inorder())]
         if res:
             messagebox.showinfo("All Dates", "\n".join(res))
         else:
             messagebox.showinfo("All Dates", "No dates added yet.")
     
+    def read_date_range(self):
+        low = self.read_date(self.date_entry)
+        if low is None:
+            return None
+        high = self.read_date(self.date_to_entry)
+        if high is None:
+            return None
+        if high < low:
+            messagebox.showerror("Error", "Range end must not be before its start.")
+            return None
+        return low, high
+    
+    def booked_in_range(self):
+        bounds = self.read_date_range()
+        if bounds is None:
+            return
+        
+        res = [format_date(day) for day in self.read_dates(lambda dates: list(dates.scan(*bounds)))]
+        title = f"Booked {format_date(bounds[0])} to {format_date(bounds[1])}"
+        messagebox.showinfo(title, "\n".join(res) if res else "No booked dates in this range.")
+    
+    def free_in_range(self):
+        bounds = self.read_date_range()
+        if bounds is None:
+            return
+        
+        # Merge the calendar walk with the booked scan instead of probing every day
+        low, high = bounds
+        res = []
+        day = low
+        for booked in self.read_dates(lambda dates: list(dates.scan(low, high))):
+            while day < booked:
+                res.append(format_date(day))
+                day += timedelta(days=1)
+            day = booked + timedelta(days=1)
+        while day <= high:
+            res.append(format_date(day))
+            day += timedelta(days=1)
+        title = f"Free {format_date(low)} to {format_date(high)}"
+        messagebox.showinfo(title, "\n".join(res) if res else "No free dates in this range.")
+    
+    def next_booked_date(self):
+        day = self.read_date(self.date_entry)
+        if day is None:
+            return
+        nxt = self.read_dates(lambda dates: dates.successor(day))
+        if nxt is None:
+            messagebox.showinfo("Next Booked", f"No booked date after {format_date(day)}.")
+        else:
+            messagebox.showinfo("Next Booked", f"Next booked date after {format_date(day)}: {format_date(nxt)}")
+    
+    def prev_booked_date(self):
+        day = self.read_date(self.date_entry)
+        if day is None:
+            return
+        prev = self.read_dates(lambda dates: dates.predecessor(day))
+        if prev is None:
+            messagebox.showinfo("Previous Booked", f"No booked date before {format_date(day)}.")
+        else:
+            messagebox.showinfo("Previous Booked", f"Last booked date before {format_date(day)}: {format_date(prev)}")
+    
+    def first_dates_page(self):
+        self.dates_cursor = None
+        self.dates_page_no = 0
+        self.next_dates_page()
+    
+    def next_dates_page(self):
+        if self.dates_page_no and self.dates_cursor is None:
+            messagebox.showinfo("Dates", "No more dates. Use First Page to start over.")
+            return
+        
+        cursor = self.dates_cursor
+        keys, self.dates_cursor = self.read_dates(lambda dates: dates.page(cursor, DATES_PAGE_SIZE))
+        self.dates_page_no += 1
+        if keys:
+            messagebox.showinfo(f"Dates - Page {self.dates_page_no}", "\n".join(format_date(day) for day in keys))
+        else:
+            messagebox.showinfo("Dates", "No dates added yet.")
+    
     def update_permission_display(self):
-        self.permission_display.delete(1.0, tk.END)
-        self.permission_display.insert(tk.END, "Pending Requests:\n\n")
-        for i, req in enumerate(approval_queue.display(), 1):
-            self.permission_display.insert(tk.END, f"{i}. {req}\n")
+        self.permission_display.refresh()
     
     def notices_menu(self):
-        self.clear_window()
-        
-        ttk.Label(self.root, text="Notices & Announcements", style='Title.TLabel').pack(pady=10)
+        self.screens.show("notices", self.build_notices_screen)
+    
+    def build_notices_screen(self, frame):
+        ttk.Label(frame, text="Notices & Announcements", style='Title.TLabel').pack(pady=10)
         
         # Announcement frame
-        ann_frame = ttk.LabelFrame(self.root, text="Announcements", padding=10)
+        ann_frame = ttk.LabelFrame(frame, text="Announcements", padding=10)
         ann_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(ann_frame, text="Message:").grid(row=0, column=0, padx=5, sticky='w')
@@ -344,7 +4806,7 @@ class EventManagementGUI:
         ttk.Button(ann_frame, text="Remove", command=self.remove_announcement).grid(row=0, column=3, padx=5)
         
         # Responsibility frame
-        resp_frame = ttk.LabelFrame(self.root, text="Responsibilities", padding=10)
+        resp_frame = ttk.LabelFrame(frame, text="Responsibilities", padding=10)
         resp_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(resp_frame, text="Member:").grid(row=0, column=0, padx=5, sticky='w')
@@ -356,12 +4818,17 @@ class EventManagementGUI:
         ttk.Button(resp_frame, text="Assign", command=self.assign_responsibility).grid(row=0, column=4, padx=5)
         
         # Display area
-        self.notices_display = scrolledtext.ScrolledText(self.root, height=12, width=80)
+        self.notices_display = VirtualList(frame, self.service.changes, [
+            ("announcements", lambda: f"Announcements ({len(self.view.announcements)}):", lambda: len(self.view.announcements),
+             seq_rows(lambda: self.view.announcements), lambda i, ann: f"{i + 1}. {ann}"),
+            ("responsibilities", "Responsibilities:", lambda: len(self.view.responsibility_map), iter_rows(lambda: self.view.responsibility_map.items()),
+             lambda i, entry: f"• {entry[0]}: {entry[1]}"),
+        ])
         self.notices_display.pack(pady=10)
         
         self.update_notices_display()
         
-        ttk.Button(self.root, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
+        ttk.Button(frame, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
     
     def add_announcement(self):
         msg = self.announcement_entry.get().strip()
@@ -369,18 +4836,14 @@ class EventManagementGUI:
             messagebox.showerror("Error", "Announcement cannot be empty.")
             return
         
-        announcements.add(msg)
+        self.perform("announcement_add", msg)
         self.announcement_entry.delete(0, tk.END)
-        self.update_notices_display()
         messagebox.showinfo("Success", f"Announcement added: '{msg}'")
     
     def remove_announcement(self):
         msg = self.announcement_entry.get().strip()
-        current = announcements.display()
-        if msg in current:
-            announcements.remove(msg)
+        if self.perform("announcement_remove", msg):
             self.announcement_entry.delete(0, tk.END)
-            self.update_notices_display()
             messagebox.showinfo("Success", f"Announcement removed: '{msg}'")
         else:
             messagebox.showerror("Error", "Announcement not found.")
@@ -392,40 +4855,39 @@ class EventManagementGUI:
             messagebox.showerror("Error", "Name and responsibility are required.")
             return
         
-        responsibility_map[name] = task
+        self.perform("responsibility_assign", name, task)
         self.member_entry.delete(0, tk.END)
         self.task_entry.delete(0, tk.END)
-        self.update_notices_display()
         messagebox.showinfo("Success", f"Assigned: {name} -> {task}")
     
     def update_notices_display(self):
-        self.notices_display.delete(1.0, tk.END)
-        
-        self.notices_display.insert(tk.END, "Announcements:\n")
-        for i, ann in enumerate(announcements.display(), 1):
-            self.notices_display.insert(tk.END, f"{i}. {ann}\n")
-        
-        self.notices_display.insert(tk.END, "\nResponsibilities:\n")
-        for name, task in responsibility_map.items():
-            self.notices_display.insert(tk.END, f"• {name}: {task}\n")
+        self.notices_display.refresh()
     
     def logistics_menu(self):
-        self.clear_window()
-        
-        ttk.Label(self.root, text="Needs for Execution", style='Title.TLabel').pack(pady=10)
+        self.screens.show("logistics", self.build_logistics_screen)
+    
+    def build_logistics_screen(self, frame):
+        ttk.Label(frame, text="Needs for Execution", style='Title.TLabel').pack(pady=10)
         
         # Item frame
-        item_frame = ttk.LabelFrame(self.root, text="Logistics Items", padding=10)
+        item_frame = ttk.LabelFrame(frame, text="Logistics Items", padding=10)
         item_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(item_frame, text="Item:").grid(row=0, column=0, padx=5, sticky='w')
         self.item_entry = ttk.Entry(item_frame, width=30)
         self.item_entry.grid(row=0, column=1, padx=5)
-        ttk.Button(item_frame, text="Add Item", command=self.add_item).grid(row=0, column=2, padx=5)
-        ttk.Button(item_frame, text="Undo Last", command=self.undo_item).grid(row=0, column=3, padx=5)
+        ttk.Label(item_frame, text="Qty:").grid(row=0, column=2, padx=5, sticky='w')
+        self.item_qty_entry = ttk.Entry(item_frame, width=6)
+        self.item_qty_entry.grid(row=0, column=3, padx=5)
+        ttk.Button(item_frame, text="Add Item", command=self.add_item).grid(row=0, column=4, padx=5)
+        ttk.Button(item_frame, text="Undo Last", command=self.undo_item).grid(row=0, column=5, padx=5)
+        self.item_status = ttk.Combobox(item_frame, state='readonly', width=10, values=LogisticsBook.STATUSES)
+        self.item_status.current(0)
+        self.item_status.grid(row=1, column=1, padx=5, pady=5, sticky='w')
+        ttk.Button(item_frame, text="Set Status", command=self.set_item_status).grid(row=1, column=4, padx=5, pady=5)
         
         # Vendor frame
-        vendor_frame = ttk.LabelFrame(self.root, text="Vendor Mapping", padding=10)
+        vendor_frame = ttk.LabelFrame(frame, text="Vendor Mapping", padding=10)
         vendor_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(vendor_frame, text="Item:").grid(row=0, column=0, padx=5, sticky='w')
@@ -437,12 +4899,19 @@ class EventManagementGUI:
         ttk.Button(vendor_frame, text="Map", command=self.map_vendor).grid(row=0, column=4, padx=5)
         
         # Display area
-        self.logistics_display = scrolledtext.ScrolledText(self.root, height=12, width=80)
+        self.logistics_display = VirtualList(frame, self.service.changes, [
+            ("logistics", "Logistics Items:", lambda: len(self.view.logistics), iter_rows(lambda: self.view.logistics),
+             self.format_item),
+            ("logistics", "Unsourced:", lambda: len(self.view.logistics.unsourced), iter_rows(lambda: self.view.logistics.unsourced),
+             lambda i, item: f"• {item}"),
+            ("vendors", "Vendors:", lambda: len(self.view.logistics.rollups), iter_rows(lambda: self.view.logistics.rollups.items()),
+             lambda i, entry: f"• {entry[0]}: {entry[1][0]} items, {entry[1][1]} units, {entry[1][2]} delivered"),
+        ])
         self.logistics_display.pack(pady=10)
         
         self.update_logistics_display()
         
-        ttk.Button(self.root, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
+        ttk.Button(frame, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
     
     def add_item(self):
         item = self.item_entry.get().strip()
@@ -450,21 +4919,37 @@ class EventManagementGUI:
             messagebox.showerror("Error", "Item cannot be empty.")
             return
         
-        logistics.append(item)
-        logistics_stack.push(item)
+        quantity = self.item_qty_entry.get().strip() or "1"
+        if not quantity.isdigit() or int(quantity) < 1:
+            messagebox.showerror("Error", "Quantity must be a positive whole number.")
+            return
+        
+        self.perform("item_add", item, int(quantity))
         self.item_entry.delete(0, tk.END)
-        self.update_logistics_display()
-        messagebox.showinfo("Success", f"Item added: '{item}'. Total items: {len(logistics)}")
+        self.item_qty_entry.delete(0, tk.END)
+        messagebox.showinfo("Success", f"Item added: '{item}' x{quantity}. Total items: {len(self.view.logistics)}")
     
     def undo_item(self):
-        removed = logistics_stack.pop()
-        if removed is None:
+        undone = self.perform("item_undo")
+        if undone is None:
             messagebox.showerror("Error", "No item to undo.")
         else:
-            if removed in logistics:
-                logistics.remove(removed)
-            self.update_logistics_display()
-            messagebox.showinfo("Success", f"Removed: '{removed}'. Remaining items: {len(logistics)}")
+            messagebox.showinfo("Success", f"Undid {undone}. Items listed: {len(self.view.logistics)}")
+    
+    def set_item_status(self):
+        item = self.item_entry.get().strip()
+        if not item:
+            messagebox.showerror("Error", "Item cannot be empty.")
+            return
+        if self.perform("item_status", item, self.item_status.get()):
+            messagebox.showinfo("Success", f"'{item}' is now {self.item_status.get()}.")
+        else:
+            messagebox.showerror("Error", f"'{item}' is not on the list.")
+    
+    def format_item(self, i, item):
+        name, quantity, status = item
+        vendor = self.view.logistics.vendor_map.get(name)
+        return f"{i + 1}. {name} x{quantity} [{status}]" + (f" <- {vendor}" if vendor else "")
     
     def map_vendor(self):
         item = self.vendor_item_entry.get().strip()
@@ -473,30 +4958,22 @@ class EventManagementGUI:
             messagebox.showerror("Error", "Item and vendor are required.")
             return
         
-        vendor_map[item] = vendor
+        self.perform("vendor_map", item, vendor)
         self.vendor_item_entry.delete(0, tk.END)
         self.vendor_entry.delete(0, tk.END)
-        self.update_logistics_display()
         messagebox.showinfo("Success", f"Mapped: {item} -> {vendor}")
     
     def update_logistics_display(self):
-        self.logistics_display.delete(1.0, tk.END)
-        
-        self.logistics_display.insert(tk.END, "Logistics Items:\n")
-        for i, item in enumerate(logistics, 1):
-            self.logistics_display.insert(tk.END, f"{i}. {item}\n")
-        
-        self.logistics_display.insert(tk.END, "\nVendor Mappings:\n")
-        for item, vendor in vendor_map.items():
-            self.logistics_display.insert(tk.END, f"• {item} -> {vendor}\n")
+        self.logistics_display.refresh()
     
     def rehearsal_menu(self):
-        self.clear_window()
-        
-        ttk.Label(self.root, text="Rehearsal", style='Title.TLabel').pack(pady=10)
+        self.screens.show("rehearsal", self.build_rehearsal_screen)
+    
+    def build_rehearsal_screen(self, frame):
+        ttk.Label(frame, text="Rehearsal", style='Title.TLabel').pack(pady=10)
         
         # Performance frame
-        perf_frame = ttk.LabelFrame(self.root, text="Performances", padding=10)
+        perf_frame = ttk.LabelFrame(frame, text="Performances", padding=10)
         perf_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(perf_frame, text="Performance:").grid(row=0, column=0, padx=5, sticky='w')
@@ -507,9 +4984,28 @@ class EventManagementGUI:
         self.participant_entry.grid(row=0, column=3, padx=5)
         ttk.Button(perf_frame, text="Add", command=self.add_performance).grid(row=0, column=4, padx=5)
         ttk.Button(perf_frame, text="Next", command=self.next_performance).grid(row=0, column=5, padx=5)
+        ttk.Label(perf_frame, text="Minutes (optional):").grid(row=1, column=0, padx=5, pady=5, sticky='w')
+        self.rehearsal_minutes_entry = ttk.Entry(perf_frame, width=10)
+        self.rehearsal_minutes_entry.grid(row=1, column=1, padx=5, pady=5, sticky='w')
+        
+        # Rehearsal rooms frame
+        room_frame = ttk.LabelFrame(frame, text="Rehearsal Rooms", padding=10)
+        room_frame.pack(pady=10, padx=20, fill='x')
+        
+        ttk.Label(room_frame, text="Room:").grid(row=0, column=0, padx=5, sticky='w')
+        self.room_entry = ttk.Entry(room_frame, width=20)
+        self.room_entry.grid(row=0, column=1, padx=5)
+        ttk.Button(room_frame, text="Add Room", command=self.add_room).grid(row=0, column=2, padx=5)
+        ttk.Button(room_frame, text="Remove Room", command=self.remove_room).grid(row=0, column=3, padx=5)
+        ttk.Button(room_frame, text="Room Done", command=self.room_done).grid(row=0, column=4, padx=5)
+        self.rehearsal_policy = ttk.Combobox(room_frame, state='readonly', width=15, values=RehearsalDispatcher.POLICIES)
+        self.rehearsal_policy.set(self.service.rehearsal_rooms.policy)
+        self.rehearsal_policy.grid(row=0, column=5, padx=5)
+        self.rehearsal_policy.bind('<<ComboboxSelected>>', self.change_rehearsal_policy)
+        ttk.Button(room_frame, text="Dispatch", command=self.dispatch_rehearsals).grid(row=0, column=6, padx=5)
         
         # Event flow frame
-        flow_frame = ttk.LabelFrame(self.root, text="Event Flow", padding=10)
+        flow_frame = ttk.LabelFrame(frame, text="Event Flow", padding=10)
         flow_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(flow_frame, text="Flow No:").grid(row=0, column=0, padx=5, sticky='w')
@@ -521,13 +5017,29 @@ class EventManagementGUI:
         ttk.Button(flow_frame, text="Add Step", command=self.add_event_step).grid(row=0, column=4, padx=5)
         ttk.Button(flow_frame, text="Search Step", command=self.search_event_step).grid(row=0, column=5, padx=5)
         
+        ttk.Label(flow_frame, text="Start / End (HH:MM):").grid(row=1, column=0, padx=5, pady=5, sticky='w')
+        self.flow_start_entry = ttk.Entry(flow_frame, width=10)
+        self.flow_start_entry.grid(row=1, column=1, padx=5, pady=5)
+        self.flow_end_entry = ttk.Entry(flow_frame, width=10)
+        self.flow_end_entry.grid(row=1, column=2, padx=5, pady=5, sticky='w')
+        ttk.Label(flow_frame, text="Stage:").grid(row=1, column=3, padx=5, pady=5, sticky='w')
+        self.flow_stage_entry = ttk.Entry(flow_frame, width=25)
+        self.flow_stage_entry.grid(row=1, column=3, padx=(50, 5), pady=5, sticky='e')
+        
         # Display area
-        self.rehearsal_display = scrolledtext.ScrolledText(self.root, height=12, width=80)
+        self.rehearsal_display = VirtualList(frame, self.service.changes, [
+            ("rehearsals", "Performance Queue:", lambda: len(self.view.rehearsal_queue), iter_rows(lambda: self.view.rehearsal_queue),
+             lambda i, perf: f"{i + 1}. {perf} by {self.view.performance_map.get(perf, 'Unknown')}"),
+            ("rehearsals", "Rooms:", lambda: len(self.view.rehearsal_rooms), iter_rows(lambda: self.view.rehearsal_rooms),
+             self.format_room),
+            ("flow", "Event Flow (sorted):", lambda: len(self.view.timetable), seq_rows(lambda: self.view.timetable),
+             lambda i, entry: f"{entry}"),
+        ])
         self.rehearsal_display.pack(pady=10)
         
         self.update_rehearsal_display()
         
-        ttk.Button(self.root, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
+        ttk.Button(frame, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
     
     def add_performance(self):
         perf = self.performance_entry.get().strip()
@@ -536,67 +5048,138 @@ class EventManagementGUI:
             messagebox.showerror("Error", "Both performance and participant are required.")
             return
         
-        rehearsal_queue.enqueue(perf)
-        performance_map[perf] = part
+        minutes = self.rehearsal_minutes_entry.get().strip()
+        if minutes and (not minutes.isdigit() or int(minutes) <= 0):
+            messagebox.showerror("Error", "Minutes must be a positive whole number.")
+            return
+        
+        clashes = self.perform("rehearsal_add", perf, part, *([int(minutes)] if minutes else []))
+        if clashes:
+            messagebox.showerror("Conflict", f"'{part}' cannot take over '{perf}':\n\n" + "\n".join(clashes))
+            return
         self.performance_entry.delete(0, tk.END)
         self.participant_entry.delete(0, tk.END)
-        self.update_rehearsal_display()
-        messagebox.showinfo("Success", f"Queued '{perf}' by '{part}'. Queue size: {len(rehearsal_queue.q)}")
+        self.rehearsal_minutes_entry.delete(0, tk.END)
+        messagebox.showinfo("Success", f"Queued '{perf}' by '{part}'. Queue size: {len(self.view.rehearsal_queue)}")
     
     def next_performance(self):
-        nxt = rehearsal_queue.dequeue()
+        nxt = self.perform("rehearsal_next")
         if nxt is None:
             messagebox.showerror("Error", "No performances in queue.")
         else:
-            performer = performance_map.get(nxt, "Unknown")
-            self.update_rehearsal_display()
-            messagebox.showinfo("Next Performance", f"Next: {nxt} by {performer}. Remaining in queue: {len(rehearsal_queue.q)}")
+            performer = self.view.performance_map.get(nxt, "Unknown")
+            messagebox.showinfo("Next Performance", f"Next: {nxt} by {performer}. Remaining in queue: {len(self.view.rehearsal_queue)}")
+    
+    def format_room(self, i, room):
+        name, acts, minutes = room
+        if not acts:
+            return f"{name}: free"
+        line = f"{name}: now {acts[0]}"
+        if len(acts) > 1:
+            line += f"; next {', '.join(acts[1:4])}" + (f" +{len(acts) - 4} more" if len(acts) > 4 else "")
+        return line + f" ({minutes} min booked)"
+    
+    def read_room(self):
+        room = self.room_entry.get().strip()
+        if not room:
+            messagebox.showerror("Error", "Room cannot be empty.")
+        return room
+    
+    def add_room(self):
+        room = self.read_room()
+        if not room:
+            return
+        if self.perform("rehearsal_room_add", room):
+            self.room_entry.delete(0, tk.END)
+        else:
+            messagebox.showerror("Error", f"Room '{room}' already exists.")
+    
+    def remove_room(self):
+        room = self.read_room()
+        if not room:
+            return
+        if self.perform("rehearsal_room_remove", room):
+            self.room_entry.delete(0, tk.END)
+            messagebox.showinfo("Success", f"Room '{room}' removed. Its acts are back at the front of the queue.")
+        else:
+            messagebox.showerror("Error", f"No room named '{room}'.")
+    
+    def room_done(self):
+        room = self.read_room()
+        if not room:
+            return
+        done = self.perform("rehearsal_done", room)
+        if done is None:
+            messagebox.showerror("Error", f"Room '{room}' is free.")
+    
+    def change_rehearsal_policy(self, event=None):
+        self.perform("rehearsal_policy", self.rehearsal_policy.get())
+    
+    def dispatch_rehearsals(self):
+        try:
+            assigned = self.perform("rehearsal_dispatch")
+        except ValueError as e:
+            messagebox.showerror("Error", f"{str(e).capitalize()}.")
+            return
+        if not assigned:
+            messagebox.showinfo("Dispatch", "No performances waiting.")
+        else:
+            messagebox.showinfo("Dispatch", "\n".join(f"{perf} -> {room}" if room else f"{perf} still waiting: its performers are in different rooms"
+                                                      for perf, room in assigned))
     
     def add_event_step(self):
         try:
             key = int(self.step_entry.get().strip())
-            perf = self.flow_perf_entry.get().strip()
-            if not perf:
-                messagebox.showerror("Error", "Performance cannot be empty.")
-                return
-            
-            event_flow_map[key] = perf
-            self.step_entry.delete(0, tk.END)
-            self.flow_perf_entry.delete(0, tk.END)
-            self.update_rehearsal_display()
-            messagebox.showinfo("Success", f"Event step {key} -> '{perf}' added.")
         except ValueError:
             messagebox.showerror("Error", "Step must be a number.")
+            return
+        perf = self.flow_perf_entry.get().strip()
+        if not perf:
+            messagebox.showerror("Error", "Performance cannot be empty.")
+            return
+        
+        start, end = self.flow_start_entry.get().strip(), self.flow_end_entry.get().strip()
+        slot = ()
+        if start or end:
+            try:
+                slot = (parse_clock(start), parse_clock(end))
+            except ValueError:
+                messagebox.showerror("Error", "Start and end must both be in HH:MM format.")
+                return
+            if slot[1] <= slot[0]:
+                messagebox.showerror("Error", "End must be after start.")
+                return
+            slot += (self.flow_stage_entry.get().strip() or None,)
+        
+        clashes = self.perform("flow_step", key, perf, *slot)
+        if clashes:
+            messagebox.showerror("Conflict", f"Step {key} was not scheduled:\n\n" + "\n".join(clashes))
+            return
+        for entry in (self.step_entry, self.flow_perf_entry, self.flow_start_entry, self.flow_end_entry, self.flow_stage_entry):
+            entry.delete(0, tk.END)
+        messagebox.showinfo("Success", f"Event step {key} -> '{perf}' added.")
     
     def search_event_step(self):
         try:
             key = int(self.step_entry.get().strip())
-            if key in event_flow_map:
-                messagebox.showinfo("Search Result", f"Step {key} is assigned to '{event_flow_map[key]}'")
+            if key in self.view.event_flow_map:
+                messagebox.showinfo("Search Result", f"Step {key} is assigned to '{self.view.event_flow_map[key]}'")
             else:
                 messagebox.showinfo("Search Result", f"Step {key} is empty / not assigned yet.")
         except ValueError:
             messagebox.showerror("Error", "Step must be a number.")
     
     def update_rehearsal_display(self):
-        self.rehearsal_display.delete(1.0, tk.END)
-        
-        self.rehearsal_display.insert(tk.END, "Performance Queue:\n")
-        for i, perf in enumerate(rehearsal_queue.display(), 1):
-            participant = performance_map.get(perf, "Unknown")
-            self.rehearsal_display.insert(tk.END, f"{i}. {perf} by {participant}\n")
-        
-        self.rehearsal_display.insert(tk.END, "\nEvent Flow (sorted):\n")
-        for k in sorted(event_flow_map.keys()):
-            self.rehearsal_display.insert(tk.END, f"Step {k}: {event_flow_map[k]}\n")
+        self.rehearsal_display.refresh()
     
     def execution_menu(self):
-        self.clear_window()
-        
-        ttk.Label(self.root, text="Execution Day", style='Title.TLabel').pack(pady=10)
+        self.screens.show("execution", self.build_execution_screen)
+    
+    def build_execution_screen(self, frame):
+        ttk.Label(frame, text="Execution Day", style='Title.TLabel').pack(pady=10)
         
         # Performance management frame
-        perf_mgmt_frame = ttk.LabelFrame(self.root, text="Performance Management", padding=10)
+        perf_mgmt_frame = ttk.LabelFrame(frame, text="Performance Management", padding=10)
         perf_mgmt_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(perf_mgmt_frame, text="Performance:").grid(row=0, column=0, padx=5, sticky='w')
@@ -605,9 +5188,27 @@ class EventManagementGUI:
         ttk.Button(perf_mgmt_frame, text="Add", command=self.add_exec_performance).grid(row=0, column=2, padx=5)
         ttk.Button(perf_mgmt_frame, text="Next", command=self.next_exec_performance).grid(row=0, column=3, padx=5)
         ttk.Button(perf_mgmt_frame, text="Delete", command=self.delete_performance).grid(row=0, column=4, padx=5)
+        ttk.Label(perf_mgmt_frame, text="Minutes:").grid(row=1, column=0, padx=5, pady=5, sticky='w')
+        self.exec_minutes_entry = ttk.Entry(perf_mgmt_frame, width=8)
+        self.exec_minutes_entry.grid(row=1, column=1, padx=5, pady=5, sticky='w')
+        ttk.Button(perf_mgmt_frame, text="Set Minutes", command=self.set_exec_minutes).grid(row=1, column=2, padx=5, pady=5)
+        
+        # Live show frame: timer-driven progress through the schedule
+        show_frame = ttk.LabelFrame(frame, text="Live Show", padding=10)
+        show_frame.pack(pady=10, padx=20, fill='x')
+        
+        ttk.Button(show_frame, text="Start Show", command=self.start_show).grid(row=0, column=0, padx=5)
+        ttk.Button(show_frame, text="Stop Show", command=self.stop_show).grid(row=0, column=1, padx=5)
+        self.show_auto_var = tk.BooleanVar(value=self.view.live_show.auto)
+        ttk.Checkbutton(show_frame, text="Auto-advance", variable=self.show_auto_var,
+                        command=lambda: self.perform("show_auto", self.show_auto_var.get())).grid(row=0, column=2, padx=5)
+        self.show_labels = tuple(ttk.Label(show_frame) for _ in range(3))
+        for row, label in enumerate(self.show_labels, 1):
+            label.grid(row=row, column=0, columnspan=4, padx=5, sticky='w')
+        self.update_show_labels(time.time())
         
         # Last minute fixes frame
-        fix_frame = ttk.LabelFrame(self.root, text="Last-Minute Fixes", padding=10)
+        fix_frame = ttk.LabelFrame(frame, text="Last-Minute Fixes", padding=10)
         fix_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(fix_frame, text="New Performance:").grid(row=0, column=0, padx=5, sticky='w')
@@ -617,9 +5218,10 @@ class EventManagementGUI:
         self.after_perf_entry = ttk.Entry(fix_frame, width=20)
         self.after_perf_entry.grid(row=0, column=3, padx=5)
         ttk.Button(fix_frame, text="Insert", command=self.insert_performance).grid(row=0, column=4, padx=5)
+        ttk.Button(fix_frame, text="Move", command=self.move_performance).grid(row=0, column=5, padx=5)
         
         # Volunteer frame
-        vol_frame = ttk.LabelFrame(self.root, text="Volunteers", padding=10)
+        vol_frame = ttk.LabelFrame(frame, text="Volunteers", padding=10)
         vol_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(vol_frame, text="Name:").grid(row=0, column=0, padx=5, sticky='w')
@@ -629,138 +5231,381 @@ class EventManagementGUI:
         self.vol_duty_entry = ttk.Entry(vol_frame, width=20)
         self.vol_duty_entry.grid(row=0, column=3, padx=5)
         ttk.Button(vol_frame, text="Assign", command=self.assign_volunteer).grid(row=0, column=4, padx=5)
+        ttk.Button(vol_frame, text="Allocate Shifts", command=self.allocate_shifts).grid(row=0, column=5, padx=5)
+        
+        ttk.Label(vol_frame, text="From / To (HH:MM):").grid(row=1, column=0, padx=5, pady=5, sticky='w')
+        self.vol_start_entry = ttk.Entry(vol_frame, width=8)
+        self.vol_start_entry.grid(row=1, column=1, padx=5, pady=5, sticky='w')
+        self.vol_end_entry = ttk.Entry(vol_frame, width=8)
+        self.vol_end_entry.grid(row=1, column=1, padx=5, pady=5, sticky='e')
+        ttk.Label(vol_frame, text="Capacity:").grid(row=1, column=2, padx=5, pady=5, sticky='w')
+        self.shift_capacity_entry = ttk.Entry(vol_frame, width=8)
+        self.shift_capacity_entry.grid(row=1, column=3, padx=5, pady=5, sticky='w')
+        ttk.Button(vol_frame, text="Set Availability", command=self.set_availability).grid(row=1, column=4, padx=5, pady=5)
+        ttk.Button(vol_frame, text="Add Shift", command=self.add_shift).grid(row=1, column=5, padx=5, pady=5)
         
         # Feedback frame
-        feedback_frame = ttk.LabelFrame(self.root, text="Audience Feedback", padding=10)
+        feedback_frame = ttk.LabelFrame(frame, text="Audience Feedback", padding=10)
         feedback_frame.pack(pady=10, padx=20, fill='x')
         
         ttk.Label(feedback_frame, text="Rating (1-5):").grid(row=0, column=0, padx=5, sticky='w')
         self.rating_entry = ttk.Entry(feedback_frame, width=10)
         self.rating_entry.grid(row=0, column=1, padx=5)
-        ttk.Button(feedback_frame, text="Add Feedback", command=self.add_feedback).grid(row=0, column=2, padx=5)
-        ttk.Button(feedback_frame, text="View Feedback", command=self.view_feedback).grid(row=0, column=3, padx=5)
+        ttk.Label(feedback_frame, text="Performance (optional):").grid(row=0, column=2, padx=5, sticky='w')
+        self.rating_perf_entry = ttk.Entry(feedback_frame, width=20)
+        self.rating_perf_entry.grid(row=0, column=3, padx=5)
+        ttk.Button(feedback_frame, text="Add Feedback", command=self.add_feedback).grid(row=0, column=4, padx=5)
+        ttk.Button(feedback_frame, text="View Feedback", command=self.view_feedback).grid(row=0, column=5, padx=5)
         
         # Display area
-        self.execution_display = scrolledtext.ScrolledText(self.root, height=8, width=80)
+        self.execution_display = VirtualList(frame, self.service.changes, [
+            ("execution", "Performance Schedule:", lambda: len(self.view.execution_queue), seq_rows(lambda: self.view.execution_queue),
+             lambda i, perf: f"{i + 1}. {perf} ({self.view.exec_minutes.get(perf, LiveShow.DEFAULT_MINUTES)} min)"),
+            ("volunteers", "Volunteers:", lambda: len(self.view.volunteer_map), iter_rows(lambda: self.view.volunteer_map.items()),
+             self.format_volunteer),
+            ("volunteers", "Duties:", lambda: len(self.view.duty_index), iter_rows(lambda: self.view.duty_index.items()),
+             lambda i, entry: f"• {entry[0] or '(any duty)'}: {len(entry[1])} volunteers"),
+            ("volunteers", "Shifts:", lambda: len(self.view.roster), seq_rows(lambda: self.view.roster),
+             self.format_shift),
+        ], height=8)
         self.execution_display.pack(pady=10)
         
         self.update_execution_display()
         
-        ttk.Button(self.root, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
+        ttk.Button(frame, text="Back to Main Menu", command=self.create_main_menu).pack(pady=10)
+    
+    def read_exec_minutes(self):
+        # Optional field; returns (ok, minutes or None)
+        minutes = self.exec_minutes_entry.get().strip()
+        if not minutes:
+            return True, None
+        if not minutes.isdigit() or int(minutes) <= 0:
+            self.notify("Minutes must be a positive whole number.", error=True)
+            return False, None
+        return True, int(minutes)
     
     def add_exec_performance(self):
         perf = self.exec_perf_entry.get().strip()
         if not perf:
-            messagebox.showerror("Error", "Performance cannot be empty.")
+            self.notify("Performance cannot be empty.", error=True)
+            return
+        
+        if perf in self.view.execution_queue:
+            self.notify(f"'{perf}' is already scheduled.", error=True)
             return
+        ok, minutes = self.read_exec_minutes()
+        if not ok:
+            return
+        
+        self.perform("exec_add", perf, minutes)
         
-        execution_queue.append(perf)
         self.exec_perf_entry.delete(0, tk.END)
-        self.update_execution_display()
-        messagebox.showinfo("Success", f"Performance scheduled: '{perf}'. Queue size: {len(execution_queue)}")
+        self.exec_minutes_entry.delete(0, tk.END)
+        self.notify(f"Performance scheduled: '{perf}'. Queue size: {len(self.view.execution_queue)}")
+    
+    def set_exec_minutes(self):
+        perf = self.exec_perf_entry.get().strip()
+        ok, minutes = self.read_exec_minutes()
+        if not ok:
+            return
+        if not perf or minutes is None:
+            self.notify("Enter a performance and its minutes.", error=True)
+            return
+        
+        self.perform("exec_duration", perf, minutes)
+        self.exec_minutes_entry.delete(0, tk.END)
+        self.notify(f"'{perf}' is planned for {minutes} min.")
     
     def next_exec_performance(self):
-        if execution_queue:
-            now = execution_queue.popleft()
-            self.update_execution_display()
-            messagebox.showinfo("Now Playing", f"Now: {now}. Remaining in queue: {len(execution_queue)}")
+        if self.view.live_show.running:
+            self.advance_show(time.time())
+        elif self.view.execution_queue:
+            now = self.perform("exec_next")
+            self.notify(f"Now: {now}. Remaining in queue: {len(self.view.execution_queue)}")
+        else:
+            self.notify("No performances scheduled.", error=True)
+    
+    def start_show(self):
+        now = time.time()
+        try:
+            perf = self.perform("show_start", now, self.show_auto_var.get())
+        except ValueError as e:
+            self.notify(f"Cannot start the show: {e}.", error=True)
+            return
+        self.notify(f"Show started. Now on stage: {perf}")
+        self.update_show_labels(now)
+    
+    def stop_show(self):
+        now = time.time()
+        variance = self.perform("show_stop", now)
+        if variance is None:
+            self.notify("The show is not running.", error=True)
         else:
-            messagebox.showerror("Error", "No performances scheduled.")
+            self.notify(f"Show stopped, {describe_variance(variance)}.")
+        self.update_show_labels(now)
     
     def delete_performance(self):
         to_delete = self.exec_perf_entry.get().strip()
         if not to_delete:
-            messagebox.showerror("Error", "Enter performance name to delete.")
+            self.notify("Enter performance name to delete.", error=True)
             return
         
-        temp = list(execution_queue)
-        if to_delete in temp:
-            temp.remove(to_delete)
-            execution_queue.clear()
-            execution_queue.extend(temp)
+        if self.perform("exec_delete", to_delete):
             self.exec_perf_entry.delete(0, tk.END)
-            self.update_execution_display()
-            messagebox.showinfo("Success", f"Deleted performance: '{to_delete}'.")
+            self.notify(f"Deleted performance: '{to_delete}'.")
         else:
-            messagebox.showerror("Error", f"Performance '{to_delete}' not found in the schedule.")
+            self.notify(f"Performance '{to_delete}' not found in the schedule.", error=True)
     
     def insert_performance(self):
         new_perf = self.new_perf_entry.get().strip()
         after_perf = self.after_perf_entry.get().strip()
         
         if not new_perf:
-            messagebox.showerror("Error", "New performance cannot be empty.")
+            self.notify("New performance cannot be empty.", error=True)
+            return
+        
+        if new_perf in self.view.execution_queue:
+            self.notify(f"'{new_perf}' is already scheduled. Use Move to reorder it.", error=True)
             return
         
-        temp = list(execution_queue)
-        if after_perf in temp:
-            idx = temp.index(after_perf) + 1
-            temp.insert(idx, new_perf)
-            execution_queue.clear()
-            execution_queue.extend(temp)
-            messagebox.showinfo("Success", f"Inserted '{new_perf}' after '{after_perf}'.")
+        if self.perform("exec_insert", after_perf, new_perf):
+            self.notify(f"Inserted '{new_perf}' after '{after_perf}'.")
         else:
-            execution_queue.append(new_perf)
-            messagebox.showinfo("Info", f"'{after_perf}' not found in current queue. Adding '{new_perf}' at end.")
+            self.notify(f"'{after_perf}' not found in current queue. Adding '{new_perf}' at end.")
         
         self.new_perf_entry.delete(0, tk.END)
         self.after_perf_entry.delete(0, tk.END)
-        self.update_execution_display()
+    
+    def move_performance(self):
+        perf = self.new_perf_entry.get().strip()
+        after_perf = self.after_perf_entry.get().strip()
+        
+        if not perf:
+            self.notify("Performance to move cannot be empty.", error=True)
+            return
+        
+        # An empty "Insert After" moves the performance to the front
+        if self.perform("exec_move", perf, after_perf or None):
+            self.new_perf_entry.delete(0, tk.END)
+            self.after_perf_entry.delete(0, tk.END)
+            where = f"after '{after_perf}'" if after_perf else "to the front"
+            self.notify(f"Moved '{perf}' {where}.")
+        else:
+            self.notify("Both performances must be scheduled and different.", error=True)
     
     def assign_volunteer(self):
         name = self.vol_name_entry.get().strip()
         duty = self.vol_duty_entry.get().strip()
         if not name or not duty:
-            messagebox.showerror("Error", "Name and duty cannot be empty.")
+            self.notify("Name and duty cannot be empty.", error=True)
             return
         
-        volunteer_map[name] = duty
+        self.perform("volunteer_assign", name, duty)
         self.vol_name_entry.delete(0, tk.END)
         self.vol_duty_entry.delete(0, tk.END)
-        self.update_execution_display()
-        messagebox.showinfo("Success", f"Volunteer '{name}' assigned duty '{duty}'.")
+        self.notify(f"Volunteer '{name}' assigned duty '{duty}'.")
+    
+    def format_volunteer(self, i, entry):
+        name, duty = entry
+        window = self.view.volunteer_windows.get(name)
+        line = f"• {name}: {duty or '(any duty)'}"
+        return line + (f" (available {format_clock(window[0])}-{format_clock(window[1])})" if window else "")
+    
+    def format_shift(self, i, row):
+        number, duty, start, end, capacity, crew = row
+        line = f"#{number} {duty} {format_clock(start)}-{format_clock(end)}: {len(crew)}/{capacity}"
+        if crew:
+            line += f" - {', '.join(crew[:5])}" + (f" +{len(crew) - 5} more" if len(crew) > 5 else "")
+        return line
+    
+    def read_clock_range(self):
+        try:
+            start, end = parse_clock(self.vol_start_entry.get().strip()), parse_clock(self.vol_end_entry.get().strip())
+        except ValueError:
+            self.notify("From and To must both be in HH:MM format.", error=True)
+            return None
+        if end <= start:
+            self.notify("To must be after From.", error=True)
+            return None
+        return start, end
+    
+    def set_availability(self):
+        name = self.vol_name_entry.get().strip()
+        if not name:
+            self.notify("Name cannot be empty.", error=True)
+            return
+        window = self.read_clock_range()
+        if window is None:
+            return
+        
+        self.perform("volunteer_available", name, *window)
+        self.vol_name_entry.delete(0, tk.END)
+        self.notify(f"'{name}' is available {format_clock(window[0])}-{format_clock(window[1])}.")
+    
+    def add_shift(self):
+        duty = self.vol_duty_entry.get().strip()
+        if not duty:
+            self.notify("Duty cannot be empty.", error=True)
+            return
+        window = self.read_clock_range()
+        if window is None:
+            return
+        capacity = self.shift_capacity_entry.get().strip()
+        if not capacity.isdigit() or int(capacity) < 1:
+            self.notify("Capacity must be a positive whole number.", error=True)
+            return
+        
+        number = self.perform("shift_add", duty, *window, int(capacity))
+        self.notify(f"Shift #{number} added for '{duty}'.")
+    
+    def allocate_shifts(self):
+        filled = self.perform("roster_allocate")
+        open_places = sum(capacity - len(crew) for number, duty, start, end, capacity, crew in self.view.roster)
+        self.notify(f"Filled {filled} places. {open_places} still open.")
     
     def add_feedback(self):
         try:
             rating = int(self.rating_entry.get().strip())
             if 1 <= rating <= 5:
-                feedback_ratings.append(rating)
-                feedback_ratings.sort()
+                self.perform("feedback_add", rating, self.rating_perf_entry.get().strip())
                 self.rating_entry.delete(0, tk.END)
-                messagebox.showinfo("Success", "Feedback added.")
+                self.notify("Feedback added.")
             else:
-                messagebox.showerror("Error", "Rating must be between 1 and 5.")
+                self.notify("Rating must be between 1 and 5.", error=True)
         except ValueError:
-            messagebox.showerror("Error", "Invalid input. Please enter a number.")
+            self.notify("Invalid input. Please enter a number.", error=True)
     
     def view_feedback(self):
-        if feedback_ratings:
-            avg_rating = sum(feedback_ratings) / len(feedback_ratings)
-            feedback_text = f"Ratings: {feedback_ratings}\nAverage Rating: {avg_rating:.2f}"
-            messagebox.showinfo("Feedback Summary", feedback_text)
+        perf = self.rating_perf_entry.get().strip()
+        if perf:
+            stats = self.view.performance_feedback.get(perf)
+            title = f"Feedback Summary - {perf}"
         else:
-            messagebox.showinfo("Feedback Summary", "No feedback ratings yet.")
-    
-    def update_execution_display(self):
-        self.execution_display.delete(1.0, tk.END)
+            stats = self.view.feedback_stats
+            title = "Feedback Summary"
         
-        self.execution_display.insert(tk.END, "Performance Schedule:\n")
-        for i, perf in enumerate(execution_queue, 1):
-            self.execution_display.insert(tk.END, f"{i}. {perf}\n")
-        
-        self.execution_display.insert(tk.END, "\nVolunteers:\n")
-        for name, duty in volunteer_map.items():
-            self.execution_display.insert(tk.END, f"• {name}: {duty}\n")
+        if stats:
+            messagebox.showinfo(title, stats.summary())
+        else:
+            messagebox.showinfo(title, "No feedback ratings yet.")
     
-    def clear_window(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+    def update_execution_display(self):
+        self.execution_display.refresh()
+
 
 
+class StartupProfiler:
+    # Where cold-start time goes (--profile-startup). mark() ends a stage on
+    # the main thread; detail() adds a breakdown timed elsewhere, such as the
+    # loader thread's snapshot load and journal replay.
+    def __init__(self, started=STARTED):
+        # Wall-clock throughout. Interpreter start-up itself, before the
+        # module's first line, is not included.
+        self.stages = []
+        self.last = started
+        self.mark("imports and definitions")
+    
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, (now - self.last) * 1000, False))
+        self.last = now
+    
+    def detail(self, times):
+        for stage, ms in times.items():
+            self.stages.append((stage, ms, True))
+    
+    def report(self):
+        lines = ["Startup profile (ms):"]
+        total = 0
+        for stage, ms, detail in self.stages:
+            if detail:
+                lines.append(f"    {stage:<28}{ms:9.1f}")
+            else:
+                total += ms
+                lines.append(f"  {stage:<30}{ms:9.1f}")
+        lines.append(f"  {'total':<30}{total:9.1f}")
+        return "\n".join(lines)
+
 def main():
-    root = tk.Tk()
-    app = EventManagementGUI(root)
-    root.mainloop()
+    profiler = StartupProfiler()
+    parser = argparse.ArgumentParser(description="Event Management System")
+    parser.add_argument("--api", action="store_true", help="also serve the local HTTP/JSON API")
+    parser.add_argument("--headless", action="store_true", help="serve the API without opening the GUI")
+    parser.add_argument("--port", type=int, default=API_PORT, help=f"API port (default {API_PORT})")
+    parser.add_argument("--event", default=DEFAULT_EVENT, help="event to open first")
+    parser.add_argument("--open-events", type=int, default=OPEN_EVENTS,
+                        help=f"events kept in memory before the least recently used is saved and closed (default {OPEN_EVENTS})")
+    parser.add_argument("--profile-startup", action="store_true", help="print where cold-start time goes to stderr")
+    parser.add_argument("--instrument", action="store_true",
+                        help="time operations, repaints and Tk loop lag from the start (diagnostics panel: Ctrl+Shift+D)")
+    args = parser.parse_args()
+    try:
+        event = event_slug(args.event)
+    except ValueError as e:
+        parser.error(f"--event: {e}")
+    profiler.mark("arguments")
+    
+    registry = EventRegistry(limit=args.open_events)
+    server = None
+    
+    def loaded():
+        profiler.mark("event loaded")
+        profiler.detail(registry.open_events[event].load_times)
+        # The recovered state lives for the whole session; keeping it out of
+        # the collector's full passes avoids GC pauses while the GUI runs
+        gc.freeze()
+        if args.profile_startup:
+            print(profiler.report(), file=sys.stderr)
+    
+    try:
+        if args.headless:
+            import asyncio
+            service = registry.open(event)[1]
+            loaded()
+            server = EventServer(service, port=args.port)
+            try:
+                asyncio.run(server.serve())
+            except KeyboardInterrupt:
+                pass
+            except OSError as e:
+                print(f"Cannot serve the API on {API_HOST}:{args.port}: {e}", file=sys.stderr)
+                sys.exit(1)
+            return
+        root = tk.Tk()
+        profiler.mark("Tk root")
+        # The window opens on an empty placeholder; the event itself loads
+        # in the background and replaces it when ready
+        app = EventManagementGUI(root, EventService(), api=args.api, registry=registry, event=event,
+                                 instrument=args.instrument)
+        profiler.mark("main menu")
+        root.after_idle(profiler.mark, "first frame")
+        
+        def ready():
+            nonlocal server
+            loaded()
+            if args.api:
+                # Started after the GUI has frozen its first view of the state
+                server = EventServer(app.service, port=args.port)
+                try:
+                    server.start()
+                except OSError as e:
+                    # Raised here, inside a Tk callback, it would only reach stderr
+                    server = None
+                    app.serve_locally()
+                    messagebox.showerror("Error", f"Cannot serve the API on {API_HOST}:{args.port}: {e}\n"
+                                                  "The event is open without it.")
+        
+        def failed(error):
+            messagebox.showerror("Error", f"Cannot open event '{event}': {error}")
+            root.quit()
+        
+        app.load_event(event, ready, failed)
+        root.protocol("WM_DELETE_WINDOW", root.quit)
+        root.mainloop()
+    finally:
+        if server and server.thread:
+            server.stop()
+        registry.close_all()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,408 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+# Headless benchmarks for the core structures and the GUI's list refresh
+# paths. Each scenario builds its state, then hands back a list of
+# (function, args) operations; only the operations are timed, one by one,
+# and a second run under tracemalloc measures the memory they allocate.
+# Results are printed (or written) as JSON so runs can be diffed or
+# compared against a saved baseline with --baseline.
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Event Manager with Tkinter.py")
+DEFAULT_SIZES = (1000, 10000)
+PERCENTILES = (50, 90, 99)
+
+def load_app(path=APP_PATH):
+    # The app's file name has spaces, so it is loaded by path rather than imported
+    spec = importlib.util.spec_from_file_location("event_manager", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class FakeText:
+    # Stands in for tk.Text: keeps the text so inserts and deletes still cost something
+    def __init__(self):
+        self.lines = [""]
+    
+    def configure(self, **options):
+        pass
+    
+    def delete(self, start, end=None):
+        if start == 1.0:
+            self.lines = [""]
+        else:
+            row = int(str(start).split(".")[0]) - 1
+            self.lines[row] = ""
+    
+    def insert(self, index, text):
+        if index == "end":
+            self.lines.extend((self.lines.pop() + text).split("\n"))
+        else:
+            row = int(str(index).split(".")[0]) - 1
+            self.lines[row] = text + self.lines[row]
+
+class FakeScrollbar:
+    def set(self, first, last):
+        self.position = (first, last)
+
+def make_pane(app, service, sections, height, tk_root=None):
+    # A VirtualList without its Tk frame. With a Tk root (--tk, e.g. under
+    # xvfb-run) rows go into a real Text widget; otherwise into FakeText.
+    pane = app.VirtualList.__new__(app.VirtualList)
+    pane.feed = service.changes
+    pane.sections = sections
+    pane.top = 0
+    pane.visible = height
+    pane.pending = []
+    pane.flush_id = None
+    pane.stale = False
+    pane.text = app.tk.Text(tk_root, height=height) if tk_root is not None else FakeText()
+    pane.scrollbar = FakeScrollbar()
+    pane.winfo_ismapped = lambda: True
+    pane.after_idle = lambda callback: "idle"
+    for topic in {section[0] for section in sections}:
+        service.changes.subscribe(topic, pane.on_change)
+    return pane
+
+def words(rng, count, length=6):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(length)) for _ in range(count)]
+
+# Scenarios: (app, n, rng, options) -> [(function, args), ...]
+
+def scenario_announcements(app, n, rng, options):
+    service = app.EventService()
+    vocabulary = words(rng, max(int(n ** 0.5), 1))
+    return [(service.apply, ("announcement_add", f"{rng.choice(vocabulary)} at {i % 24:02d}:00")) for i in range(n)]
+
+def scenario_announcement_churn(app, n, rng, options):
+    # Last-minute notices: half the operations take an existing one down
+    service = app.EventService()
+    messages = [f"notice {i}" for i in range(n)]
+    for msg in messages:
+        service.apply("announcement_add", msg)
+    ops = []
+    for i in range(n):
+        if i % 2:
+            ops.append((service.apply, ("announcement_remove", rng.choice(messages))))
+        else:
+            ops.append((service.apply, ("announcement_add", f"late notice {i}")))
+    return ops
+
+def day_offsets(rng, n, ordered):
+    if ordered:
+        return range(n)
+    return rng.sample(range(4 * n), n)
+
+def scenario_dates_sorted(app, n, rng, options):
+    service = app.EventService()
+    start = date(1900, 1, 1)
+    return [(service.apply, ("date_insert", (start + timedelta(days=k)).isoformat())) for k in day_offsets(rng, n, True)]
+
+def scenario_dates_random(app, n, rng, options):
+    service = app.EventService()
+    start = date(1900, 1, 1)
+    return [(service.apply, ("date_insert", (start + timedelta(days=k)).isoformat())) for k in day_offsets(rng, n, False)]
+
+class BSTNode:
+    __slots__ = ("key", "left", "right")
+    
+    def __init__(self, key):
+        self.key = key
+        self.left = None
+        self.right = None
+
+class BST:
+    # The app's original recursive date tree, replaced there by the AVL index
+    def __init__(self):
+        self.root = None
+    
+    def insert(self, root, key):
+        if root is None:
+            return BSTNode(key)
+        if key < root.key:
+            root.left = self.insert(root.left, key)
+        else:
+            root.right = self.insert(root.right, key)
+        return root
+
+def legacy_bst_ops(app, n, rng, ordered):
+    tree = BST()
+    
+    def insert(key):
+        tree.root = tree.insert(tree.root, key)
+    return [(insert, (k,)) for k in day_offsets(rng, n, ordered)]
+
+def scenario_bst_sorted(app, n, rng, options):
+    return legacy_bst_ops(app, n, rng, True)
+
+def scenario_bst_random(app, n, rng, options):
+    return legacy_bst_ops(app, n, rng, False)
+
+def scenario_feedback_bursty(app, n, rng, options):
+    # Ratings arrive in bursts right after each act, mostly alike; the
+    # summary the GUI shows is read after every burst
+    service = app.EventService()
+    acts = [f"act {i}" for i in range(max(n // 200, 1))]
+    ops = []
+    while len(ops) < n:
+        perf = rng.choice(acts)
+        mood = rng.randint(1, 5)
+        for _ in range(min(int(rng.expovariate(1 / 40)) + 1, n - len(ops))):
+            rating = min(max(mood + rng.choice((-1, 0, 0, 0, 1)), 1), 5)
+            ops.append((service.apply, ("feedback_add", rating, perf)))
+        ops.append((service.feedback_stats.summary, ()))
+    return ops
+
+def scenario_schedule_churn(app, n, rng, options):
+    # Execution day: acts are moved, cancelled and slotted back in, and the next one starts
+    service = app.EventService()
+    acts = [f"act {i}" for i in range(n)]
+    for perf in acts:
+        service.apply("exec_add", perf)
+    ops = []
+    for i in range(n):
+        perf, other = rng.choice(acts), rng.choice(acts)
+        kind = rng.random()
+        if kind < 0.4:
+            ops.append((service.apply, ("exec_move", perf, other)))
+        elif kind < 0.7:
+            ops.append((service.apply, ("exec_delete", perf)))
+            ops.append((service.apply, ("exec_insert", other, perf)))
+        else:
+            ops.append((service.apply, ("exec_next",)))
+            ops.append((service.apply, ("exec_add", f"walk-in {i}")))
+    return ops
+
+def scenario_search(app, n, rng, options):
+    service = app.EventService()
+    vocabulary = words(rng, max(n // 10, 1))
+    for i in range(n):
+        service.apply("agenda_add", " ".join(rng.sample(vocabulary, 3)))
+    queries = []
+    for _ in range(max(n // 10, 1)):
+        word = rng.choice(vocabulary)
+        queries.append(rng.choice((word, word[:3], word[:-1] + "x")))
+    return [(service.find, (query,)) for query in queries]
+
+def scenario_undo_redo(app, n, rng, options):
+    service = app.EventService()
+    for i in range(n):
+        service.apply(rng.choice(("agenda_add", "announcement_add")), f"point {i}")
+    steps = min(n, app.History.LIMIT)
+    return [(service.apply, ("undo",))] * steps + [(service.apply, ("redo",))] * steps
+
+def scenario_refresh_scroll(app, n, rng, options):
+    # Scrolling the notices pane: announcements sit in a linked list whose
+    # rows are sliced from its snapshot, responsibilities in a dict that is
+    # skipped through to the first row
+    service = app.EventService()
+    for i in range(n):
+        service.apply("announcement_add", f"notice {i}")
+        service.apply("responsibility_assign", f"member {i % 500}", f"task {i}")
+    pane = make_pane(app, service, [
+        ("announcements", lambda: f"Announcements ({len(service.announcements)}):", lambda: len(service.announcements),
+         app.seq_rows(lambda: service.announcements), lambda i, ann: f"{i + 1}. {ann}"),
+        ("responsibilities", "Responsibilities:", lambda: len(service.responsibility_map),
+         app.iter_rows(lambda: service.responsibility_map.items()), lambda i, entry: f"• {entry[0]}: {entry[1]}"),
+    ], 12, options.get("tk_root"))
+    total = pane._layout()[1]
+    
+    def scroll_to(row):
+        pane.top = row
+        pane.refresh()
+    return [(scroll_to, (rng.randint(0, total),)) for _ in range(max(n // 10, 1))]
+
+def scenario_flush_execution(app, n, rng, options):
+    # Change events merged into one repaint per batch, as the GUI's idle flush does
+    service = app.EventService()
+    acts = [f"act {i}" for i in range(n)]
+    for perf in acts:
+        service.apply("exec_add", perf)
+    pane = make_pane(app, service, [
+        ("execution", "Performance Schedule:", lambda: len(service.execution_queue),
+         app.seq_rows(lambda: service.execution_queue), lambda i, perf: f"{i + 1}. {perf}"),
+    ], 8, options.get("tk_root"))
+    pane.refresh()
+    
+    def batch(moves):
+        for perf, after in moves:
+            service.apply("exec_move", perf, after)
+        pane.flush()
+    return [(batch, ([(rng.choice(acts), rng.choice(acts)) for _ in range(5)],)) for _ in range(max(n // 10, 1))]
+
+SCENARIOS = {
+    "announcements": scenario_announcements,
+    "announcement_churn": scenario_announcement_churn,
+    "dates_sorted": scenario_dates_sorted,
+    "dates_random": scenario_dates_random,
+    "bst_sorted": scenario_bst_sorted,
+    "bst_random": scenario_bst_random,
+    "feedback_bursty": scenario_feedback_bursty,
+    "schedule_churn": scenario_schedule_churn,
+    "search": scenario_search,
+    "undo_redo": scenario_undo_redo,
+    "refresh_scroll": scenario_refresh_scroll,
+    "flush_execution": scenario_flush_execution,
+}
+
+def percentile(ordered, p):
+    # Nearest rank on an already sorted list
+    return ordered[min(max(int(round(p / 100 * len(ordered))) - 1, 0), len(ordered) - 1)]
+
+def run_ops(ops):
+    clock = time.perf_counter_ns
+    latencies = []
+    for fn, args in ops:
+        start = clock()
+        fn(*args)
+        latencies.append(clock() - start)
+    return latencies
+
+def measure(app, name, n, seed, options):
+    result = {"scenario": name, "size": n}
+    try:
+        ops = SCENARIOS[name](app, n, random.Random(seed), options)
+        latencies = run_ops(ops)
+        # Same operations again on fresh state, this time under tracemalloc
+        ops = SCENARIOS[name](app, n, random.Random(seed), options)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        run_ops(ops)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    except RecursionError as e:
+        tracemalloc.stop()
+        result["error"] = f"RecursionError: {e}"
+        return result
+    latencies.sort()
+    seconds = sum(latencies) / 1e9
+    result.update({
+        "ops": len(latencies),
+        "seconds": round(seconds, 6),
+        "ops_per_sec": round(len(latencies) / seconds, 1) if seconds else None,
+        "latency_us": dict({f"p{p}": round(percentile(latencies, p) / 1000, 3) for p in PERCENTILES},
+                           max=round(latencies[-1] / 1000, 3)),
+        "peak_kib": round((peak - before) / 1024, 1),
+        "retained_kib": round((current - before) / 1024, 1),
+    })
+    return result
+
+def plain_class(cls):
+    # The same record without __slots__, as the classes were before they were slotted
+    return type(cls.__name__, (), {"__init__": cls.__init__})
+
+def traced_bytes(build):
+    # Bytes still allocated by build()'s result, less the list holding it
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before - sys.getsizeof(kept)
+
+def memory_report(app, n):
+    # Bytes per record for the compact representations against the ones they replaced
+    text = [f"record {i}" for i in range(n)]
+    records = {
+        "announcement node": (app.Node, lambda cls: [cls(t) for t in text]),
+        "schedule node": (app.ScheduleNode, lambda cls: [cls(t) for t in text]),
+        "avl node": (app.AVLNode, lambda cls: [cls(i) for i in range(n)]),
+        "timetable entry": (app.TimetableEntry, lambda cls: [cls(i, t, 600, 630, "main", ("ann",)) for i, t in enumerate(text)]),
+        "approval request": (app.ApprovalRequest, lambda cls: [cls(i, t) for i, t in enumerate(text)]),
+        "shift": (app.Shift, lambda cls: [cls(i, "ushers", 600, 630, 2) for i in range(n)]),
+    }
+    rows = [(name, traced_bytes(lambda: build(cls)), traced_bytes(lambda: build(plain_class(cls))))
+            for name, (cls, build) in records.items()]
+    
+    # Whole structures: a date in the index (node plus date object, or one
+    # pooled slot) and a performer name repeated across many records
+    days = [date(2000, 1, 1).toordinal() + i for i in range(n)]
+    
+    def index_dates(tree):
+        for day in days:
+            tree.insert(date.fromordinal(day))
+        return [tree]
+    rows.append(("indexed date", traced_bytes(lambda: index_dates(app.DateIndex())), traced_bytes(lambda: index_dates(app.AVLTree()))))
+    names = [f"performer {i}" for i in range(50)]
+    rows.append(("performer name",
+                 traced_bytes(lambda: [sys.intern("".join(names[i % 50])) for i in range(n)]),
+                 traced_bytes(lambda: ["".join(names[i % 50]) for i in range(n)])))
+    return [{
+        "record": name,
+        "compact_bytes": round(compact / n, 1),
+        "previous_bytes": round(previous / n, 1),
+        "saved_pct": round(100 * (1 - compact / previous), 1) if previous else None,
+    } for name, compact, previous in rows]
+
+def compare(results, baseline, tolerance):
+    # Regressions against a saved run: throughput down or p99 up by more than 'tolerance'
+    old = {(r["scenario"], r["size"]): r for r in baseline["results"] if "error" not in r}
+    regressions = []
+    for r in results:
+        base = old.get((r["scenario"], r["size"]))
+        if base is None or "error" in r:
+            continue
+        if r["ops_per_sec"] and base["ops_per_sec"] and r["ops_per_sec"] < base["ops_per_sec"] / (1 + tolerance):
+            regressions.append(f"{r['scenario']}@{r['size']}: {r['ops_per_sec']} ops/s, was {base['ops_per_sec']}")
+        if r["latency_us"]["p99"] > base["latency_us"]["p99"] * (1 + tolerance):
+            regressions.append(f"{r['scenario']}@{r['size']}: p99 {r['latency_us']['p99']} us, was {base['latency_us']['p99']}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Event Management System's core paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="items per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="JSON report to compare against; exits 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--tk", action="store_true", help="render panes into real Tk widgets (needs a display)")
+    parser.add_argument("--memory-report", action="store_true", help="report bytes per record instead of timings")
+    args = parser.parse_args()
+    
+    app = load_app()
+    if args.memory_report:
+        report = {"python": platform.python_version(), "records": {n: memory_report(app, n) for n in args.sizes}}
+        print(json.dumps(report, indent=2))
+        return
+    options = {}
+    if args.tk:
+        options["tk_root"] = app.tk.Tk()
+        options["tk_root"].withdraw()
+    results = []
+    for name in args.scenarios:
+        for n in args.sizes:
+            results.append(measure(app, name, n, args.seed, options))
+            print(f"{name} @ {n}: done", file=sys.stderr)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "tk": args.tk,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"regression: {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
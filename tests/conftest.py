@@ -0,0 +1,18 @@
+import importlib.util
+import os
+
+import pytest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Event Manager with Tkinter.py")
+
+@pytest.fixture(scope="session")
+def app():
+    # The app's file name has spaces, so it is loaded by path rather than imported
+    spec = importlib.util.spec_from_file_location("event_manager", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def service(app):
+    return app.EventService()
@@ -0,0 +1,86 @@
+import json
+import socket
+import urllib.error
+import urllib.request
+
+import pytest
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@pytest.fixture
+def server(app, service):
+    server = app.EventServer(service, port=free_port())
+    server.start()
+    yield server
+    server.stop()
+
+def request(server, path, body=None, method=None):
+    url = f"http://{server.host}:{server.port}{path}"
+    data = body if isinstance(body, bytes) or body is None else json.dumps(body).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data, method=method)) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_op_is_applied(server, service):
+    assert request(server, "/ops", {"op": "agenda_add", "args": ["welcome"]}) == (200, {"result": None})
+    assert service.agenda == ["welcome"]
+    status, state = request(server, "/state")
+    assert status == 200 and state["agenda"] == ["welcome"]
+
+@pytest.mark.parametrize("body, error", [
+    ({"op": "agenda_add", "args": [123]}, "argument 1 of 'agenda_add' must be text"),
+    ({"op": "agenda_add", "args": []}, "'agenda_add' takes 1 arguments, got 0"),
+    ({"op": "feedback_add", "args": [True, "Dance"]}, "argument 1 of 'feedback_add' must be int"),
+    ({"op": "request_add", "args": ["hall", 0, "tomorrow"]}, "argument 3 of 'request_add' must be time or null"),
+    ({"op": "request_add", "args": ["hall", 0, 1e300]}, "argument 3 of 'request_add' must be a time between 1970 and 2100"),
+    ({"op": "request_add", "args": ["hall", 0, -1]}, "argument 3 of 'request_add' must be a time between 1970 and 2100"),
+    ({"op": "exec_add", "args": ["Dance", float("inf")]}, "argument 2 of 'exec_add' must be a finite number"),
+    ({"op": "drop_tables", "args": []}, "unknown operation 'drop_tables'"),
+    ({"op": "exec_add", "args": "Dance"}, "body must be {\"op\": name, \"args\": [...]}"),
+    ({"args": []}, "body must be {\"op\": name, \"args\": [...]}"),
+    ({"op": None, "args": ["ab", [1]]}, "body must be {\"op\": name, \"args\": [...]}"),
+])
+def test_bad_op_is_rejected_without_changes(server, service, body, error):
+    assert request(server, "/ops", body) == (400, {"error": error})
+    assert service.agenda == [] and service.feedback_stats.count == 0 and not service.approval_queue
+    assert service.history.seq == 0
+
+def test_op_own_check_is_a_400(server, service):
+    status, payload = request(server, "/ops", {"op": "feedback_add", "args": [9, None]})
+    assert status == 400 and "rating" in payload["error"]
+
+def test_optional_arguments_take_null(server, service):
+    assert request(server, "/ops", {"op": "exec_add", "args": ["Dance", None]})[0] == 200
+    assert request(server, "/ops", {"op": "exec_move", "args": ["Dance", None]}) == (200, {"result": True})
+
+def test_malformed_json_is_a_400(server):
+    status, payload = request(server, "/ops", b"{not json")
+    assert status == 400 and "error" in payload
+
+def test_unexpected_error_is_a_json_500(server, service, monkeypatch):
+    def broken(query, limit):
+        raise RuntimeError("index unavailable")
+    monkeypatch.setattr(service, "find", broken)
+    assert request(server, "/search?q=x") == (500, {"error": "RuntimeError: index unavailable"})
+
+def test_unknown_route_and_wrong_method(server):
+    assert request(server, "/nowhere")[0] == 404
+    assert request(server, "/ops")[0] == 405
+    assert request(server, "/state", {"x": 1})[0] == 405
+
+def test_port_in_use_raises_and_leaves_the_service_local(app, server):
+    service = app.EventService()
+    service.enable_versions(lambda view, events: None)
+    taken = app.EventServer(service, port=server.port)
+    with pytest.raises(OSError):
+        taken.start()
+    assert service.writer is None
+    service.disable_versions()
+    service.call("agenda_add", "welcome")
+    assert service.agenda == ["welcome"]
+    assert service.changes.relay is None
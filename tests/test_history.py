@@ -0,0 +1,120 @@
+import json
+import random
+
+def round_trip(service, changes):
+    # Applies each change, then undoes them all and redoes them all, checking
+    # the state at every step against what it was on the way in
+    states = [service.capture_state()]
+    for op, *args in changes:
+        service.perform(op, *args)
+        states.append(service.capture_state())
+    for expected in reversed(states[:-1]):
+        assert service.perform("undo") is not None
+        assert without_history(service.capture_state()) == without_history(expected)
+    for expected in states[1:]:
+        assert service.perform("redo") is not None
+        assert without_history(service.capture_state()) == without_history(expected)
+    assert service.perform("redo") is None
+
+def without_history(state):
+    return {key: value for key, value in state.items() if key != "history"}
+
+def test_round_trip_across_sections(service):
+    round_trip(service, [
+        ("agenda_add", "welcome"),
+        ("request_add", "use the hall", 1, None),
+        ("request_approve",),
+        ("date_insert", "2026-05-01"),
+        ("announcement_add", "rehearsal at 5"),
+        ("responsibility_assign", "Asha", "stage"),
+        ("responsibility_assign", "Asha", "lights"),
+        ("item_add", "chairs", 40),
+        ("item_status", "chairs", "ordered"),
+        ("vendor_map", "chairs", "City Rentals"),
+        ("rehearsal_add", "Dance", "Asha", 15),
+        ("flow_step", 1, "Dance", 600, 630, "Main"),
+        ("exec_add", "Dance", 12),
+        ("exec_add", "Song"),
+        ("exec_move", "Song", None),
+        ("exec_next",),
+        ("volunteer_assign", "Ravi", "ushering"),
+        ("volunteer_available", "Ravi", 540, 720),
+        ("shift_add", "ushering", 600, 660, 2),
+        ("feedback_add", 4, "Dance"),
+    ])
+
+def test_announcement_removal_with_duplicates(service):
+    rng = random.Random(7)
+    for _ in range(30):
+        service.perform("announcement_add", rng.choice("abcd"))
+    # Only removals that take something, so each one leaves an undo entry
+    remaining = service.announcements.display()
+    changes = []
+    for _ in range(12):
+        msg = rng.choice(remaining)
+        remaining.remove(msg)
+        changes.append(("announcement_remove", msg))
+    round_trip(service, changes)
+
+def test_undo_and_redo_with_nothing_to_do(service):
+    assert service.perform("undo") is None
+    assert service.perform("redo") is None
+
+def test_section_undo_leaves_other_sections(service):
+    service.perform("agenda_add", "welcome")
+    service.perform("exec_add", "Dance")
+    assert service.perform("undo", "agenda") == "adding 'welcome' to the agenda"
+    assert service.agenda == []
+    assert list(service.execution_queue) == ["Dance"]
+
+def test_show_advance_is_not_undone(service):
+    for perf in ("A", "B", "C"):
+        service.perform("exec_add", perf)
+    service.perform("show_start", 0.0, False)
+    assert service.live_show.current == "A"
+    # The newest undoable change is still the last scheduling, not the show
+    assert service.perform("undo") == "scheduling 'C'"
+    assert list(service.execution_queue) == ["B"]
+    assert service.live_show.queued == service.planned_seconds("B")
+
+def test_history_survives_snapshot(app, service):
+    service.perform("agenda_add", "welcome")
+    service.perform("announcement_add", "a")
+    service.perform("announcement_add", "b")
+    service.perform("announcement_remove", "a")
+    restored = app.EventService()
+    restored.restore_state(service.capture_state())
+    assert restored.perform("undo") == "removing the announcement 'a'"
+    assert restored.announcements.display() == ["a", "b"]
+    assert restored.perform("undo") is not None
+    assert restored.perform("undo") is not None
+    assert restored.perform("undo") == "adding 'welcome' to the agenda"
+    assert restored.agenda == []
+
+def test_import_is_one_undo_step(app, service, tmp_path):
+    service.perform("agenda_add", "welcome")
+    before = without_history(service.capture_state())
+    path = tmp_path / "mixed.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in [
+        {"section": "agenda", "point": "budget"},
+        {"section": "announcements", "message": "doors open"},
+        {"section": "requests", "request": "stage lights", "priority": "High"},
+    ]), encoding="utf-8")
+    assert app.import_file(str(path), service)[0] == 3
+    after = without_history(service.capture_state())
+    assert len(service.history) == 2
+    assert service.perform("undo") == "importing mixed.jsonl"
+    assert without_history(service.capture_state()) == before
+    assert service.perform("redo") == "importing mixed.jsonl"
+    assert without_history(service.capture_state()) == after
+    assert service.perform("undo") is not None
+    assert service.agenda == ["welcome"]
+
+def test_dump_does_not_share_entries(service):
+    service.perform("agenda_add", "welcome")
+    service.perform("undo")
+    dumped = service.history.dump()["undone"][0]
+    kept = list(dumped)
+    service.perform("redo")
+    assert dumped == kept
+    assert all(entry is not dumped for entry in service.history.done.values())
@@ -0,0 +1,63 @@
+import json
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def test_rows_are_imported_and_bad_ones_reported(app, service, tmp_path):
+    path = write(tmp_path / "agenda.csv", 'point\nwelcome\n" "\nbudget\n')
+    imported, errors = app.import_file(path, service, "agenda")
+    assert imported == 2
+    assert service.agenda == ["welcome", "budget"]
+    assert errors == [(3, "'point' is required")]
+
+def test_flow_clash_is_reported_not_counted(app, service, tmp_path):
+    path = write(tmp_path / "flow.csv",
+                 "step,performance,start,end,stage\n"
+                 "1,Dance,10:00,11:00,Main\n"
+                 "2,Song,10:30,11:30,Main\n"
+                 "3,Skit,11:00,11:30,Main\n")
+    imported, errors = app.import_file(path, service, "flow")
+    assert imported == 2
+    assert [n for n, _ in errors] == [3]
+    assert "Stage 'Main' is taken" in errors[0][1]
+    assert sorted(service.event_flow_map) == [1, 3]
+
+def test_performer_change_that_double_books_is_reported(app, service, tmp_path):
+    service.perform("rehearsal_add", "Dance", "Asha")
+    service.perform("flow_step", 1, "Dance", 600, 660, "Main")
+    service.perform("flow_step", 2, "Song", 630, 690, "Side")
+    path = write(tmp_path / "rehearsals.csv", "performance,participant\nSong,Asha & Cara\nSkit,Asha\n")
+    imported, errors = app.import_file(path, service, "rehearsals")
+    assert imported == 1
+    assert errors == [(2, "'asha' is already performing in Step 1: Dance [10:00-11:00, Main]")]
+    assert "Song" not in service.performance_map
+    assert sorted(service.timetable.performers) == ["asha", "song"]
+
+def test_operation_errors_are_reported_per_row(app, service, tmp_path):
+    path = write(tmp_path / "mixed.jsonl", "\n".join(json.dumps(row) for row in [
+        {"section": "logistics", "item": "chairs", "quantity": "5"},
+        {"section": "nowhere", "text": "x"},
+        ["not", "an", "object"],
+        {"section": "feedback", "rating": "9"},
+        {"section": "agenda", "point": "close"},
+    ]) + "\n")
+    imported, errors = app.import_file(path, service)
+    assert imported == 2
+    assert [n for n, _ in errors] == [2, 3, 4]
+    assert errors[1][1] == "row must be a JSON object"
+    assert service.agenda == ["close"]
+
+def test_json_is_streamed_across_chunks(app, service, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "JSON_CHUNK", 3)
+    rows = [{"point": f"item {i} ]}}", "note": [1.5e3, {"x": None}]} for i in range(20)]
+    path = write(tmp_path / "agenda.json", json.dumps({"agenda": rows, "dates": [{"date": "01-02-2030"}]}, indent=2))
+    assert app.import_file(path, service) == (21, [])
+    assert service.agenda == [row["point"] for row in rows]
+
+def test_malformed_json_ends_the_import(app, service, tmp_path):
+    path = write(tmp_path / "agenda.json", '[{"point": "a"}, {"point": "b"} {"point": "c"}]')
+    imported, errors = app.import_file(path, service, "agenda")
+    assert imported == 2
+    assert errors == [(3, "invalid JSON: expected ',' or ']' but found '{'")]
+    assert service.agenda == ["a", "b"]
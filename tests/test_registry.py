@@ -0,0 +1,40 @@
+def test_open_does_not_evict(app, tmp_path):
+    registry = app.EventRegistry(str(tmp_path), limit=1)
+    registry.open("gala")
+    registry.open("fair")
+    assert len(registry) == 2
+    registry.close_all()
+
+def test_evict_keeps_the_event_in_use(app, tmp_path):
+    registry = app.EventRegistry(str(tmp_path), limit=1)
+    registry.open("gala")
+    service = registry.open("fair")[1]
+    registry.open("gala")
+    registry.evict("fair")
+    assert list(registry.open_events) == ["fair"]
+    service.perform("agenda_add", "welcome")
+    registry.close_all()
+    assert registry.open("fair")[1].agenda == ["welcome"]
+    registry.close_all()
+
+def test_evict_drops_least_recently_used(app, tmp_path):
+    registry = app.EventRegistry(str(tmp_path), limit=2)
+    registry.open("gala")[1].perform("agenda_add", "welcome")
+    registry.open("fair")
+    registry.open("expo")
+    registry.open("fair")
+    registry.evict("expo")
+    assert sorted(registry.open_events) == ["expo", "fair"]
+    assert registry.open("gala")[1].agenda == ["welcome"]
+    registry.close_all()
+
+def test_open_reuses_a_loaded_event_and_lists_names(app, tmp_path):
+    registry = app.EventRegistry(str(tmp_path))
+    name, service = registry.open("Summer Gala")
+    assert registry.open(name)[1] is service
+    registry.open("fair")
+    assert list(registry.open_events) == [name, "fair"]
+    registry.open(name)
+    assert list(registry.open_events) == ["fair", name]
+    registry.close_all()
+    assert registry.names() == [app.DEFAULT_EVENT, "fair", name]
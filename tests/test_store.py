@@ -0,0 +1,80 @@
+import json
+import os
+
+def crash(store):
+    # Stops the writer after it has flushed the journal, without the snapshot close() takes
+    store.pending.put(("stop", None))
+    store.writer.join()
+    store.writer = None
+
+def reopen(app, directory):
+    store = app.EventStore(app.EventService(), directory)
+    replayed = store.recover()
+    return store, replayed
+
+def test_recover_replays_journal(app, tmp_path):
+    store, replayed = reopen(app, tmp_path)
+    assert replayed == 0
+    for point in ("welcome", "budget", "close"):
+        store.service.perform("agenda_add", point)
+    crash(store)
+    store, replayed = reopen(app, tmp_path)
+    assert replayed == 3
+    assert store.service.agenda == ["welcome", "budget", "close"]
+    store.close()
+
+def test_recover_from_snapshot_after_close(app, tmp_path):
+    store, _ = reopen(app, tmp_path)
+    store.service.perform("exec_add", "Opening Dance")
+    store.service.perform("date_insert", "2026-05-01")
+    store.close()
+    store, replayed = reopen(app, tmp_path)
+    assert replayed == 0
+    assert list(store.service.execution_queue) == ["Opening Dance"]
+    assert store.service.dates_index.search(app.date(2026, 5, 1)) is not None
+    store.close()
+
+def test_torn_tail_survives_a_second_restart(app, tmp_path):
+    store, _ = reopen(app, tmp_path)
+    for point in ("a", "b", "c"):
+        store.service.perform("agenda_add", point)
+    crash(store)
+    with open(store.journal_path, "ab") as f:
+        f.write(b'{"seq": 4, "op": "agen')
+    
+    store, replayed = reopen(app, tmp_path)
+    assert replayed == 3
+    for point in ("d", "e", "f"):
+        store.service.perform("agenda_add", point)
+    crash(store)
+    
+    store, replayed = reopen(app, tmp_path)
+    assert replayed == 6
+    assert store.service.agenda == ["a", "b", "c", "d", "e", "f"]
+    with open(store.journal_path, encoding="utf-8") as f:
+        assert [json.loads(line)["seq"] for line in f] == [1, 2, 3, 4, 5, 6]
+    store.close()
+
+def test_complete_last_line_without_newline_is_dropped(app, tmp_path):
+    store, _ = reopen(app, tmp_path)
+    store.service.perform("agenda_add", "kept")
+    crash(store)
+    with open(store.journal_path, "ab") as f:
+        f.write(json.dumps({"seq": 2, "op": "agenda_add", "args": ["torn"]}).encode())
+    store, replayed = reopen(app, tmp_path)
+    assert store.service.agenda == ["kept"]
+    assert os.path.getsize(store.journal_path) == len(json.dumps({"seq": 1, "op": "agenda_add", "args": ["kept"]})) + 1
+    store.close()
+
+def test_recover_reports_progress(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "LOAD_PROGRESS_EVERY", 100)
+    store, _ = reopen(app, tmp_path)
+    for i in range(900):
+        store.service.perform("announcement_add", f"notice {i}")
+    crash(store)
+    progress = []
+    store = app.EventStore(app.EventService(), tmp_path)
+    store.recover(progress.append)
+    assert progress == sorted(progress)
+    assert progress[-1] == 1.0 and len(progress) > 2
+    store.close()
@@ -0,0 +1,403 @@
+import random
+from datetime import date
+
+import pytest
+
+def avl_height(tree, node, low=None, high=None):
+    # Checks order, stored heights and balance below node; returns its height
+    if node is None:
+        return 0
+    assert low is None or node.key > low
+    assert high is None or node.key < high
+    left = avl_height(tree, node.left, low, node.key)
+    right = avl_height(tree, node.right, node.key, high)
+    assert abs(left - right) <= 1
+    assert node.height == 1 + max(left, right)
+    return node.height
+
+def pool_height(pool, n, low=None, high=None):
+    if not n:
+        return 0
+    key = pool.keys[n]
+    assert low is None or key > low
+    assert high is None or key < high
+    left = pool_height(pool, pool.left[n], low, key)
+    right = pool_height(pool, pool.right[n], key, high)
+    assert abs(left - right) <= 1
+    assert pool.height[n] == 1 + max(left, right)
+    return pool.height[n]
+
+def test_avl_tree_stays_balanced_through_inserts_and_deletes(app):
+    rng = random.Random(6)
+    tree, keys = app.AVLTree(), set()
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if rng.random() < 0.6:
+            assert tree.insert(key, str(key)) == (key not in keys)
+            keys.add(key)
+        else:
+            assert tree.delete(key) == (key in keys)
+            keys.discard(key)
+        assert len(tree) == len(keys)
+    avl_height(tree, tree.root)
+    assert tree.inorder() == sorted(keys)
+    assert all(tree.search(key).value == str(key) for key in keys)
+
+def test_avl_tree_sorted_load_is_logarithmic(app):
+    tree = app.AVLTree()
+    for key in range(4096):
+        tree.insert(key)
+    assert avl_height(tree, tree.root) <= 13
+    for key in range(0, 4096, 2):
+        tree.delete(key)
+    assert avl_height(tree, tree.root) <= 12
+    assert tree.inorder() == list(range(1, 4096, 2))
+
+def test_avl_tree_ordered_queries(app):
+    tree = app.AVLTree()
+    for key in (10, 20, 30, 40, 50):
+        tree.insert(key)
+    assert list(tree.scan(15, 40)) == [20, 30, 40]
+    assert list(tree.scan(high=25)) == [10, 20]
+    assert tree.successor(30) == 40 and tree.successor(50) is None
+    assert tree.predecessor(30) == 20 and tree.predecessor(10) is None
+    assert tree.page(limit=2) == ([10, 20], 20)
+    assert tree.page(20, limit=2) == ([30, 40], 40)
+    assert tree.page(40, limit=2) == ([50], None)
+
+def test_avl_pool_matches_avl_tree_and_reuses_slots(app):
+    rng = random.Random(7)
+    pool, keys = app.AVLPool(), set()
+    for _ in range(2000):
+        key = rng.randrange(-300, 300)
+        if rng.random() < 0.6:
+            assert pool.insert(key) == (key not in keys)
+            keys.add(key)
+        else:
+            assert pool.delete(key) == (key in keys)
+            keys.discard(key)
+    pool_height(pool, pool.root)
+    assert pool.inorder() == sorted(keys)
+    assert len(pool) == len(keys)
+    # Freed slots are handed out again before the arrays grow
+    assert len(pool.keys) - 1 == len(keys) + len(pool.free)
+    low, high = sorted(keys)[3], sorted(keys)[-3]
+    assert list(pool.scan(low, high)) == [key for key in sorted(keys) if low <= key <= high]
+
+def test_date_index_round_trips_dates(app):
+    index = app.DateIndex()
+    days = [date(2026, 5, 3), date(2026, 5, 1), date(2027, 1, 1), date(2026, 5, 2)]
+    for day in days:
+        index.insert(day)
+    assert not index.insert(date(2026, 5, 1))
+    assert index.inorder() == sorted(days)
+    assert index.search(date(2026, 5, 2)) == date(2026, 5, 2)
+    assert index.search(date(2026, 5, 4)) is None
+    assert index.successor(date(2026, 5, 3)) == date(2027, 1, 1)
+    assert index.predecessor(date(2026, 5, 1)) is None
+    assert index.page(date(2026, 5, 1), limit=2) == ([date(2026, 5, 2), date(2026, 5, 3)], date(2026, 5, 3))
+    assert index.delete(date(2026, 5, 2)) and not index.delete(date(2026, 5, 2))
+    assert list(index.scan(date(2026, 5, 2), date(2026, 12, 31))) == [date(2026, 5, 3)]
+
+def test_interval_tree_overlap_matches_brute_force(app):
+    rng = random.Random(8)
+    tree, spans = app.IntervalTree(), set()
+    for step in range(600):
+        start = rng.randrange(1000)
+        span = (start, start + rng.randrange(1, 60), step)
+        tree.insert(span)
+        spans.add(span)
+        if rng.random() < 0.3:
+            gone = rng.choice(sorted(spans))
+            tree.delete(gone)
+            spans.discard(gone)
+
+    def check(node):
+        # Every node keeps the latest end in its subtree
+        if node is None:
+            return -1
+        high = max(node.key[1], check(node.left), check(node.right))
+        assert node.high == high
+        return high
+
+    check(tree.root)
+    avl_height(tree, tree.root)
+    for _ in range(200):
+        start = rng.randrange(1050)
+        end = start + rng.randrange(1, 80)
+        assert sorted(tree.overlapping(start, end)) == sorted(s for s in spans if s[0] < end and start < s[1])
+
+def test_interval_tree_touching_spans_do_not_overlap(app):
+    tree = app.IntervalTree()
+    tree.insert((600, 660, 1))
+    assert list(tree.overlapping(660, 720)) == []
+    assert list(tree.overlapping(540, 600)) == []
+    assert list(tree.overlapping(659, 661)) == [(600, 660, 1)]
+
+def test_schedule_moves_and_indexes(app):
+    schedule = app.Schedule()
+    for name in ("A", "B", "C"):
+        assert schedule.append(name)
+    assert not schedule.append("A")
+    assert schedule.insert_after("A", "D") and not schedule.insert_after("X", "E")
+    assert list(schedule) == ["A", "D", "B", "C"]
+    assert schedule.move_after("C") and list(schedule) == ["C", "A", "D", "B"]
+    assert schedule.move_after("C", "B") and list(schedule) == ["A", "D", "B", "C"]
+    assert not schedule.move_after("C", "C")
+    assert schedule.remove("D") and not schedule.remove("D")
+    assert schedule.popleft() == "A"
+    assert list(schedule) == ["B", "C"] and schedule.tail.data == "C"
+    assert "B" in schedule and "A" not in schedule and len(schedule) == 2
+
+def test_schedule_snapshot_tracks_changes(app):
+    schedule = app.Schedule()
+    for name in ("A", "B", "C"):
+        schedule.append(name)
+    assert schedule[1:] == ("B", "C")
+    frozen = schedule.snapshot()
+    assert schedule.snapshot() is frozen
+    schedule.move_after("A", "C")
+    assert schedule.snapshot() == ("B", "C", "A")
+    assert schedule[-1] == "A"
+
+def test_linked_list_tail_and_index(app):
+    items = app.LinkedList()
+    for data in ("a", "b", "a", "c"):
+        items.add(data)
+    assert items.tail.data == "c" and len(items) == 4
+    assert len(items.index["a"]) == 2
+    assert items.remove("a")
+    assert list(items) == ["b", "a", "c"] and len(items.index["a"]) == 1
+    assert items.pop() == "c" and items.tail.data == "a"
+    assert items.remove("a") and "a" not in items
+    assert items.pop() == "b" and items.pop() is None
+    assert items.head is None and items.tail is None and not items.index
+
+def test_linked_list_follower_restores_in_place(app):
+    items = app.LinkedList()
+    for data in ("x", "y", "x", "z"):
+        items.add(data)
+    follower = items.follower("x")
+    assert follower == ("y", 0)
+    items.remove("x")
+    items.restore_before(follower, "x")
+    assert list(items) == ["x", "y", "x", "z"]
+    # The restored node is first in line for the next remove
+    assert items.index["x"][0] is items.head
+    assert items.follower("z") is None
+    items.remove("y")
+    items.restore(1, "y")
+    assert list(items) == ["x", "y", "x", "z"]
+    assert items[1:3] == ["y", "x"] and items[3] == "z"
+
+def test_sorted_chunks_against_a_sorted_list(app, monkeypatch):
+    monkeypatch.setattr(app.SortedChunks, "CHUNK", 4)
+    rng = random.Random(9)
+    chunks, model = app.SortedChunks(), []
+    for _ in range(1500):
+        if model and rng.random() < 0.4:
+            key = rng.choice(model)
+            chunks.remove(key)
+            model.remove(key)
+        else:
+            key = rng.random()
+            chunks.insert(key, -key)
+            model.append(key)
+            model.sort()
+    values = [-key for key in model]
+    assert len(chunks) == len(model) and list(chunks) == values
+    assert all(len(keys) <= 8 for keys in chunks.keys)
+    assert chunks[10:25] == values[10:25] and chunks[-1] == values[-1]
+    assert chunks.index(model[17]) == 17
+    assert chunks.take_front(11) == values[:11]
+    assert chunks.snapshot() == tuple(values[11:])
+    with pytest.raises(IndexError):
+        chunks[len(chunks)]
+
+def test_feedback_stats(app):
+    stats = app.FeedbackStats()
+    assert stats.mean() is None and stats.median() is None
+    for rating in (5, 4, 4, 2, 1, 5, 3):
+        stats.add(rating)
+    assert stats.mean() == pytest.approx(24 / 7)
+    assert stats.variance() == pytest.approx(sum((r - 24 / 7) ** 2 for r in (5, 4, 4, 2, 1, 5, 3)) / 7)
+    assert stats.median() == 4
+    assert stats.percentile(10) == 1 and stats.percentile(90) == 5
+    stats.remove(3)
+    assert stats.median() == 4
+    stats.remove(4)
+    stats.remove(4)
+    assert stats.median() == 3.5
+    assert stats.histogram() == {1: 1, 2: 1, 3: 0, 4: 0, 5: 2}
+    assert stats.copy().histogram() == stats.histogram()
+
+def test_approval_priority_ages_routine_requests(app):
+    scheduler = app.ApprovalScheduler("priority")
+    routine = scheduler.enqueue("routine")
+    for i in range(scheduler.AGING - 1):
+        scheduler.enqueue(f"high {i}", priority=1)
+    # A High arriving AGING requests later no longer outranks the routine one
+    scheduler.enqueue("late high", priority=1)
+    served = [scheduler.dequeue().text for _ in range(len(scheduler))]
+    assert served.index(routine.text) < served.index("late high")
+    assert served[0] == "high 0"
+
+def test_approval_order_matches_dequeue_after_changes(app):
+    rng = random.Random(10)
+    scheduler = app.ApprovalScheduler("priority")
+    for i in range(300):
+        scheduler.enqueue(f"r{i}", priority=rng.randrange(3))
+    for number in rng.sample(range(1, 301), 50):
+        scheduler.reprioritize(number, rng.randrange(3))
+    listed = [request.number for request in scheduler]
+    assert [scheduler.place(number) for number in listed[:20]] == list(range(20))
+    assert [request.number for request in scheduler.dequeue_many(100)] == listed[:100]
+    scheduler.set_policy("fifo")
+    assert [request.number for request in scheduler] == sorted(listed[100:])
+
+def test_approval_never_expires_before_its_deadline(app):
+    rng = random.Random(11)
+    scheduler = app.ApprovalScheduler()
+    base = 1_800_000_000
+    deadlines = {}
+    for i in range(200):
+        deadline = base + rng.uniform(0, 3600)
+        deadlines[scheduler.enqueue(f"r{i}", deadline=deadline).number] = deadline
+    now = base
+    while scheduler.wheel:
+        now += rng.uniform(1, 200)
+        for request in scheduler.expire(now):
+            assert request.deadline <= now
+            # ...and not much after it: within one sweep tick
+            assert now - request.deadline < scheduler.TICK + 200
+            del deadlines[request.number]
+        assert all(deadline > now - scheduler.TICK for deadline in deadlines.values())
+    assert not deadlines and not scheduler
+
+def test_approval_deadline_after_a_sweep_lands_in_a_later_slot(app):
+    scheduler = app.ApprovalScheduler()
+    scheduler.expire(1_800_000_000)
+    late = scheduler.enqueue("late", deadline=1_800_000_000 - 3600)
+    assert not scheduler.due(1_800_000_000)
+    assert scheduler.expire(1_800_000_000 + scheduler.TICK) == [late]
+
+def test_timetable_conflicts_by_stage_and_performer(app):
+    table = app.Timetable()
+    table.put(1, "Dance", 600, 660, "Main", ("asha",))
+    table.put(2, "Song", 700, 760, "Side", ("cara",))
+    assert table.conflicts(3, 630, 690, "main", ()) == ["Stage 'main' is taken by Step 1: Dance [10:00-11:00, Main]"]
+    assert table.conflicts(3, 660, 700, "Main", ("asha", "cara")) == []
+    assert len(table.conflicts(3, 650, 710, "Side", ("asha",))) == 2
+    # A step's own slot never clashes with itself
+    assert table.conflicts(1, 600, 660, "Main", ("asha",)) == []
+    table.put(1, "Dance", 800, 860, "Main", ("asha",))
+    assert table.conflicts(3, 630, 690, "Main", ("asha",)) == []
+    assert [entry.step for entry in table] == [1, 2]
+    assert table.remove(1).performance == "Dance" and table.remove(1) is None
+    assert "main" not in table.stages and "asha" not in table.performers
+
+def test_timetable_recast_conflicts_ignore_the_act_itself(app):
+    table = app.Timetable()
+    table.put(1, "Dance", 600, 660, "Main", ("asha",))
+    table.put(2, "Dance", 700, 760, "Main", ("asha",))
+    table.put(3, "Song", 630, 690, "Side", ("cara",))
+    assert table.recast_conflicts("Dance", ("asha",)) == []
+    assert table.recast_conflicts("Dance", ("asha", "cara")) == \
+        ["'cara' is already performing in Step 3: Song [10:30-11:30, Side]"]
+    table.recast("Dance", ("bo",))
+    assert sorted(table.performers) == ["bo", "cara"]
+    assert table.get(2).performers == ("bo",)
+
+def test_dispatcher_round_robin_and_least_loaded(app):
+    dispatcher = app.RehearsalDispatcher()
+    for room in ("A", "B"):
+        dispatcher.add_room(room)
+    assert [dispatcher.assign(f"act{i}", 10, ()) for i in range(3)] == ["A", "B", "A"]
+    dispatcher.set_policy("shortest_first")
+    assert dispatcher.assign("act3", 5, ()) == "B"
+    assert dispatcher.assign("act4", 30, ()) == "B"
+    assert dispatcher.load == {"A": 20, "B": 45}
+    assert dispatcher.finish("A") == "act0" and dispatcher.load["A"] == 10
+    assert dispatcher.remove_room("B") == ["act1", "act3", "act4"]
+    assert list(dispatcher) == [("A", ("act2",), 10)]
+    with pytest.raises(ValueError):
+        dispatcher.set_policy("fastest")
+
+def test_dispatcher_performer_free_keeps_performers_in_one_room(app):
+    dispatcher = app.RehearsalDispatcher("performer_free")
+    for room in ("A", "B"):
+        dispatcher.add_room(room)
+    assert dispatcher.assign("Dance", 30, ("asha",)) == "A"
+    assert dispatcher.assign("Song", 10, ("cara",)) == "B"
+    assert dispatcher.assign("Duet", 10, ("asha", "dev")) == "A"
+    # Needed in both rooms: no room suits it and it is not placed
+    assert dispatcher.assign("Trio", 10, ("asha", "cara")) is None
+    assert [line for room, line, load in dispatcher] == [("Dance", "Duet"), ("Song",)]
+    dispatcher.finish("B")
+    assert dispatcher.assign("Trio", 10, ("asha", "cara")) == "A"
+    assert dispatcher.booked["asha"] == {"A": 3}
+
+def test_roster_fills_to_capacity_within_windows(app):
+    roster = app.VolunteerRoster()
+    morning = roster.add_shift("door", 9 * 60, 12 * 60, 2)
+    evening = roster.add_shift("door", 18 * 60, 20 * 60, 1)
+    duty_index = {"door": {"ana", "ben", "cy"}, "": {"fay"}}
+    windows = {"ana": (8 * 60, 13 * 60), "ben": (17 * 60, 22 * 60), "cy": (9 * 60, 21 * 60),
+               "fay": (8 * 60, 12 * 60)}
+    assert roster.allocate(duty_index, windows) == 3
+    assert sorted(morning.crew) == ["ana", "cy"]
+    # Both are free in the evening; Cy's window closes first, so Cy is taken
+    # and Ben's longer one is kept for later
+    assert evening.crew == ["cy"]
+    assert roster.allocate(duty_index, windows) == 0
+
+def test_roster_uses_floaters_and_avoids_clashes(app):
+    roster = app.VolunteerRoster()
+    first = roster.add_shift("bar", 600, 720, 2)
+    overlap = roster.add_shift("cloak", 660, 780, 1)
+    duty_index = {"bar": {"ana"}, "cloak": set(), "": {"fay"}}
+    assert roster.allocate(duty_index, {}) == 2
+    assert sorted(first.crew) == ["ana", "fay"]
+    # Fay is booked on the overlapping bar shift, so the cloak shift stays open
+    assert overlap.crew == []
+    assert roster.clashes("fay", overlap)
+    assert roster[0:2] == [first.row(), overlap.row()]
+    assert roster.remove_shift(first.number) and "ana" not in roster.rota
+
+def test_logistics_rollups_follow_changes(app):
+    book = app.LogisticsBook()
+    book.add("chairs", 10)
+    book.add("tables", 4)
+    assert list(book.unsourced) == ["chairs", "tables"]
+    book.map_vendor("chairs", "Acme")
+    book.map_vendor("tables", "Acme")
+    assert book.rollups["Acme"] == (2, 14, 0)
+    assert book.add("chairs", 5) == ("chairs", 10, "needed")
+    book.set_status("chairs", "delivered")
+    assert book.rollups["Acme"] == (2, 19, 15)
+    assert book.map_vendor("tables", "Bolt") == "Acme"
+    assert book.rollups == {"Acme": (1, 15, 15), "Bolt": (1, 4, 0)}
+    book.remap("chairs", None)
+    assert "Acme" not in book.rollups and list(book.unsourced) == ["chairs"]
+    book.restore("chairs", None)
+    assert "chairs" not in book and not book.unsourced
+    clone = book.copy()
+    book.add("tables", 1)
+    assert clone.rollups["Bolt"] == (1, 4, 0)
+
+def test_live_show_tracks_drift_and_projection(app):
+    show = app.LiveShow()
+    assert not show.running
+    show.queued = 1200
+    show.start(1000, auto=True)
+    assert show.running and show.auto and show.queued == 1200
+    show.begin("Dance", 600, 1000)
+    assert not show.due(1599) and show.due(1600)
+    assert show.left(1300) == 300 and show.overrun(1300) == 0
+    assert show.projected_end(1300) == 1300 + 300 + 1200
+    assert show.overrun(1700) == 100 and show.variance(1700) == 100
+    show.finish(1700)
+    assert show.drift == 100 and show.finished == 1 and show.current is None
+    show.begin("Song", 300, 1700)
+    show.stop(1900)
+    assert show.drift == 0 and not show.running